@@ -53,6 +53,7 @@ from cambalache import (
 )
 
 from cambalache.cmb_blueprint import CmbBlueprintError
+from cambalache.cmb_startup_profile import startup_phase
 
 logger = getLogger(__name__)
 
@@ -134,7 +135,8 @@ class CmbWindow(Adw.ApplicationWindow):
         self.__last_saved_index = None
         self.__last_saved_index_version = None
 
-        super().__init__(**kwargs)
+        with startup_phase("CmbWindow"):
+            super().__init__(**kwargs)
 
         # Logo animation
         def toggle_animation(gesture, n_press, x, y):
@@ -488,10 +490,6 @@ class CmbWindow(Adw.ApplicationWindow):
 
     def __update_action_undo_redo(self):
         if self.__is_project_visible():
-            undo_msg, redo_msg = self.project.get_undo_redo_msg()
-            self.undo_button.set_tooltip_markup(f"Undo: {undo_msg}" if undo_msg is not None else None)
-            self.redo_button.set_tooltip_markup(f"Redo: {redo_msg}" if redo_msg is not None else None)
-
             history_index = self.project.history_index
             history_index_max = self.project.history_index_max
             self.actions["undo"].set_enabled(history_index > 0)
@@ -500,6 +498,28 @@ class CmbWindow(Adw.ApplicationWindow):
             self.actions["undo"].set_enabled(False)
             self.actions["redo"].set_enabled(False)
 
+    # Undo/Redo messages are only built when the tooltip is shown
+    def __on_undo_redo_button_query_tooltip(self, undo, tooltip):
+        if self.project is None or not self.__is_project_visible():
+            return False
+
+        undo_msg, redo_msg = self.project.get_undo_redo_msg()
+        msg = undo_msg if undo else redo_msg
+
+        if msg is None:
+            return False
+
+        tooltip.set_markup(f"Undo: {msg}" if undo else f"Redo: {msg}")
+        return True
+
+    @Gtk.Template.Callback("on_undo_button_query_tooltip")
+    def __on_undo_button_query_tooltip(self, widget, x, y, keyboard_mode, tooltip):
+        return self.__on_undo_redo_button_query_tooltip(True, tooltip)
+
+    @Gtk.Template.Callback("on_redo_button_query_tooltip")
+    def __on_redo_button_query_tooltip(self, widget, x, y, keyboard_mode, tooltip):
+        return self.__on_undo_redo_button_query_tooltip(False, tooltip)
+
     def __update_action_clipboard(self):
         has_selection = False
 
@@ -631,7 +651,7 @@ class CmbWindow(Adw.ApplicationWindow):
             return False
 
         return self.__is_project_visible() and (
-            self.project.history_index != self.__last_saved_index or
+            self.project.history_index + self.project.history_offset != self.__last_saved_index or
             self.project.history_index_version != self.__last_saved_index_version
         )
 
@@ -849,8 +869,10 @@ class CmbWindow(Adw.ApplicationWindow):
         if self.project:
             return
 
-        self.project = CmbProject(filename=filename, target_tk=target_tk)
-        self.__last_saved_index = self.project.history_index
+        with startup_phase("CmbWindow.create_project"):
+            self.project = CmbProject(filename=filename, target_tk=target_tk)
+
+        self.__last_saved_index = self.project.history_index + self.project.history_offset
         self.__last_saved_index_version = self.project.history_index_version
 
         # Create UI and select it
@@ -878,9 +900,10 @@ class CmbWindow(Adw.ApplicationWindow):
                     raise Exception(_("Unknown file type {content_type}").format(content_type=content_type))
 
             if self.project is None:
-                self.project = CmbProject(filename=filename, target_tk=target_tk)
+                with startup_phase("CmbWindow.open_project"):
+                    self.project = CmbProject(filename=filename, target_tk=target_tk)
 
-            self.__last_saved_index = self.project.history_index
+            self.__last_saved_index = self.project.history_index + self.project.history_offset
             self.__last_saved_index_version = self.project.history_index_version
             self.__set_page("workspace")
             self.__update_actions()
@@ -1262,7 +1285,7 @@ class CmbWindow(Adw.ApplicationWindow):
             )
         finally:
             if retval:
-                self.__last_saved_index = self.project.history_index
+                self.__last_saved_index = self.project.history_index + self.project.history_offset
                 self.__last_saved_index_version = self.project.history_index_version
                 self.__update_action_save()
                 self.emit("project-saved", self.project)
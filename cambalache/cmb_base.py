@@ -23,19 +23,127 @@
 # SPDX-License-Identifier: LGPL-2.1-only
 #
 
+import os
+
 from gi.repository import GObject
 from cambalache import getLogger
 
 logger = getLogger(__name__)
 
+# Check every row cache hit against the DB
+_debug_row_cache = os.environ.get("CAMBALACHE_DEBUG", None) == "row-cache"
+
 
 class CmbBase(GObject.GObject):
     project = GObject.Property(type=GObject.GObject, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
     display_name = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE)
 
+    # Row cache used by generated accessors, see tools/db-codegen.py
+    # The cached row is valid as long as CmbDB row version did not change.
+    _row_table = None
+    _row_query = None
+    _row_fields = ()
+    _row_cache = None
+
+    # Read only catalog rows, column -> default value, see tools/db-codegen.py
+    _row_columns = {}
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+    @classmethod
+    def __get_row_attributes(cls):
+        retval = cls.__dict__.get("_row_attributes", None)
+
+        if retval is None:
+            # Subclasses can still declare a column as a GObject property
+            retval = [
+                (name, default)
+                for name, default in cls._row_columns.items()
+                if not isinstance(getattr(cls, name, None), GObject.Property)
+            ]
+            cls._row_attributes = retval
+
+        return retval
+
+    # Store row values as plain attributes instead of GObject construct properties
+    def _init_row(self, kwargs):
+        for name, default in self.__get_row_attributes():
+            value = kwargs.pop(name, None)
+
+            if value is None:
+                value = default
+            elif default is False:
+                value = bool(value)
+
+            setattr(self, name, value)
+
+    def _row_pk(self):
+        return ()
+
+    def __get_row(self):
+        db = self.project.db
+        pk = self._row_pk()
+        version = db.get_row_version(self._row_table, pk)
+
+        if self._row_cache is not None and self._row_cache[0] == version:
+            row = self._row_cache[1]
+
+            if _debug_row_cache:
+                db_row = db.execute(self._row_query, pk).fetchone()
+                assert row == db_row, f"Stale row cache for {self._row_table} {pk}: {row} != {db_row}"
+
+            return row
+
+        try:
+            row = db.execute(self._row_query, pk).fetchone()
+        except Exception as e:
+            logger.warning(e)
+            return None
+
+        self._row_cache = (version, row)
+
+        return row
+
+    # Prime the row cache with a row fetched in batch, None means there is no row.
+    # version has to be taken from CmbDB.get_row_version() before fetching the row.
+    def _row_prime(self, version, row):
+        if self._row_cache is None:
+            self._row_cache = (version, row)
+
+    # Fetch rows for several wrappers at once.
+    # Returns the current CmbDB row serial and a dictionary of key_columns -> row
+    @classmethod
+    def _row_fetch(cls, db, key_columns, where, params):
+        query = f"SELECT {', '.join(key_columns + cls._row_fields)} FROM {cls._row_table} WHERE {where};"
+        n_keys = len(key_columns)
+
+        try:
+            rows = {tuple(row[:n_keys]): tuple(row[n_keys:]) for row in db.execute(query, params)}
+        except Exception as e:
+            logger.warning(e)
+            return None, {}
+
+        return db.get_row_serial(), rows
+
+    # Prime the row cache with a row returned by _row_fetch(), only if nothing changed since then
+    def _row_prime_fetched(self, serial, row):
+        db = self.project.db
+
+        if db.get_row_serial() == serial:
+            self._row_prime(db.get_row_version(self._row_table, self._row_pk()), row)
+
+    def db_get_column(self, index):
+        row = self.__get_row()
+        return row[index] if row is not None else None
+
+    def db_get_field(self, name, default=None):
+        row = self.__get_row()
+        return row[self._row_fields.index(name)] if row is not None else default
+
+    def db_has_row(self):
+        return self.__get_row() is not None
+
     def db_get(self, query, pk):
         try:
             row = self.project.db.execute(query, pk).fetchone()
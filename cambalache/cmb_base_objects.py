@@ -35,6 +35,10 @@ class CmbBaseLibraryInfo(CmbBase):
 
     library_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    _row_table = "library"
+    _row_query = "SELECT version, namespace, prefix, shared_library, license_id, license_text, third_party, enabled FROM library WHERE (library_id) IS (?);"
+    _row_fields = ("version", "namespace", "prefix", "shared_library", "license_id", "license_text", "third_party", "enabled")
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -42,11 +46,17 @@ class CmbBaseLibraryInfo(CmbBase):
     def from_row(
         cls, project, library_id, version, namespace, prefix, shared_library, license_id, license_text, third_party, enabled
     ):
-        return cls(project=project, library_id=library_id)
+        version = project.db.get_row_version("library", (library_id,))
+        retval = cls(project=project, library_id=library_id)
+        retval._row_prime(version, (version, namespace, prefix, shared_library, license_id, license_text, third_party, enabled))
+        return retval
+
+    def _row_pk(self):
+        return (self.library_id,)
 
     @GObject.Property(type=str)
     def version(self):
-        return self.db_get("SELECT version FROM library WHERE (library_id) IS (?);", (self.library_id,))
+        return self.db_get_column(0)
 
     @version.setter
     def _set_version(self, value):
@@ -54,7 +64,7 @@ class CmbBaseLibraryInfo(CmbBase):
 
     @GObject.Property(type=str)
     def namespace(self):
-        return self.db_get("SELECT namespace FROM library WHERE (library_id) IS (?);", (self.library_id,))
+        return self.db_get_column(1)
 
     @namespace.setter
     def _set_namespace(self, value):
@@ -62,7 +72,7 @@ class CmbBaseLibraryInfo(CmbBase):
 
     @GObject.Property(type=str)
     def prefix(self):
-        return self.db_get("SELECT prefix FROM library WHERE (library_id) IS (?);", (self.library_id,))
+        return self.db_get_column(2)
 
     @prefix.setter
     def _set_prefix(self, value):
@@ -70,7 +80,7 @@ class CmbBaseLibraryInfo(CmbBase):
 
     @GObject.Property(type=str)
     def shared_library(self):
-        return self.db_get("SELECT shared_library FROM library WHERE (library_id) IS (?);", (self.library_id,))
+        return self.db_get_column(3)
 
     @shared_library.setter
     def _set_shared_library(self, value):
@@ -78,7 +88,7 @@ class CmbBaseLibraryInfo(CmbBase):
 
     @GObject.Property(type=str)
     def license_id(self):
-        return self.db_get("SELECT license_id FROM library WHERE (library_id) IS (?);", (self.library_id,))
+        return self.db_get_column(4)
 
     @license_id.setter
     def _set_license_id(self, value):
@@ -86,7 +96,7 @@ class CmbBaseLibraryInfo(CmbBase):
 
     @GObject.Property(type=str)
     def license_text(self):
-        return self.db_get("SELECT license_text FROM library WHERE (library_id) IS (?);", (self.library_id,))
+        return self.db_get_column(5)
 
     @license_text.setter
     def _set_license_text(self, value):
@@ -94,7 +104,7 @@ class CmbBaseLibraryInfo(CmbBase):
 
     @GObject.Property(type=bool, default=False)
     def third_party(self):
-        return self.db_get("SELECT third_party FROM library WHERE (library_id) IS (?);", (self.library_id,))
+        return self.db_get_column(6)
 
     @third_party.setter
     def _set_third_party(self, value):
@@ -102,7 +112,7 @@ class CmbBaseLibraryInfo(CmbBase):
 
     @GObject.Property(type=bool, default=False)
     def enabled(self):
-        return self.db_get("SELECT enabled FROM library WHERE (library_id) IS (?);", (self.library_id,))
+        return self.db_get_column(7)
 
     @enabled.setter
     def _set_enabled(self, value):
@@ -112,40 +122,29 @@ class CmbBaseLibraryInfo(CmbBase):
 class CmbBasePropertyInfo(CmbBase):
     __gtype_name__ = "CmbBasePropertyInfo"
 
-    owner_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    property_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    type_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    is_object = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
-    construct_only = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
-    save_always = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
-    default_value = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    minimum = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    maximum = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    version = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    deprecated_version = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    translatable = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
-    disable_inline_object = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
-    deprecated = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    required = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
-    workspace_default = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    original_owner_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    disabled = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
+    _row_columns = {
+        "owner_id": None,
+        "property_id": None,
+        "type_id": None,
+        "is_object": False,
+        "construct_only": False,
+        "save_always": False,
+        "default_value": None,
+        "minimum": None,
+        "maximum": None,
+        "version": None,
+        "deprecated_version": None,
+        "translatable": False,
+        "disable_inline_object": False,
+        "deprecated": None,
+        "required": False,
+        "workspace_default": None,
+        "original_owner_id": None,
+        "disabled": False,
+    }
 
     def __init__(self, **kwargs):
+        self._init_row(kwargs)
         super().__init__(**kwargs)
 
     @classmethod
@@ -197,15 +196,16 @@ class CmbBasePropertyInfo(CmbBase):
 class CmbSignalInfo(CmbBase):
     __gtype_name__ = "CmbSignalInfo"
 
-    owner_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    signal_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    version = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    deprecated_version = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    detailed = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
+    _row_columns = {
+        "owner_id": None,
+        "signal_id": None,
+        "version": None,
+        "deprecated_version": None,
+        "detailed": False,
+    }
 
     def __init__(self, **kwargs):
+        self._init_row(kwargs)
         super().__init__(**kwargs)
 
     @classmethod
@@ -223,22 +223,21 @@ class CmbSignalInfo(CmbBase):
 class CmbBaseTypeInfo(CmbBase):
     __gtype_name__ = "CmbBaseTypeInfo"
 
-    type_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    parent_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    library_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    version = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    deprecated_version = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    abstract = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
-    derivable = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
-    layout = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    category = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    workspace_type = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
+    _row_columns = {
+        "type_id": None,
+        "parent_id": None,
+        "library_id": None,
+        "version": None,
+        "deprecated_version": None,
+        "abstract": False,
+        "derivable": False,
+        "layout": None,
+        "category": None,
+        "workspace_type": None,
+    }
 
     def __init__(self, **kwargs):
+        self._init_row(kwargs)
         super().__init__(**kwargs)
 
     @classmethod
@@ -274,16 +273,17 @@ class CmbBaseTypeInfo(CmbBase):
 class CmbBaseTypeDataInfo(CmbBase):
     __gtype_name__ = "CmbBaseTypeDataInfo"
 
-    owner_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    data_id = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    parent_id = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    key = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    type_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    translatable = GObject.Property(
-        type=bool, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY, default=False
-    )
+    _row_columns = {
+        "owner_id": None,
+        "data_id": 0,
+        "parent_id": 0,
+        "key": None,
+        "type_id": None,
+        "translatable": False,
+    }
 
     def __init__(self, **kwargs):
+        self._init_row(kwargs)
         super().__init__(**kwargs)
 
     @classmethod
@@ -302,12 +302,15 @@ class CmbBaseTypeDataInfo(CmbBase):
 class CmbBaseTypeDataArgInfo(CmbBase):
     __gtype_name__ = "CmbBaseTypeDataArgInfo"
 
-    owner_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    data_id = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    key = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    type_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
+    _row_columns = {
+        "owner_id": None,
+        "data_id": 0,
+        "key": None,
+        "type_id": None,
+    }
 
     def __init__(self, **kwargs):
+        self._init_row(kwargs)
         super().__init__(**kwargs)
 
     @classmethod
@@ -318,12 +321,15 @@ class CmbBaseTypeDataArgInfo(CmbBase):
 class CmbTypeChildInfo(CmbBase):
     __gtype_name__ = "CmbTypeChildInfo"
 
-    type_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    child_type = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    max_children = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    linked_property_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
+    _row_columns = {
+        "type_id": None,
+        "child_type": None,
+        "max_children": 0,
+        "linked_property_id": None,
+    }
 
     def __init__(self, **kwargs):
+        self._init_row(kwargs)
         super().__init__(**kwargs)
 
     @classmethod
@@ -340,13 +346,16 @@ class CmbTypeChildInfo(CmbBase):
 class CmbBaseTypeInternalChildInfo(CmbBase):
     __gtype_name__ = "CmbBaseTypeInternalChildInfo"
 
-    type_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    internal_child_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    internal_parent_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    internal_type = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
-    creation_property_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
+    _row_columns = {
+        "type_id": None,
+        "internal_child_id": None,
+        "internal_parent_id": None,
+        "internal_type": None,
+        "creation_property_id": None,
+    }
 
     def __init__(self, **kwargs):
+        self._init_row(kwargs)
         super().__init__(**kwargs)
 
     @classmethod
@@ -366,6 +375,21 @@ class CmbBaseUI(CmbBaseFileMonitor):
 
     ui_id = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    _row_table = "ui"
+    _row_query = "SELECT template_id, name, filename, description, copyright, authors, license_id, translation_domain, comment, custom_fragment FROM ui WHERE (ui_id) IS (?);"
+    _row_fields = (
+        "template_id",
+        "name",
+        "filename",
+        "description",
+        "copyright",
+        "authors",
+        "license_id",
+        "translation_domain",
+        "comment",
+        "custom_fragment",
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -385,11 +409,31 @@ class CmbBaseUI(CmbBaseFileMonitor):
         comment,
         custom_fragment,
     ):
-        return cls(project=project, ui_id=ui_id)
+        version = project.db.get_row_version("ui", (ui_id,))
+        retval = cls(project=project, ui_id=ui_id)
+        retval._row_prime(
+            version,
+            (
+                template_id,
+                name,
+                filename,
+                description,
+                copyright,
+                authors,
+                license_id,
+                translation_domain,
+                comment,
+                custom_fragment,
+            ),
+        )
+        return retval
+
+    def _row_pk(self):
+        return (self.ui_id,)
 
     @GObject.Property(type=int)
     def template_id(self):
-        return self.db_get("SELECT template_id FROM ui WHERE (ui_id) IS (?);", (self.ui_id,))
+        return self.db_get_column(0)
 
     @template_id.setter
     def _set_template_id(self, value):
@@ -397,7 +441,7 @@ class CmbBaseUI(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def name(self):
-        return self.db_get("SELECT name FROM ui WHERE (ui_id) IS (?);", (self.ui_id,))
+        return self.db_get_column(1)
 
     @name.setter
     def _set_name(self, value):
@@ -405,7 +449,7 @@ class CmbBaseUI(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def filename(self):
-        return self.db_get("SELECT filename FROM ui WHERE (ui_id) IS (?);", (self.ui_id,))
+        return self.db_get_column(2)
 
     @filename.setter
     def _set_filename(self, value):
@@ -413,7 +457,7 @@ class CmbBaseUI(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def description(self):
-        return self.db_get("SELECT description FROM ui WHERE (ui_id) IS (?);", (self.ui_id,))
+        return self.db_get_column(3)
 
     @description.setter
     def _set_description(self, value):
@@ -421,7 +465,7 @@ class CmbBaseUI(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def copyright(self):
-        return self.db_get("SELECT copyright FROM ui WHERE (ui_id) IS (?);", (self.ui_id,))
+        return self.db_get_column(4)
 
     @copyright.setter
     def _set_copyright(self, value):
@@ -429,7 +473,7 @@ class CmbBaseUI(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def authors(self):
-        return self.db_get("SELECT authors FROM ui WHERE (ui_id) IS (?);", (self.ui_id,))
+        return self.db_get_column(5)
 
     @authors.setter
     def _set_authors(self, value):
@@ -437,7 +481,7 @@ class CmbBaseUI(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def license_id(self):
-        return self.db_get("SELECT license_id FROM ui WHERE (ui_id) IS (?);", (self.ui_id,))
+        return self.db_get_column(6)
 
     @license_id.setter
     def _set_license_id(self, value):
@@ -445,7 +489,7 @@ class CmbBaseUI(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def translation_domain(self):
-        return self.db_get("SELECT translation_domain FROM ui WHERE (ui_id) IS (?);", (self.ui_id,))
+        return self.db_get_column(7)
 
     @translation_domain.setter
     def _set_translation_domain(self, value):
@@ -453,7 +497,7 @@ class CmbBaseUI(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def comment(self):
-        return self.db_get("SELECT comment FROM ui WHERE (ui_id) IS (?);", (self.ui_id,))
+        return self.db_get_column(8)
 
     @comment.setter
     def _set_comment(self, value):
@@ -461,7 +505,7 @@ class CmbBaseUI(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def custom_fragment(self):
-        return self.db_get("SELECT custom_fragment FROM ui WHERE (ui_id) IS (?);", (self.ui_id,))
+        return self.db_get_column(9)
 
     @custom_fragment.setter
     def _set_custom_fragment(self, value):
@@ -473,16 +517,26 @@ class CmbBaseCSS(CmbBaseFileMonitor):
 
     css_id = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    _row_table = "css"
+    _row_query = "SELECT filename, css, priority, is_global FROM css WHERE (css_id) IS (?);"
+    _row_fields = ("filename", "css", "priority", "is_global")
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
     @classmethod
     def from_row(cls, project, css_id, filename, css, priority, is_global):
-        return cls(project=project, css_id=css_id)
+        version = project.db.get_row_version("css", (css_id,))
+        retval = cls(project=project, css_id=css_id)
+        retval._row_prime(version, (filename, css, priority, is_global))
+        return retval
+
+    def _row_pk(self):
+        return (self.css_id,)
 
     @GObject.Property(type=str)
     def filename(self):
-        return self.db_get("SELECT filename FROM css WHERE (css_id) IS (?);", (self.css_id,))
+        return self.db_get_column(0)
 
     @filename.setter
     def _set_filename(self, value):
@@ -490,7 +544,7 @@ class CmbBaseCSS(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def css(self):
-        return self.db_get("SELECT css FROM css WHERE (css_id) IS (?);", (self.css_id,))
+        return self.db_get_column(1)
 
     @css.setter
     def _set_css(self, value):
@@ -498,7 +552,7 @@ class CmbBaseCSS(CmbBaseFileMonitor):
 
     @GObject.Property(type=int)
     def priority(self):
-        return self.db_get("SELECT priority FROM css WHERE (css_id) IS (?);", (self.css_id,))
+        return self.db_get_column(2)
 
     @priority.setter
     def _set_priority(self, value):
@@ -506,7 +560,7 @@ class CmbBaseCSS(CmbBaseFileMonitor):
 
     @GObject.Property(type=bool, default=False)
     def is_global(self):
-        return self.db_get("SELECT is_global FROM css WHERE (css_id) IS (?);", (self.css_id,))
+        return self.db_get_column(3)
 
     @is_global.setter
     def _set_is_global(self, value):
@@ -519,6 +573,19 @@ class CmbBaseGResource(CmbBaseFileMonitor):
     gresource_id = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
     resource_type = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    _row_table = "gresource"
+    _row_query = "SELECT parent_id, position, gresources_filename, gresource_prefix, file_filename, file_compressed, file_preprocess, file_alias FROM gresource WHERE (gresource_id) IS (?);"
+    _row_fields = (
+        "parent_id",
+        "position",
+        "gresources_filename",
+        "gresource_prefix",
+        "file_filename",
+        "file_compressed",
+        "file_preprocess",
+        "file_alias",
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -537,11 +604,29 @@ class CmbBaseGResource(CmbBaseFileMonitor):
         file_preprocess,
         file_alias,
     ):
-        return cls(project=project, gresource_id=gresource_id)
+        version = project.db.get_row_version("gresource", (gresource_id,))
+        retval = cls(project=project, gresource_id=gresource_id)
+        retval._row_prime(
+            version,
+            (
+                parent_id,
+                position,
+                gresources_filename,
+                gresource_prefix,
+                file_filename,
+                file_compressed,
+                file_preprocess,
+                file_alias,
+            ),
+        )
+        return retval
+
+    def _row_pk(self):
+        return (self.gresource_id,)
 
     @GObject.Property(type=int)
     def parent_id(self):
-        return self.db_get("SELECT parent_id FROM gresource WHERE (gresource_id) IS (?);", (self.gresource_id,))
+        return self.db_get_column(0)
 
     @parent_id.setter
     def _set_parent_id(self, value):
@@ -549,7 +634,7 @@ class CmbBaseGResource(CmbBaseFileMonitor):
 
     @GObject.Property(type=int)
     def position(self):
-        return self.db_get("SELECT position FROM gresource WHERE (gresource_id) IS (?);", (self.gresource_id,))
+        return self.db_get_column(1)
 
     @position.setter
     def _set_position(self, value):
@@ -557,7 +642,7 @@ class CmbBaseGResource(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def gresources_filename(self):
-        return self.db_get("SELECT gresources_filename FROM gresource WHERE (gresource_id) IS (?);", (self.gresource_id,))
+        return self.db_get_column(2)
 
     @gresources_filename.setter
     def _set_gresources_filename(self, value):
@@ -565,7 +650,7 @@ class CmbBaseGResource(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def gresource_prefix(self):
-        return self.db_get("SELECT gresource_prefix FROM gresource WHERE (gresource_id) IS (?);", (self.gresource_id,))
+        return self.db_get_column(3)
 
     @gresource_prefix.setter
     def _set_gresource_prefix(self, value):
@@ -573,7 +658,7 @@ class CmbBaseGResource(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def file_filename(self):
-        return self.db_get("SELECT file_filename FROM gresource WHERE (gresource_id) IS (?);", (self.gresource_id,))
+        return self.db_get_column(4)
 
     @file_filename.setter
     def _set_file_filename(self, value):
@@ -581,7 +666,7 @@ class CmbBaseGResource(CmbBaseFileMonitor):
 
     @GObject.Property(type=bool, default=False)
     def file_compressed(self):
-        return self.db_get("SELECT file_compressed FROM gresource WHERE (gresource_id) IS (?);", (self.gresource_id,))
+        return self.db_get_column(5)
 
     @file_compressed.setter
     def _set_file_compressed(self, value):
@@ -589,7 +674,7 @@ class CmbBaseGResource(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def file_preprocess(self):
-        return self.db_get("SELECT file_preprocess FROM gresource WHERE (gresource_id) IS (?);", (self.gresource_id,))
+        return self.db_get_column(6)
 
     @file_preprocess.setter
     def _set_file_preprocess(self, value):
@@ -597,7 +682,7 @@ class CmbBaseGResource(CmbBaseFileMonitor):
 
     @GObject.Property(type=str)
     def file_alias(self):
-        return self.db_get("SELECT file_alias FROM gresource WHERE (gresource_id) IS (?);", (self.gresource_id,))
+        return self.db_get_column(7)
 
     @file_alias.setter
     def _set_file_alias(self, value):
@@ -612,6 +697,24 @@ class CmbBaseProperty(CmbBase):
     owner_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
     property_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    _row_table = "object_property"
+    _row_query = "SELECT value, translatable, comment, translation_context, translation_comments, inline_object_id, bind_source_id, bind_owner_id, bind_property_id, bind_flags, binding_expression_id, binding_expression_object_id, serialize_default_value FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);"
+    _row_fields = (
+        "value",
+        "translatable",
+        "comment",
+        "translation_context",
+        "translation_comments",
+        "inline_object_id",
+        "bind_source_id",
+        "bind_owner_id",
+        "bind_property_id",
+        "bind_flags",
+        "binding_expression_id",
+        "binding_expression_object_id",
+        "serialize_default_value",
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -637,19 +740,47 @@ class CmbBaseProperty(CmbBase):
         binding_expression_object_id,
         serialize_default_value,
     ):
-        return cls(project=project, ui_id=ui_id, object_id=object_id, owner_id=owner_id, property_id=property_id)
-
-    @GObject.Property(type=str)
-    def value(self):
-        return self.db_get(
-            "SELECT value FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
+        version = project.db.get_row_version(
+            "object_property",
             (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
+                ui_id,
+                object_id,
+                owner_id,
+                property_id,
+            ),
+        )
+        retval = cls(project=project, ui_id=ui_id, object_id=object_id, owner_id=owner_id, property_id=property_id)
+        retval._row_prime(
+            version,
+            (
+                value,
+                translatable,
+                comment,
+                translation_context,
+                translation_comments,
+                inline_object_id,
+                bind_source_id,
+                bind_owner_id,
+                bind_property_id,
+                bind_flags,
+                binding_expression_id,
+                binding_expression_object_id,
+                serialize_default_value,
             ),
         )
+        return retval
+
+    def _row_pk(self):
+        return (
+            self.ui_id,
+            self.object_id,
+            self.owner_id,
+            self.property_id,
+        )
+
+    @GObject.Property(type=str)
+    def value(self):
+        return self.db_get_column(0)
 
     @value.setter
     def _set_value(self, value):
@@ -666,15 +797,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=bool, default=False)
     def translatable(self):
-        return self.db_get(
-            "SELECT translatable FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(1)
 
     @translatable.setter
     def _set_translatable(self, value):
@@ -691,15 +814,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=str)
     def comment(self):
-        return self.db_get(
-            "SELECT comment FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(2)
 
     @comment.setter
     def _set_comment(self, value):
@@ -716,15 +831,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=str)
     def translation_context(self):
-        return self.db_get(
-            "SELECT translation_context FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(3)
 
     @translation_context.setter
     def _set_translation_context(self, value):
@@ -741,15 +848,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=str)
     def translation_comments(self):
-        return self.db_get(
-            "SELECT translation_comments FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(4)
 
     @translation_comments.setter
     def _set_translation_comments(self, value):
@@ -766,15 +865,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=int)
     def inline_object_id(self):
-        return self.db_get(
-            "SELECT inline_object_id FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(5)
 
     @inline_object_id.setter
     def _set_inline_object_id(self, value):
@@ -791,15 +882,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=int)
     def bind_source_id(self):
-        return self.db_get(
-            "SELECT bind_source_id FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(6)
 
     @bind_source_id.setter
     def _set_bind_source_id(self, value):
@@ -816,15 +899,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=str)
     def bind_owner_id(self):
-        return self.db_get(
-            "SELECT bind_owner_id FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(7)
 
     @bind_owner_id.setter
     def _set_bind_owner_id(self, value):
@@ -841,15 +916,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=str)
     def bind_property_id(self):
-        return self.db_get(
-            "SELECT bind_property_id FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(8)
 
     @bind_property_id.setter
     def _set_bind_property_id(self, value):
@@ -866,15 +933,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=str)
     def bind_flags(self):
-        return self.db_get(
-            "SELECT bind_flags FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(9)
 
     @bind_flags.setter
     def _set_bind_flags(self, value):
@@ -891,15 +950,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=int)
     def binding_expression_id(self):
-        return self.db_get(
-            "SELECT binding_expression_id FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(10)
 
     @binding_expression_id.setter
     def _set_binding_expression_id(self, value):
@@ -916,15 +967,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=int)
     def binding_expression_object_id(self):
-        return self.db_get(
-            "SELECT binding_expression_object_id FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(11)
 
     @binding_expression_object_id.setter
     def _set_binding_expression_object_id(self, value):
@@ -941,15 +984,7 @@ class CmbBaseProperty(CmbBase):
 
     @GObject.Property(type=bool, default=False)
     def serialize_default_value(self):
-        return self.db_get(
-            "SELECT serialize_default_value FROM object_property WHERE (ui_id, object_id, owner_id, property_id) IS (?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(12)
 
     @serialize_default_value.setter
     def _set_serialize_default_value(self, value):
@@ -974,6 +1009,10 @@ class CmbBaseLayoutProperty(CmbBase):
     owner_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
     property_id = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    _row_table = "object_layout_property"
+    _row_query = "SELECT value, translatable, comment, translation_context, translation_comments FROM object_layout_property WHERE (ui_id, object_id, child_id, owner_id, property_id) IS (?, ?, ?, ?, ?);"
+    _row_fields = ("value", "translatable", "comment", "translation_context", "translation_comments")
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -992,22 +1031,34 @@ class CmbBaseLayoutProperty(CmbBase):
         translation_context,
         translation_comments,
     ):
-        return cls(
+        version = project.db.get_row_version(
+            "object_layout_property",
+            (
+                ui_id,
+                object_id,
+                child_id,
+                owner_id,
+                property_id,
+            ),
+        )
+        retval = cls(
             project=project, ui_id=ui_id, object_id=object_id, child_id=child_id, owner_id=owner_id, property_id=property_id
         )
+        retval._row_prime(version, (value, translatable, comment, translation_context, translation_comments))
+        return retval
+
+    def _row_pk(self):
+        return (
+            self.ui_id,
+            self.object_id,
+            self.child_id,
+            self.owner_id,
+            self.property_id,
+        )
 
     @GObject.Property(type=str)
     def value(self):
-        return self.db_get(
-            "SELECT value FROM object_layout_property WHERE (ui_id, object_id, child_id, owner_id, property_id) IS (?, ?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.child_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(0)
 
     @value.setter
     def _set_value(self, value):
@@ -1025,16 +1076,7 @@ class CmbBaseLayoutProperty(CmbBase):
 
     @GObject.Property(type=bool, default=False)
     def translatable(self):
-        return self.db_get(
-            "SELECT translatable FROM object_layout_property WHERE (ui_id, object_id, child_id, owner_id, property_id) IS (?, ?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.child_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(1)
 
     @translatable.setter
     def _set_translatable(self, value):
@@ -1052,16 +1094,7 @@ class CmbBaseLayoutProperty(CmbBase):
 
     @GObject.Property(type=str)
     def comment(self):
-        return self.db_get(
-            "SELECT comment FROM object_layout_property WHERE (ui_id, object_id, child_id, owner_id, property_id) IS (?, ?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.child_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(2)
 
     @comment.setter
     def _set_comment(self, value):
@@ -1079,16 +1112,7 @@ class CmbBaseLayoutProperty(CmbBase):
 
     @GObject.Property(type=str)
     def translation_context(self):
-        return self.db_get(
-            "SELECT translation_context FROM object_layout_property WHERE (ui_id, object_id, child_id, owner_id, property_id) IS (?, ?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.child_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(3)
 
     @translation_context.setter
     def _set_translation_context(self, value):
@@ -1106,16 +1130,7 @@ class CmbBaseLayoutProperty(CmbBase):
 
     @GObject.Property(type=str)
     def translation_comments(self):
-        return self.db_get(
-            "SELECT translation_comments FROM object_layout_property WHERE (ui_id, object_id, child_id, owner_id, property_id) IS (?, ?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.child_id,
-                self.owner_id,
-                self.property_id,
-            ),
-        )
+        return self.db_get_column(4)
 
     @translation_comments.setter
     def _set_translation_comments(self, value):
@@ -1137,6 +1152,10 @@ class CmbSignal(CmbBase):
 
     signal_pk = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    _row_table = "object_signal"
+    _row_query = "SELECT ui_id, object_id, owner_id, signal_id, handler, detail, user_data, swap, after, comment FROM object_signal WHERE (signal_pk) IS (?);"
+    _row_fields = ("ui_id", "object_id", "owner_id", "signal_id", "handler", "detail", "user_data", "swap", "after", "comment")
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -1144,11 +1163,17 @@ class CmbSignal(CmbBase):
     def from_row(
         cls, project, signal_pk, ui_id, object_id, owner_id, signal_id, handler, detail, user_data, swap, after, comment
     ):
-        return cls(project=project, signal_pk=signal_pk)
+        version = project.db.get_row_version("object_signal", (signal_pk,))
+        retval = cls(project=project, signal_pk=signal_pk)
+        retval._row_prime(version, (ui_id, object_id, owner_id, signal_id, handler, detail, user_data, swap, after, comment))
+        return retval
+
+    def _row_pk(self):
+        return (self.signal_pk,)
 
     @GObject.Property(type=int)
     def ui_id(self):
-        return self.db_get("SELECT ui_id FROM object_signal WHERE (signal_pk) IS (?);", (self.signal_pk,))
+        return self.db_get_column(0)
 
     @ui_id.setter
     def _set_ui_id(self, value):
@@ -1156,7 +1181,7 @@ class CmbSignal(CmbBase):
 
     @GObject.Property(type=int)
     def object_id(self):
-        return self.db_get("SELECT object_id FROM object_signal WHERE (signal_pk) IS (?);", (self.signal_pk,))
+        return self.db_get_column(1)
 
     @object_id.setter
     def _set_object_id(self, value):
@@ -1164,7 +1189,7 @@ class CmbSignal(CmbBase):
 
     @GObject.Property(type=str)
     def owner_id(self):
-        return self.db_get("SELECT owner_id FROM object_signal WHERE (signal_pk) IS (?);", (self.signal_pk,))
+        return self.db_get_column(2)
 
     @owner_id.setter
     def _set_owner_id(self, value):
@@ -1172,7 +1197,7 @@ class CmbSignal(CmbBase):
 
     @GObject.Property(type=str)
     def signal_id(self):
-        return self.db_get("SELECT signal_id FROM object_signal WHERE (signal_pk) IS (?);", (self.signal_pk,))
+        return self.db_get_column(3)
 
     @signal_id.setter
     def _set_signal_id(self, value):
@@ -1180,7 +1205,7 @@ class CmbSignal(CmbBase):
 
     @GObject.Property(type=str)
     def handler(self):
-        return self.db_get("SELECT handler FROM object_signal WHERE (signal_pk) IS (?);", (self.signal_pk,))
+        return self.db_get_column(4)
 
     @handler.setter
     def _set_handler(self, value):
@@ -1188,7 +1213,7 @@ class CmbSignal(CmbBase):
 
     @GObject.Property(type=str)
     def detail(self):
-        return self.db_get("SELECT detail FROM object_signal WHERE (signal_pk) IS (?);", (self.signal_pk,))
+        return self.db_get_column(5)
 
     @detail.setter
     def _set_detail(self, value):
@@ -1196,7 +1221,7 @@ class CmbSignal(CmbBase):
 
     @GObject.Property(type=int)
     def user_data(self):
-        return self.db_get("SELECT user_data FROM object_signal WHERE (signal_pk) IS (?);", (self.signal_pk,))
+        return self.db_get_column(6)
 
     @user_data.setter
     def _set_user_data(self, value):
@@ -1204,7 +1229,7 @@ class CmbSignal(CmbBase):
 
     @GObject.Property(type=bool, default=False)
     def swap(self):
-        return self.db_get("SELECT swap FROM object_signal WHERE (signal_pk) IS (?);", (self.signal_pk,))
+        return self.db_get_column(7)
 
     @swap.setter
     def _set_swap(self, value):
@@ -1212,7 +1237,7 @@ class CmbSignal(CmbBase):
 
     @GObject.Property(type=bool, default=False)
     def after(self):
-        return self.db_get("SELECT after FROM object_signal WHERE (signal_pk) IS (?);", (self.signal_pk,))
+        return self.db_get_column(8)
 
     @after.setter
     def _set_after(self, value):
@@ -1220,7 +1245,7 @@ class CmbSignal(CmbBase):
 
     @GObject.Property(type=str)
     def comment(self):
-        return self.db_get("SELECT comment FROM object_signal WHERE (signal_pk) IS (?);", (self.signal_pk,))
+        return self.db_get_column(9)
 
     @comment.setter
     def _set_comment(self, value):
@@ -1233,6 +1258,20 @@ class CmbBaseObject(CmbBase):
     ui_id = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
     object_id = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    _row_table = "object"
+    _row_query = "SELECT type_id, name, parent_id, internal, type, comment, position, custom_fragment, custom_child_fragment FROM object WHERE (ui_id, object_id) IS (?, ?);"
+    _row_fields = (
+        "type_id",
+        "name",
+        "parent_id",
+        "internal",
+        "type",
+        "comment",
+        "position",
+        "custom_fragment",
+        "custom_child_fragment",
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -1252,17 +1291,28 @@ class CmbBaseObject(CmbBase):
         custom_fragment,
         custom_child_fragment,
     ):
-        return cls(project=project, ui_id=ui_id, object_id=object_id)
-
-    @GObject.Property(type=str)
-    def type_id(self):
-        return self.db_get(
-            "SELECT type_id FROM object WHERE (ui_id, object_id) IS (?, ?);",
+        version = project.db.get_row_version(
+            "object",
             (
-                self.ui_id,
-                self.object_id,
+                ui_id,
+                object_id,
             ),
         )
+        retval = cls(project=project, ui_id=ui_id, object_id=object_id)
+        retval._row_prime(
+            version, (type_id, name, parent_id, internal, type, comment, position, custom_fragment, custom_child_fragment)
+        )
+        return retval
+
+    def _row_pk(self):
+        return (
+            self.ui_id,
+            self.object_id,
+        )
+
+    @GObject.Property(type=str)
+    def type_id(self):
+        return self.db_get_column(0)
 
     @type_id.setter
     def _set_type_id(self, value):
@@ -1277,13 +1327,7 @@ class CmbBaseObject(CmbBase):
 
     @GObject.Property(type=str)
     def name(self):
-        return self.db_get(
-            "SELECT name FROM object WHERE (ui_id, object_id) IS (?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-            ),
-        )
+        return self.db_get_column(1)
 
     @name.setter
     def _set_name(self, value):
@@ -1298,13 +1342,7 @@ class CmbBaseObject(CmbBase):
 
     @GObject.Property(type=int)
     def parent_id(self):
-        return self.db_get(
-            "SELECT parent_id FROM object WHERE (ui_id, object_id) IS (?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-            ),
-        )
+        return self.db_get_column(2)
 
     @parent_id.setter
     def _set_parent_id(self, value):
@@ -1319,13 +1357,7 @@ class CmbBaseObject(CmbBase):
 
     @GObject.Property(type=str)
     def internal(self):
-        return self.db_get(
-            "SELECT internal FROM object WHERE (ui_id, object_id) IS (?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-            ),
-        )
+        return self.db_get_column(3)
 
     @internal.setter
     def _set_internal(self, value):
@@ -1340,13 +1372,7 @@ class CmbBaseObject(CmbBase):
 
     @GObject.Property(type=str)
     def type(self):
-        return self.db_get(
-            "SELECT type FROM object WHERE (ui_id, object_id) IS (?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-            ),
-        )
+        return self.db_get_column(4)
 
     @type.setter
     def _set_type(self, value):
@@ -1361,13 +1387,7 @@ class CmbBaseObject(CmbBase):
 
     @GObject.Property(type=str)
     def comment(self):
-        return self.db_get(
-            "SELECT comment FROM object WHERE (ui_id, object_id) IS (?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-            ),
-        )
+        return self.db_get_column(5)
 
     @comment.setter
     def _set_comment(self, value):
@@ -1382,13 +1402,7 @@ class CmbBaseObject(CmbBase):
 
     @GObject.Property(type=int)
     def position(self):
-        return self.db_get(
-            "SELECT position FROM object WHERE (ui_id, object_id) IS (?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-            ),
-        )
+        return self.db_get_column(6)
 
     @position.setter
     def _set_position(self, value):
@@ -1403,13 +1417,7 @@ class CmbBaseObject(CmbBase):
 
     @GObject.Property(type=str)
     def custom_fragment(self):
-        return self.db_get(
-            "SELECT custom_fragment FROM object WHERE (ui_id, object_id) IS (?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-            ),
-        )
+        return self.db_get_column(7)
 
     @custom_fragment.setter
     def _set_custom_fragment(self, value):
@@ -1424,13 +1432,7 @@ class CmbBaseObject(CmbBase):
 
     @GObject.Property(type=str)
     def custom_child_fragment(self):
-        return self.db_get(
-            "SELECT custom_child_fragment FROM object WHERE (ui_id, object_id) IS (?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-            ),
-        )
+        return self.db_get_column(8)
 
     @custom_child_fragment.setter
     def _set_custom_child_fragment(self, value):
@@ -1453,6 +1455,10 @@ class CmbBaseObjectData(CmbBase):
     data_id = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
     id = GObject.Property(type=int, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    _row_table = "object_data"
+    _row_query = "SELECT value, parent_id, comment, translatable, translation_context, translation_comments FROM object_data WHERE (ui_id, object_id, owner_id, data_id, id) IS (?, ?, ?, ?, ?);"
+    _row_fields = ("value", "parent_id", "comment", "translatable", "translation_context", "translation_comments")
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -1472,20 +1478,32 @@ class CmbBaseObjectData(CmbBase):
         translation_context,
         translation_comments,
     ):
-        return cls(project=project, ui_id=ui_id, object_id=object_id, owner_id=owner_id, data_id=data_id, id=id)
-
-    @GObject.Property(type=str)
-    def value(self):
-        return self.db_get(
-            "SELECT value FROM object_data WHERE (ui_id, object_id, owner_id, data_id, id) IS (?, ?, ?, ?, ?);",
+        version = project.db.get_row_version(
+            "object_data",
             (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.data_id,
-                self.id,
+                ui_id,
+                object_id,
+                owner_id,
+                data_id,
+                id,
             ),
         )
+        retval = cls(project=project, ui_id=ui_id, object_id=object_id, owner_id=owner_id, data_id=data_id, id=id)
+        retval._row_prime(version, (value, parent_id, comment, translatable, translation_context, translation_comments))
+        return retval
+
+    def _row_pk(self):
+        return (
+            self.ui_id,
+            self.object_id,
+            self.owner_id,
+            self.data_id,
+            self.id,
+        )
+
+    @GObject.Property(type=str)
+    def value(self):
+        return self.db_get_column(0)
 
     @value.setter
     def _set_value(self, value):
@@ -1503,16 +1521,7 @@ class CmbBaseObjectData(CmbBase):
 
     @GObject.Property(type=int)
     def parent_id(self):
-        return self.db_get(
-            "SELECT parent_id FROM object_data WHERE (ui_id, object_id, owner_id, data_id, id) IS (?, ?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.data_id,
-                self.id,
-            ),
-        )
+        return self.db_get_column(1)
 
     @parent_id.setter
     def _set_parent_id(self, value):
@@ -1530,16 +1539,7 @@ class CmbBaseObjectData(CmbBase):
 
     @GObject.Property(type=str)
     def comment(self):
-        return self.db_get(
-            "SELECT comment FROM object_data WHERE (ui_id, object_id, owner_id, data_id, id) IS (?, ?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.data_id,
-                self.id,
-            ),
-        )
+        return self.db_get_column(2)
 
     @comment.setter
     def _set_comment(self, value):
@@ -1557,16 +1557,7 @@ class CmbBaseObjectData(CmbBase):
 
     @GObject.Property(type=bool, default=False)
     def translatable(self):
-        return self.db_get(
-            "SELECT translatable FROM object_data WHERE (ui_id, object_id, owner_id, data_id, id) IS (?, ?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.data_id,
-                self.id,
-            ),
-        )
+        return self.db_get_column(3)
 
     @translatable.setter
     def _set_translatable(self, value):
@@ -1584,16 +1575,7 @@ class CmbBaseObjectData(CmbBase):
 
     @GObject.Property(type=str)
     def translation_context(self):
-        return self.db_get(
-            "SELECT translation_context FROM object_data WHERE (ui_id, object_id, owner_id, data_id, id) IS (?, ?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.data_id,
-                self.id,
-            ),
-        )
+        return self.db_get_column(4)
 
     @translation_context.setter
     def _set_translation_context(self, value):
@@ -1611,16 +1593,7 @@ class CmbBaseObjectData(CmbBase):
 
     @GObject.Property(type=str)
     def translation_comments(self):
-        return self.db_get(
-            "SELECT translation_comments FROM object_data WHERE (ui_id, object_id, owner_id, data_id, id) IS (?, ?, ?, ?, ?);",
-            (
-                self.ui_id,
-                self.object_id,
-                self.owner_id,
-                self.data_id,
-                self.id,
-            ),
-        )
+        return self.db_get_column(5)
 
     @translation_comments.setter
     def _set_translation_comments(self, value):
@@ -0,0 +1,117 @@
+#
+# CmbCatalogParser - catalog payload parser
+#
+# Copyright (C) 2026  Juan Pablo Ugarte
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation;
+# version 2.1 of the License.
+#
+# library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# Authors:
+#   Juan Pablo Ugarte <juanpablougarte@gmail.com>
+#
+# SPDX-License-Identifier: LGPL-2.1-only
+#
+
+# This module only depends on the standard library and lxml.
+# Catalog parser workers import it as a top level module, importing anything from the cambalache
+# package would run cambalache/__init__.py which initializes Gtk.
+
+import os
+import io
+import ast
+import sys
+import json
+import types
+import importlib
+import contextlib
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree
+
+WORKER_MODULE = "cmb_catalog_parser"
+
+
+# Decode catalog payload into a list of (table, columns, rows) tuples
+# columns is None for legacy catalogs and rows a generator for line oriented ones
+def get_catalog_tables(root):
+    format_version = int(root.get("format-version", 1))
+    retval = []
+
+    for child in root.getchildren():
+        if child.tag == "accessibility-metadata":
+            retval.append((child.tag, None, child.text))
+        elif format_version < 2:
+            retval.append((child.tag, None, ast.literal_eval(f"[{child.text}]") if child.text else []))
+        else:
+            retval.append((child.tag, child.get("columns").split(","), _iter_catalog_rows(child.text)))
+
+    return retval
+
+
+def _iter_catalog_rows(text):
+    if not text:
+        return
+
+    for line in io.StringIO(text):
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+# Catalog parser worker, it has to be a module function to be used in a process pool
+def parse_catalog_tables(path):
+    # Generators can not be sent back to the main process
+    return [
+        (tag, columns, data if columns is None else list(data))
+        for tag, columns, data in get_catalog_tables(etree.parse(path).getroot())
+    ]
+
+
+# Workers are started with this module directory in sys.path so they can import it without the cambalache package.
+# multiprocessing also runs the main script again in every worker, which would import the whole application,
+# so an empty __main__ module is used while the workers are started.
+@contextlib.contextmanager
+def _worker_environment():
+    dirname = os.path.dirname(os.path.abspath(__file__))
+    main = sys.modules["__main__"]
+
+    sys.path.append(dirname)
+    sys.modules["__main__"] = types.ModuleType("__main__")
+
+    try:
+        yield importlib.import_module(WORKER_MODULE)
+    finally:
+        sys.modules["__main__"] = main
+        sys.path.remove(dirname)
+
+
+# Parse catalogs, a list of (name_version, path) tuples, with jobs processes.
+# Return a dictionary of name_version -> tables as returned by parse_catalog_tables()
+def parse_catalogs(catalogs, jobs):
+    # The calling process already has GLib threads running so forking it is not safe.
+    # Workers are forked from a fork server instead, it only imports this module once.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("forkserver")
+        mp_context.set_forkserver_preload([WORKER_MODULE])
+    else:
+        mp_context = multiprocessing.get_context("spawn")
+
+    # Start with the bigger catalogs
+    catalogs = sorted(catalogs, key=lambda catalog: os.path.getsize(catalog[1]), reverse=True)
+
+    with _worker_environment() as worker:
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context) as executor:
+            futures = {name_version: executor.submit(worker.parse_catalog_tables, path) for name_version, path in catalogs}
+            return {name_version: future.result() for name_version, future in futures.items()}
@@ -36,7 +36,11 @@ from gi.repository import GLib, Gio, GObject
 from cambalache import config, getLogger, _
 from . import utils
 from .constants import EXTERNAL_TYPE, CUSTOM_TYPE, GMENU_TYPE, GMENU_SECTION_TYPE, GMENU_SUBMENU_TYPE, GMENU_ITEM_TYPE
+from .cmb_db_connection import CmbConnection
 from .cmb_db_profile import CmbProfileConnection
+from .cmb_startup_profile import startup_phase
+from .cmb_catalog_parser import get_catalog_tables, parse_catalogs
+from .cmb_db_cache import CmbCatalogCache, CmbCatalogIndex, CATALOG_DOCTYPE, catalog_cache_key
 
 logger = getLogger(__name__)
 
@@ -50,12 +54,30 @@ BASE_SQL = _get_text_resource("db/cmb_base.sql")
 PROJECT_SQL = _get_text_resource("db/cmb_project.sql")
 HISTORY_SQL = _get_text_resource("db/cmb_history.sql")
 
+# Memoized CmbDB.__get_history_triggers_sql() result
+_history_triggers_sql = None
+
+# Catalog payload format, 1 is the legacy Python tuple literal format and 2 is one JSON row per line
+CATALOG_FORMAT_VERSION = 2
+
 
 class CmbDB(GObject.GObject):
     __gtype_name__ = "CmbDB"
 
     target_tk = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    # Number of processes used to parse catalogs, 0 means one per CPU and 1 forces serial loading
+    catalog_jobs = GObject.Property(
+        type=int, default=0, minimum=0, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY
+    )
+
+    # How changes are recorded in the history table.
+    # "triggers": SQL triggers for every column write history rows directly.
+    # "changeset": one trigger per table collects changes in memory, they are written when history is read.
+    history_backend = GObject.Property(
+        type=str, default="triggers", flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY
+    )
+
     def __init__(self, **kwargs):
         self.version = self.__parse_version(config.FILE_FORMAT_VERSION)
         self.accessibility_metadata = {}
@@ -79,34 +101,110 @@ class CmbDB(GObject.GObject):
             "object_data_arg",
         ]
 
+        # Tables wrapped by generated objects with a row cache, see tools/db-codegen.py
+        self.__row_cache_tables = [
+            "library",
+            "ui",
+            "css",
+            "gresource",
+            "object",
+            "object_property",
+            "object_layout_property",
+            "object_signal",
+            "object_data",
+        ]
+
+        # (table, pk...) -> version, bumped every time a row is inserted, updated or deleted
+        self.__row_versions = {}
+        self.__row_serial = 0
+        self.__children_cache = {}
+
         self.__history_commands = {}
         self.__table_column_mapping = {}
 
+        # Changeset history backend state, see history_flush()
+        self.__history_changeset = False
+        self.__history_changes = []
+
+        # table -> (pk column indexes, [(columns, column indexes, is_group)])
+        self.__history_info = {}
+
+        # Undo history counters kept up to date by temporary triggers, None means unknown.
+        # See get_history_counters()
+        self.__history_serial = 0
+        self.__history_index = None
+        self.__history_max = None
+        self.__history_versions = None
+
+        # Third party catalogs registered but not loaded yet, library_id -> (name_version, path)
+        self.__pending_catalogs = {}
+        self.__catalog_index = None
+
         self._output_lowercase_boolean = False
         self._output_use_enum_value = False
 
         self.clipboard = []
         self.clipboard_ids = []
+        self.clipboard_subtrees = []
 
         self.conn = self.__sqlite_connect(":memory:")
 
         super().__init__(**kwargs)
 
-        c = self.conn.cursor()
+        if self.history_backend == "changeset":
+            self.__history_changeset = True
+        elif self.history_backend != "triggers":
+            logger.warning(f"Unknown history backend {self.history_backend}, using triggers")
+
         self.foreign_keys = True
 
-        # Create type system tables
-        c.executescript(BASE_SQL)
+        # Find out which catalogs we need to load
+        with startup_phase("catalog-discovery"):
+            catalogs = self.__collect_catalogs()
 
-        # Create project tables
-        c.executescript(PROJECT_SQL)
+        # Try to restore type system tables from the on disk snapshot first
+        with startup_phase("catalog-cache-restore"):
+            catalog_cache = self.__get_catalog_cache(catalogs)
+            cache_data = catalog_cache.restore(self.conn) if catalog_cache else None
 
-        self.conn.commit()
-        c.close()
+        if cache_data is not None:
+            self.accessibility_metadata = cache_data.get("accessibility_metadata", {})
+            self.__pending_catalogs = {
+                library_id: tuple(pending) for library_id, pending in cache_data.get("pending_catalogs", {}).items()
+            }
+
+            # History triggers are already in the snapshot
+            with startup_phase("history-triggers"):
+                self.__init_dynamic_tables(create_triggers=False)
+            return
+
+        with startup_phase("schema"):
+            c = self.conn.cursor()
+
+            # Create type system tables
+            c.executescript(BASE_SQL)
+
+            # Create project tables
+            c.executescript(PROJECT_SQL)
+
+            self.conn.commit()
+            c.close()
 
         # Initialize history (Undo/Redo) tables
-        self.__init_dynamic_tables()
-        self.__init_data()
+        with startup_phase("history-triggers"):
+            self.__init_dynamic_tables()
+
+        self.__init_data(catalogs)
+
+        if catalog_cache:
+            with startup_phase("catalog-cache-save"):
+                catalog_cache.save(
+                    self.conn,
+                    {
+                        "accessibility_metadata": self.accessibility_metadata,
+                        "pending_catalogs": self.__pending_catalogs,
+                    },
+                )
 
     def __del__(self):
         self.conn.close()
@@ -142,36 +240,515 @@ class CmbDB(GObject.GObject):
 
     def __sqlite_connect(self, path):
         debug_var = os.environ.get("CAMBALACHE_DEBUG", None)
-        if debug_var == "db-profile" :
+        if debug_var == "db-profile":
             conn = sqlite3.connect(path, factory=CmbProfileConnection)
         else:
-            conn = sqlite3.connect(path)
+            conn = sqlite3.connect(path, factory=CmbConnection)
 
+        conn.statement_failed = self.__on_statement_failed
         conn.create_collation("version", sqlite_version_cmp)
         conn.create_aggregate("MAX_VERSION", 1, MaxVersion)
         conn.create_aggregate("MIN_VERSION", 1, MinVersion)
         conn.create_function("CMB_PRINT", 1, cmb_print)
         conn.create_function("cmb_object_list_remove", 2, cmb_object_list_remove)
+        conn.create_function("cmb_row_changed", -1, self.__on_row_changed)
+        conn.create_function("cmb_history_change", -1, self.__on_history_change)
+        conn.create_function("cmb_history_row_changed", 3, self.__on_history_row_changed)
+        conn.create_function("cmb_history_index_changed", 1, self.__on_history_index_changed)
 
         return conn
 
-    def history_insert(self, table, new_values):
-        self.execute(self.__history_commands[table]["INSERT"], new_values)
+    def __on_row_changed(self, table, *pk):
+        key = (table, *pk)
+        self.__row_versions[key] = self.__row_versions.get(key, 0) + 1
+        self.__row_serial += 1
+
+    def get_row_version(self, table, pk):
+        return self.__row_versions.get((table, *pk), 0)
+
+    # Incremented every time any cached row changes
+    def get_row_serial(self):
+        return self.__row_serial
+
+    # Row cache invalidation triggers are temporary, they are not saved in the
+    # catalog snapshot and have to be created for each connection.
+    def __create_row_cache_triggers(self):
+        c = self.conn.cursor()
+
+        for table in self.__row_cache_tables:
+            pk_columns = [row[1] for row in c.execute(f"PRAGMA table_info({table});") if row[5]]
+            old_pk = ", ".join([f"OLD.{col}" for col in pk_columns])
+            new_pk = ", ".join([f"NEW.{col}" for col in pk_columns])
+
+            c.executescript(
+                f"""
+                CREATE TEMP TRIGGER IF NOT EXISTS on_{table}_insert_row_changed AFTER INSERT ON main.{table}
+                BEGIN
+                  SELECT cmb_row_changed('{table}', {new_pk});
+                END;
+
+                CREATE TEMP TRIGGER IF NOT EXISTS on_{table}_update_row_changed AFTER UPDATE ON main.{table}
+                BEGIN
+                  SELECT cmb_row_changed('{table}', {old_pk});
+                  SELECT cmb_row_changed('{table}', {new_pk}) WHERE ({new_pk}) IS NOT ({old_pk});
+                END;
+
+                CREATE TEMP TRIGGER IF NOT EXISTS on_{table}_delete_row_changed AFTER DELETE ON main.{table}
+                BEGIN
+                  SELECT cmb_row_changed('{table}', {old_pk});
+                END;
+                """
+            )
+
+        # Object children lists are keyed by (ui_id, parent_id), see get_object_children()
+        c.executescript(
+            """
+            CREATE TEMP TRIGGER IF NOT EXISTS on_object_insert_children_changed AFTER INSERT ON main.object
+            BEGIN
+              SELECT cmb_row_changed('object_children', NEW.ui_id, NEW.parent_id);
+            END;
+
+            CREATE TEMP TRIGGER IF NOT EXISTS on_object_update_children_changed AFTER UPDATE ON main.object
+            WHEN
+              (NEW.ui_id, NEW.object_id, NEW.parent_id, NEW.position) IS NOT
+              (OLD.ui_id, OLD.object_id, OLD.parent_id, OLD.position)
+            BEGIN
+              SELECT cmb_row_changed('object_children', OLD.ui_id, OLD.parent_id);
+              SELECT cmb_row_changed('object_children', NEW.ui_id, NEW.parent_id)
+                WHERE (NEW.ui_id, NEW.parent_id) IS NOT (OLD.ui_id, OLD.parent_id);
+            END;
+
+            CREATE TEMP TRIGGER IF NOT EXISTS on_object_delete_children_changed AFTER DELETE ON main.object
+            BEGIN
+              SELECT cmb_row_changed('object_children', OLD.ui_id, OLD.parent_id);
+            END;
+            """
+        )
+
+        c.close()
+
+    # History counters triggers, like row cache triggers they have to be created for each connection
+    def __create_history_counters_triggers(self):
+        self.conn.executescript(
+            """
+            CREATE TEMP TRIGGER IF NOT EXISTS on_history_insert_counters AFTER INSERT ON main.history
+            BEGIN
+              SELECT cmb_history_row_changed(NEW.history_id, NULL, NEW.version);
+            END;
+
+            CREATE TEMP TRIGGER IF NOT EXISTS on_history_update_counters AFTER UPDATE OF history_id, version ON main.history
+            BEGIN
+              SELECT cmb_history_row_changed(NEW.history_id, OLD.history_id, NEW.version);
+            END;
+
+            CREATE TEMP TRIGGER IF NOT EXISTS on_history_delete_counters AFTER DELETE ON main.history
+            BEGIN
+              SELECT cmb_history_row_changed(NULL, OLD.history_id, NULL);
+            END;
+
+            CREATE TEMP TRIGGER IF NOT EXISTS on_global_update_history_index AFTER UPDATE OF value ON main.global
+            WHEN NEW.key='history_index'
+            BEGIN
+              SELECT cmb_history_index_changed(NEW.value);
+            END;
+            """
+        )
+
+    def __on_history_row_changed(self, history_id, old_history_id, version):
+        self.__history_serial += 1
+
+        if self.__history_max is None:
+            return
+
+        # Rows are only deleted or renumbered when clearing or trimming history, load counters again
+        if history_id is None or (old_history_id is not None and history_id != old_history_id):
+            self.__history_max = None
+            return
+
+        self.__history_max = max(self.__history_max, history_id)
+
+        if version:
+            self.__history_versions[history_id] = version
+
+    def __on_history_index_changed(self, value):
+        self.__history_serial += 1
+        self.__history_index = int(value)
+
+    # Return (history_index, history_index_max), history_index is -1 when pointing to the last command.
+    # Counters are only loaded from the history table after rows are deleted or renumbered.
+    def get_history_counters(self):
+        self.history_flush()
+
+        if self.__history_max is None:
+            self.__history_index = int(self.get_data("history_index"))
+            self.__history_max = self.execute("SELECT coalesce(MAX(history_id), 0) FROM history;").fetchone()[0]
+            self.__history_versions = {
+                history_id: version
+                for history_id, version in self.execute("SELECT history_id, version FROM history WHERE version > 0;")
+            }
+
+        return self.__history_index, self.__history_max
+
+    def get_history_version(self, history_id):
+        self.get_history_counters()
+        return self.__history_versions.get(history_id, 0)
+
+    # Incremented every time a history row or history_index changes
+    def get_history_serial(self):
+        self.history_flush()
+        return self.__history_serial
+
+    # Changeset history backend triggers only pass the row values to __on_history_change().
+    # Like row cache triggers they are temporary and have to be created for each connection.
+    def __create_history_changeset_triggers(self):
+        if not self.__history_changeset:
+            return
+
+        c = self.conn.cursor()
+
+        for table in self.__tables:
+            columns = list(self.__table_column_mapping[table].keys())
+            old_values = ", ".join([f"OLD.{col}" for col in columns])
+            new_values = ", ".join([f"NEW.{col}" for col in columns])
+
+            c.executescript(
+                f"""
+                CREATE TEMP TRIGGER IF NOT EXISTS on_{table}_insert_history AFTER INSERT ON main.{table}
+                WHEN {self.__history_is_enabled}
+                BEGIN
+                  SELECT cmb_history_change('INSERT', '{table}', {new_values});
+                END;
+
+                CREATE TEMP TRIGGER IF NOT EXISTS on_{table}_update_history AFTER UPDATE ON main.{table}
+                WHEN {self.__history_is_enabled}
+                BEGIN
+                  SELECT cmb_history_change('UPDATE', '{table}', {old_values}, {new_values});
+                END;
+
+                CREATE TEMP TRIGGER IF NOT EXISTS on_{table}_delete_history AFTER DELETE ON main.{table}
+                WHEN {self.__history_is_enabled}
+                BEGIN
+                  SELECT cmb_history_change('DELETE', '{table}', {old_values});
+                END;
+                """
+            )
+
+        c.close()
+
+    # Return a list of children object_id ordered by position and a dictionary of object_id -> position.
+    # Lists are built with one query and kept until any children of parent_id changes.
+    def get_object_children(self, ui_id, parent_id):
+        key = (ui_id, parent_id)
+        version = self.get_row_version("object_children", key)
+        cached = self.__children_cache.get(key, None)
 
-    def history_delete(self, table, table_pk):
-        self.execute(self.__history_commands[table]["DELETE"], table_pk)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
 
-    def history_update(self, table, columns, table_pk, values):
-        update_command = self.__history_commands[table]["UPDATE"]
-        set_expression = f"({','.join(columns)}) = ({','.join(['?' for i in columns])})"
+        children = [
+            row[0]
+            for row in self.execute(
+                "SELECT object_id FROM object WHERE ui_id=? AND parent_id IS ? ORDER BY position ASC;", key
+            )
+        ]
+        positions = {object_id: position for position, object_id in enumerate(children)}
+        self.__children_cache[key] = (version, children, positions)
+
+        return children, positions
+
+    # Changes are tagged with total_changes, it is only incremented once the statement succeeds
+    def __on_history_change(self, command, table, *values):
+        self.__history_changes.append((self.conn.total_changes, command, table, values))
+
+    # Triggers of a failed statement already ran but SQLite rolled back their changes, see CmbConnection
+    def __on_statement_failed(self):
+        total_changes = self.conn.total_changes
+        self.__history_changes = [change for change in self.__history_changes if change[0] != total_changes]
+
+        # History counters could be ahead of the table, load them again
+        self.__history_serial += 1
+        self.__history_max = None
+
+    # Write changes collected by the changeset backend to the history table.
+    # Consecutive changes to the same row are consolidated in the previous history row.
+    def history_flush(self):
+        if not self.__history_changes:
+            return
+
+        changes = self.__history_changes
+        self.__history_changes = []
+
+        def dumps(values):
+            return None if values is None else json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+
+        def loads(values):
+            return None if values is None else json.loads(values)
+
+        c = self.conn.cursor()
+
+        # Any new change clears the redo history.
+        # This can run in the middle of a transaction so do not use executescript() which commits it first
+        for sql in self.__clear_history.split(";"):
+            c.execute(sql)
+
+        # [history_id, version, command, table_name, columns, table_pk, new_values, old_values]
+        last = c.execute(
+            "SELECT history_id, version, command, table_name, columns, table_pk, new_values FROM history "
+            "ORDER BY history_id DESC LIMIT 1;"
+        ).fetchone()
+
+        if last is not None:
+            history_id, version, command, table_name, columns, table_pk, new_values = last
+            last = [history_id, version, command, table_name, loads(columns), loads(table_pk), loads(new_values), None]
+            history_id += 1
+        else:
+            history_id = 1
+
+        last_compressed = False
+        rows = []
+
+        for total_changes, command, table, values in changes:
+            pk_indexes, updates = self.__history_info[table]
+
+            if command != "UPDATE":
+                values = list(values)
+                new_values, old_values = (values, None) if command == "INSERT" else (None, values)
+                rows.append([history_id, 0, command, table, None, [values[i] for i in pk_indexes], new_values, old_values])
+                history_id += 1
+                continue
+
+            n_columns = len(values) // 2
+            old_values, new_values = list(values[:n_columns]), list(values[n_columns:])
+            old_pk = [old_values[i] for i in pk_indexes]
+
+            for columns, indexes, is_group in updates:
+                if all([old_values[i] == new_values[i] for i in indexes]):
+                    continue
+
+                prev = rows[-1] if rows else last
+                same_row = prev is not None and prev[3] == table and prev[5] == old_pk
+
+                if same_row and (
+                    (prev[2] == "UPDATE" and prev[4] == columns)
+                    or (prev[2] == "INSERT" and (is_group or prev[6][indexes[0]] is not None))
+                ):
+                    # Compress consecutive updates of the same row
+                    prev[1] += 1
+                    prev[6] = new_values if prev[2] == "INSERT" else [new_values[i] for i in indexes]
+                    last_compressed = last_compressed or prev is last
+                    continue
+
+                rows.append(
+                    [
+                        history_id,
+                        0,
+                        "UPDATE",
+                        table,
+                        columns,
+                        [new_values[i] for i in pk_indexes],
+                        [new_values[i] for i in indexes],
+                        [old_values[i] for i in indexes],
+                    ]
+                )
+                history_id += 1
+
+        if last_compressed:
+            c.execute("UPDATE history SET version=?, new_values=? WHERE history_id=?;", (last[1], dumps(last[6]), last[0]))
+
+        c.executemany(
+            """
+            INSERT INTO history (history_id, version, command, table_name, columns, table_pk, new_values, old_values)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+            """,
+            [
+                (history_id, version, command, table, dumps(columns), dumps(pk), dumps(new_values), dumps(old_values))
+                for history_id, version, command, table, columns, pk, new_values, old_values in rows
+            ],
+        )
+        c.close()
+
+    # Size in bytes of the data stored in a history row
+    __history_row_size = """
+        coalesce(length(CAST(columns AS BLOB)), 0) + coalesce(length(CAST(message AS BLOB)), 0) +
+        coalesce(length(CAST(table_pk AS BLOB)), 0) + coalesce(length(CAST(new_values AS BLOB)), 0) +
+        coalesce(length(CAST(old_values AS BLOB)), 0)
+    """
+
+    def get_history_size(self):
+        self.history_flush()
+        return int(self.execute(f"SELECT total({self.__history_row_size}) FROM history;").fetchone()[0])
+
+    # Discard the oldest undo steps until history fits in max_steps and max_bytes, 0 means no limit.
+    # Steps are whole PUSH/POP ranges or single commands outside a range, the newest one is always kept.
+    # Remaining rows are renumbered from 1, returns the number of rows removed.
+    def history_trim(self, max_steps, max_bytes):
+        self.history_flush()
+
+        c = self.conn.cursor()
 
-        exp_vals = []
-        for col in columns:
-            exp_vals.append(values[self.__table_column_mapping[table][col]])
+        # Every step has at least one row
+        n_rows = c.execute("SELECT coalesce(MAX(history_id), 0) FROM history;").fetchone()[0]
+        if not max_bytes and (not max_steps or n_rows <= max_steps):
+            c.close()
+            return 0
+
+        # First history_id and size of every top level step
+        steps = c.execute(
+            f"""
+            WITH row AS (
+              SELECT history_id, command, {self.__history_row_size} AS size,
+                sum(CASE command WHEN 'PUSH' THEN 1 WHEN 'POP' THEN -1 ELSE 0 END) OVER (ORDER BY history_id) AS depth
+              FROM history
+            ),
+            step AS (
+              SELECT history_id, size,
+                sum((command IS 'PUSH' AND depth = 1) OR (command NOT IN ('PUSH', 'POP') AND depth = 0))
+                  OVER (ORDER BY history_id) AS step
+              FROM row
+            )
+            SELECT min(history_id), total(size) FROM step GROUP BY step ORDER BY step;
+            """
+        ).fetchall()
+
+        n_steps = len(steps)
+        size = sum([step_size for history_id, step_size in steps])
+        first = 0
+
+        while first < n_steps - 1 and ((max_steps and n_steps - first > max_steps) or (max_bytes and size > max_bytes)):
+            size -= steps[first][1]
+            first += 1
+
+        if first == 0:
+            c.close()
+            return 0
+
+        removed = steps[first][0] - 1
+
+        # Remove whole ranges and renumber the rest, negating first avoids primary key collisions
+        c.execute("DELETE FROM history WHERE history_id <= ?;", (removed,))
+        c.execute("UPDATE history SET history_id=-history_id, range_id=-range_id;")
+        c.execute("UPDATE history SET history_id=-history_id-?, range_id=-range_id-?;", (removed, removed))
+        c.execute(
+            "UPDATE global SET value=max(value - ?, 0) WHERE key='history_index' AND value >= 0;",
+            (removed,),
+        )
+        c.close()
 
-        self.execute(update_command.format(set_expression=set_expression), exp_vals + table_pk)
+        return removed
 
-    def __create_history_triggers(self, c, table):
+    # Load history rows from first to last as
+    # (history_id, command, range_id, table_name, columns, table_pk, old_values, new_values) with JSON decoded
+    def history_get_range(self, first, last):
+        def loads(value):
+            return json.loads(value) if value else None
+
+        return [
+            (history_id, command, range_id, table, loads(columns), loads(table_pk), loads(old_values), loads(new_values))
+            for history_id, command, range_id, table, columns, table_pk, old_values, new_values in self.execute(
+                """
+                SELECT history_id, command, range_id, table_name, columns, table_pk, old_values, new_values
+                FROM history
+                WHERE history_id BETWEEN ? AND ?
+                ORDER BY history_id;
+                """,
+                (first, last),
+            )
+        ]
+
+    # Undo or redo history rows in the given order.
+    # Consecutive rows that need the same statement are executed together.
+    def history_replay(self, undo, rows):
+        c = self.conn.cursor()
+        query = None
+        params = []
+
+        for history_id, command, range_id, table, columns, table_pk, old_values, new_values in rows:
+            commands = self.__history_commands.get(table, None)
+
+            if commands is None:
+                continue
+
+            if command == "INSERT":
+                row_query, row_params = (commands["DELETE"], table_pk) if undo else (commands["INSERT"], new_values)
+            elif command == "DELETE":
+                row_query, row_params = (commands["INSERT"], old_values) if undo else (commands["DELETE"], table_pk)
+            elif command == "UPDATE":
+                # values has one item for each column
+                set_expression = f"({','.join(columns)}) = ({','.join(['?' for i in columns])})"
+                row_query = commands["UPDATE"].format(set_expression=set_expression)
+                row_params = (old_values if undo else new_values) + table_pk
+            else:
+                continue
+
+            if row_query != query:
+                if params:
+                    c.executemany(query, params)
+                query = row_query
+                params = []
+
+            params.append(row_params)
+
+        if params:
+            c.executemany(query, params)
+
+        c.close()
+
+    # Return a full table row from an UPDATE history row, columns not stored in history are taken from the DB
+    def history_update_row(self, table, columns, table_pk, values):
+        row = self.execute(self.__history_commands[table]["SELECT"], table_pk).fetchone()
+        row = list(row) if row else [None] * len(self.__table_column_mapping[table])
+
+        for col, value in zip(columns, values):
+            row[self.__table_column_mapping[table][col]] = value
+
+        return row
+
+    def __get_catalog_cache(self, catalogs):
+        # Profile connection keeps its own tables in the DB
+        if os.environ.get("CAMBALACHE_DEBUG", None) == "db-profile":
+            return None
+
+        try:
+            key = catalog_cache_key(
+                self.target_tk,
+                [self.__catalog_index.get_fingerprint(path) for name_version, path, third_party, attrs in catalogs],
+                # History triggers are only in the snapshot with the triggers backend
+                BASE_SQL
+                + PROJECT_SQL
+                + HISTORY_SQL
+                + ("-- changeset" if self.__history_changeset else self.__get_history_triggers_sql()),
+            )
+        except Exception as e:
+            logger.warning(f"Error getting catalog cache key: {e}")
+            return None
+
+        return CmbCatalogCache(self.target_tk, key)
+
+    # Generated history triggers are part of the snapshot, build them on an empty schema so
+    # that any change in the generator invalidates the catalog cache.
+    # They only depend on the schema so they are built once per process.
+    def __get_history_triggers_sql(self):
+        global _history_triggers_sql
+
+        if _history_triggers_sql is not None:
+            return _history_triggers_sql
+
+        conn = sqlite3.connect(":memory:")
+        c = conn.cursor()
+        c.executescript(BASE_SQL + PROJECT_SQL + HISTORY_SQL)
+
+        triggers = []
+        for table in self.__tables:
+            triggers += self.__create_history_triggers(c, table, create_triggers=False)
+
+        c.close()
+        conn.close()
+
+        _history_triggers_sql = "\n".join(triggers)
+
+        return _history_triggers_sql
+
+    def __create_history_triggers(self, c, table, create_triggers=True):
         # Get table columns
         columns = None
         old_values = None
@@ -183,6 +760,7 @@ class CmbDB(GObject.GObject):
 
         # Use this flag to know if we should log history or not
         history_is_enabled = "(SELECT value FROM global WHERE key='history_enabled') IS TRUE"
+        self.__history_is_enabled = history_is_enabled
         history_seq = "(SELECT MAX(history_id) FROM history)"
         history_next_seq = f"(coalesce({history_seq}, 0) + 1)"
         clear_history = """
@@ -234,6 +812,13 @@ class CmbDB(GObject.GObject):
         # Map column index to column name
         self.__table_column_mapping[table] = column_mapping
 
+        # Columns updated together first, then every other non PK column, in the same order as the triggers
+        history_updates = [(columns, [column_mapping[col] for col in columns], True) for columns in unique_constraints]
+        history_updates += [
+            ([col], [column_mapping[col]], False) for col in non_pk_columns if col not in unique_constraints_flat
+        ]
+        self.__history_info[table] = ([column_mapping[col] for col in pk_columns], history_updates)
+
         columns = ", ".join(all_columns)
         columns_format = ", ".join(["?" for col in all_columns])
         pkcolumns = ", ".join(pk_columns)
@@ -247,10 +832,13 @@ class CmbDB(GObject.GObject):
             "DELETE": f"DELETE FROM {table} WHERE ({pkcolumns}) IS ({pkcolumns_format});",
             "INSERT": f"INSERT INTO {table} ({columns}) VALUES ({columns_format});",
             "UPDATE": f"UPDATE {table} SET {{set_expression}} WHERE ({pkcolumns}) IS ({pkcolumns_format});",
+            "SELECT": f"SELECT {columns} FROM {table} WHERE ({pkcolumns}) IS ({pkcolumns_format});",
         }
 
+        triggers = []
+
         # INSERT Trigger
-        c.execute(
+        triggers.append(
             f"""
             CREATE TRIGGER on_{table}_insert AFTER INSERT ON {table}
             WHEN
@@ -264,7 +852,7 @@ class CmbDB(GObject.GObject):
         )
 
         # DELETE trigger
-        c.execute(
+        triggers.append(
             f"""
             CREATE TRIGGER on_{table}_delete AFTER DELETE ON {table}
             WHEN
@@ -278,7 +866,9 @@ class CmbDB(GObject.GObject):
         )
 
         if len(pk_columns) == 0:
-            return
+            return self.__execute_history_triggers(c, triggers, create_triggers)
+
+        # UPDATE history rows only store the changed columns values, INSERT and DELETE the whole row
 
         # UPDATE Trigger for each non PK column unique indexes
         for columns in unique_constraints:
@@ -288,7 +878,7 @@ class CmbDB(GObject.GObject):
             old_columns = ",".join(f"OLD.{col}" for col in columns)
             string_columns = ",".join(f"'{col}'" for col in columns)
 
-            c.execute(
+            triggers.append(
                 f"""
                 CREATE TRIGGER on_{table}_update_{underscore_columns} AFTER UPDATE OF {colon_columns} ON {table}
                 WHEN
@@ -307,7 +897,7 @@ class CmbDB(GObject.GObject):
                 BEGIN
                   {clear_history};
                   INSERT INTO history (history_id, command, table_name, columns, table_pk, new_values, old_values)
-                    VALUES ({history_next_seq}, 'UPDATE', '{table}', json_array({string_columns}), json_array({new_pk_values}), json_array({new_values}), json_array({old_values}));
+                    VALUES ({history_next_seq}, 'UPDATE', '{table}', json_array({string_columns}), json_array({new_pk_values}), json_array({new_columns}), json_array({old_columns}));
                 END;
                 """
             )
@@ -320,7 +910,7 @@ class CmbDB(GObject.GObject):
             # Get column index
             column_index = all_columns.index(column)
 
-            c.execute(
+            triggers.append(
                 f"""
                 CREATE TRIGGER on_{table}_update_{column} AFTER UPDATE OF {column} ON {table}
                 WHEN
@@ -339,12 +929,12 @@ class CmbDB(GObject.GObject):
                 BEGIN
                   {clear_history};
                   INSERT INTO history (history_id, command, table_name, columns, table_pk, new_values, old_values)
-                    VALUES ({history_next_seq}, 'UPDATE', '{table}', json_array('{column}'), json_array({new_pk_values}), json_array({new_values}), json_array({old_values}));
+                    VALUES ({history_next_seq}, 'UPDATE', '{table}', json_array('{column}'), json_array({new_pk_values}), json_array(NEW.{column}), json_array(OLD.{column}));
                 END;
                 """
             )
 
-            c.execute(
+            triggers.append(
                 f"""
                 CREATE TRIGGER on_{table}_update_{column}_compress_update AFTER UPDATE OF {column} ON {table}
                 WHEN
@@ -354,12 +944,12 @@ class CmbDB(GObject.GObject):
                   (SELECT command, table_name, columns FROM history WHERE history_id = {history_seq})
                   IS ('UPDATE', '{table}', json_array('{column}'))
                 BEGIN
-                  UPDATE history SET version=version+1, new_values=json_array({new_values}) WHERE history_id = {history_seq};
+                  UPDATE history SET version=version+1, new_values=json_array(NEW.{column}) WHERE history_id = {history_seq};
                 END;
                 """
             )
 
-            c.execute(
+            triggers.append(
                 f"""
                 CREATE TRIGGER on_{table}_update_{column}_compress_insert AFTER UPDATE OF {column} ON {table}
                 WHEN
@@ -374,19 +964,33 @@ class CmbDB(GObject.GObject):
                 """
             )
 
-    def __init_dynamic_tables(self):
+        return self.__execute_history_triggers(c, triggers, create_triggers)
+
+    def __execute_history_triggers(self, c, triggers, create_triggers):
+        if create_triggers:
+            for sql in triggers:
+                c.execute(sql)
+
+        return triggers
+
+    def __init_dynamic_tables(self, create_triggers=True):
         c = self.conn.cursor()
 
         # Create history main tables
-        c.executescript(HISTORY_SQL)
+        if create_triggers:
+            c.executescript(HISTORY_SQL)
 
         # Create history tables for each tracked table
         for table in self.__tables:
-            self.__create_history_triggers(c, table)
+            self.__create_history_triggers(c, table, create_triggers=create_triggers and not self.__history_changeset)
 
         self.conn.commit()
         c.close()
 
+        self.__create_row_cache_triggers()
+        self.__create_history_counters_triggers()
+        self.__create_history_changeset_triggers()
+
     def __init_builtin_types(self):
         target_lib = "gtk" if self.target_tk == "gtk-4.0" else "gtk+"
 
@@ -457,9 +1061,10 @@ class CmbDB(GObject.GObject):
                 (gtype, gtype, gtype, gtype),
             )
 
+        self.__update_type_ancestors()
         self.commit()
 
-    def __init_data(self):
+    def __collect_catalogs(self):
         supported_targets = {"gtk+-3.0", "gtk-4.0"}
 
         if self.target_tk not in supported_targets:
@@ -470,8 +1075,8 @@ class CmbDB(GObject.GObject):
         else:
             exclude_catalogs = {"gdk-4.0", "gsk-4.0", "gtk-4.0"}
 
-        # Dictionary of catalog XML trees
-        catalogs_tree = {}
+        # Dictionary of catalog paths
+        catalogs_path = {}
 
         # Catalog dependencies
         catalog_graph = {}
@@ -487,37 +1092,34 @@ class CmbDB(GObject.GObject):
         if user_catalogs not in catalog_dirs:
             catalog_dirs.append(user_catalogs)
 
-        # Collect and parse all catalogs in all system data directories
+        # Catalog headers are cached, only new or modified files get parsed
+        catalog_index = self.__catalog_index = CmbCatalogIndex()
+
+        # Collect all catalogs in all system data directories
         for catalogs_dir in catalog_dirs:
             if not os.path.exists(catalogs_dir) or not os.path.isdir(catalogs_dir):
                 continue
 
-            # Collect and parse all catalogs in directory
+            # Collect all catalogs in directory
             for catalog in os.listdir(catalogs_dir):
                 catalog_path = os.path.join(catalogs_dir, catalog)
                 if os.path.isdir(catalog_path):
                     continue
 
-                content_type = utils.content_type_guess(catalog_path)
-
-                if content_type != "application/xml":
-                    continue
-
-                tree = etree.parse(catalog_path)
+                entry = catalog_index.get(catalog_path)
 
-                if tree.docinfo.doctype != "<!DOCTYPE cambalache-catalog SYSTEM \"cambalache-catalog.dtd\">":
+                if entry is None:
                     continue
 
-                root = tree.getroot()
-                name = root.get("name", None)
-                version = root.get("version", None)
-                dependecies = root.get("depends", None)
+                name = entry["name"]
+                version = entry["version"]
+                dependecies = entry["depends"]
                 name_version = f"{name}-{version}"
 
                 if name_version in catalog_graph:
                     continue
 
-                catalogs_tree[name_version] = (tree, catalog_path)
+                catalogs_path[name_version] = (catalog_path, entry["attrs"])
 
                 # Ignore different gtk catalog from target_tk
                 if name_version in exclude_catalogs:
@@ -536,6 +1138,8 @@ class CmbDB(GObject.GObject):
                 if depends is not None:
                     catalog_graph[name_version] = depends
 
+        catalog_index.save()
+
         if self.target_tk not in catalog_graph:
             raise Exception(f"Could not find {self.target_tk} catalog")
 
@@ -558,7 +1162,9 @@ class CmbDB(GObject.GObject):
         except CycleError as e:
             raise Exception(f"Could not load catalogs because of dependency cycle {e}")
 
-        # Load catalogs in topological order
+        # List of catalogs to load in topological order
+        retval = []
+
         for name_version in sorted_catalogs:
             # Ignore edges not in the root list
             if name_version not in catalog_graph:
@@ -576,14 +1182,66 @@ class CmbDB(GObject.GObject):
             if deps is None:
                 continue
 
-            # Load catalog
-            tree, path = catalogs_tree.get(name_version, (None, None))
-            if tree:
+            path, attrs = catalogs_path.get(name_version, (None, None))
+            if path:
                 third_party = name_version not in builtin_catalogs
-                self.load_catalog(name_version, path=path, tree=tree, third_party=third_party)
+                retval.append((name_version, path, third_party, attrs))
+
+        return retval
+
+    def __get_catalog_jobs(self):
+        if self.catalog_jobs:
+            return self.catalog_jobs
+
+        env_jobs = os.environ.get("CAMBALACHE_CATALOG_JOBS", None)
+
+        if env_jobs:
+            try:
+                jobs = int(env_jobs)
+                if jobs < 0:
+                    raise ValueError("negative number of jobs")
+                return jobs
+            except ValueError:
+                logger.warning(f"Invalid CAMBALACHE_CATALOG_JOBS value {env_jobs!r}, using default")
+
+        return 0
+
+    def __parse_catalogs(self, catalogs):
+        jobs = self.__get_catalog_jobs() or os.cpu_count() or 1
+        jobs = min(jobs, len(catalogs))
+
+        if jobs <= 1:
+            return {}
+
+        try:
+            return parse_catalogs(catalogs, jobs)
+        except Exception as e:
+            logger.warning(f"Error parsing catalogs in parallel, falling back to serial loading: {e}")
+            return {}
+
+    def __init_data(self, catalogs):
+        # Parse and decode catalog payloads in parallel, only the inserts need the connection
+        with startup_phase("catalog-parse"):
+            catalog_tables = self.__parse_catalogs(
+                [(name_version, path) for name_version, path, third_party, attrs in catalogs if not third_party]
+            )
+
+        # Load catalogs in topological order
+        # Third party catalogs are only registered, their types are loaded the first time they get enabled
+        for name_version, path, third_party, attrs in catalogs:
+            with startup_phase(f"load-catalog {name_version}"):
+                self.load_catalog(
+                    name_version,
+                    path=path,
+                    third_party=third_party,
+                    lazy=third_party,
+                    attrs=attrs,
+                    tables=catalog_tables.get(name_version, None),
+                )
 
         # Add builtins, (menu depends on gio)
-        self.__init_builtin_types()
+        with startup_phase("builtin-types"):
+            self.__init_builtin_types()
 
     @staticmethod
     def get_target_from_file(filename):
@@ -638,6 +1296,9 @@ class CmbDB(GObject.GObject):
 
     def __load_table_from_tuples(self, c, table, tuples, version=None):
         data = ast.literal_eval(f"[{tuples}]") if tuples else []
+        self.__load_table_rows(c, table, data, version)
+
+    def __load_table_rows(self, c, table, data, version=None):
         if len(data) == 0:
             return
 
@@ -663,8 +1324,8 @@ class CmbDB(GObject.GObject):
         # Drop temp table
         c.execute(f"DROP TABLE temp.{table};")
 
-    def __load_accessibility_metadata(self, node):
-        data = json.loads(node.text)
+    def __load_accessibility_metadata(self, text):
+        data = json.loads(text)
 
         if self.target_tk == "gtk-4.0":
             metadata = {}
@@ -687,32 +1348,110 @@ class CmbDB(GObject.GObject):
 
         self.accessibility_metadata = metadata
 
-    def load_catalog(self, name_version, path=None, tree=None, third_party=False):
+    def __get_catalog_root(self, name_version, path, tree=None):
         if path is None:
             logger.warning(f"Do not know from where to load {name_version}")
-            return
+            return None
 
         if tree is None:
             tree = etree.parse(path)
 
-        if tree.docinfo.doctype != "<!DOCTYPE cambalache-catalog SYSTEM \"cambalache-catalog.dtd\">":
+        if tree.docinfo.doctype != CATALOG_DOCTYPE:
             logger.warning(f"File {path} is not a Cambalache catalog")
-            return
+            return None
 
         root = tree.getroot()
 
-        logger.debug(f"Loading catalog {name_version}: {path}")
+        if not self.__check_catalog_attrs(name_version, path, root.attrib):
+            return None
 
-        name = root.get("name", None)
-        version = root.get("version", None)
-        namespace = root.get("namespace", None)
-        prefix = root.get("prefix", None)
-        targets = root.get("targets", "")
+        return root
 
-        if name_version != f"{name}-{version}":
+    def __check_catalog_attrs(self, name_version, path, attrs):
+        if name_version != f"{attrs.get('name', None)}-{attrs.get('version', None)}":
             logger.warning(f"{name_version} does not match catalog {path}")
+            return False
+
+        if int(attrs.get("format-version", 1)) > CATALOG_FORMAT_VERSION:
+            logger.warning(f"Catalog {path} format version is not supported")
+            return False
+
+        return True
+
+    def __load_catalog_tables(self, tables):
+        c = self.conn.cursor()
+
+        # Avoid circular dependencies errors
+        self.foreign_keys = False
+
+        for tag, columns, data in tables:
+            if tag == "accessibility-metadata":
+                self.__load_accessibility_metadata(data)
+            elif columns is None:
+                self.__load_table_rows(c, tag, data)
+            else:
+                cols = ", ".join(["?" for col in columns])
+                c.executemany(f"INSERT INTO {tag} ({', '.join(columns)}) VALUES ({cols})", data)
+
+        self.foreign_keys = True
+
+        c.close()
+
+        self.__update_type_ancestors()
+        self.commit()
+
+    # Add type_ancestor rows for library types that do not have them yet.
+    # Template types are handled by triggers.
+    def __update_type_ancestors(self):
+        self.execute(
+            """
+            WITH RECURSIVE
+              new_type(type_id, parent_id) AS (
+                SELECT type_id, parent_id FROM type
+                WHERE library_id IS NOT NULL AND
+                      parent_id IS NOT NULL AND
+                      type_id NOT IN (SELECT type_id FROM type_ancestor)
+              ),
+              ancestor(type_id, ancestor_id, generation) AS (
+                SELECT type_id, parent_id, 1 FROM new_type
+                UNION ALL
+                SELECT ancestor.type_id, type.parent_id, generation + 1
+                FROM type JOIN ancestor ON type.type_id = ancestor.ancestor_id
+                WHERE type.parent_id IS NOT NULL
+              )
+            INSERT INTO type_ancestor (type_id, ancestor_id, generation)
+              SELECT type_id, ancestor_id, generation FROM ancestor
+              UNION ALL
+              SELECT type_iface.type_id, type_iface.iface_id, 0
+              FROM type_iface JOIN new_type ON type_iface.type_id = new_type.type_id;
+            """
+        )
+
+    def load_catalog(
+        self, name_version, path=None, tree=None, third_party=False, lazy=False, attrs=None, tables=None
+    ):
+        root = None
+
+        # Catalog root attributes might be already known from the discovery index
+        if attrs is None or (not lazy and tables is None):
+            with startup_phase("xml-parse"):
+                root = self.__get_catalog_root(name_version, path, tree)
+
+            if root is None:
+                return
+
+            attrs = root.attrib
+        elif not self.__check_catalog_attrs(name_version, path, attrs):
             return
 
+        logger.debug(f"Loading catalog {name_version}: {path}")
+
+        name = attrs.get("name", None)
+        version = attrs.get("version", None)
+        namespace = attrs.get("namespace", None)
+        prefix = attrs.get("prefix", None)
+        targets = attrs.get("targets", "")
+
         c = self.conn.cursor()
 
         # Insert library
@@ -730,14 +1469,12 @@ class CmbDB(GObject.GObject):
 
         # Get dependencies
         deps = {}
-        for dep in root.get("depends", "").split(","):
+        for dep in attrs.get("depends", "").split(","):
             tokens = dep.split("-")
             if len(tokens) == 2:
                 lib, ver = tokens
                 deps[lib] = ver
 
-        c = self.conn.cursor()
-
         # Load dependencies
         for dep in deps:
             c.execute("SELECT version FROM library WHERE library_id=?;", (dep,))
@@ -754,21 +1491,53 @@ class CmbDB(GObject.GObject):
             except Exception as e:
                 logger.warning(e)
 
-        # Avoid circular dependencies errors
-        self.foreign_keys = False
+        c.close()
 
-        for child in root.getchildren():
-            if child.tag == "accessibility-metadata":
-                self.__load_accessibility_metadata(child)
-            else:
-                self.__load_table_from_tuples(c, child.tag, child.text)
+        if lazy:
+            # Only keep track of where to load the rest of the catalog from
+            self.__pending_catalogs[name] = (name_version, path)
+            self.commit()
+        else:
+            if tables is None:
+                with startup_phase("literal-decode"):
+                    tables = get_catalog_tables(root)
 
-        self.foreign_keys = True
+            with startup_phase("insert"):
+                self.__load_catalog_tables(tables)
 
-        c.close()
-        self.commit()
+    def is_catalog_loaded(self, library_id):
+        return library_id not in self.__pending_catalogs
+
+    def load_pending_catalog(self, library_id):
+        pending = self.__pending_catalogs.pop(library_id, None)
+
+        if pending is None:
+            return
+
+        # Dependencies have to be loaded first
+        for row in self.execute(
+            "SELECT dependency_id FROM library_dependency WHERE library_id=?;", (library_id,)
+        ).fetchall():
+            self.load_pending_catalog(row[0])
+
+        name_version, path = pending
+
+        try:
+            root = self.__get_catalog_root(name_version, path)
+        except Exception as e:
+            logger.warning(f"Error loading catalog {name_version}: {e}")
+            return
+
+        if root is None:
+            return
+
+        logger.debug(f"Loading pending catalog {name_version}: {path}")
+
+        with startup_phase(f"load-pending-catalog {name_version}"):
+            self.__load_catalog_tables(get_catalog_tables(root))
 
     def move_to_fs(self, filename):
+        self.history_flush()
         self.conn.commit()
 
         if self.__db_filename == filename:
@@ -788,6 +1557,12 @@ class CmbDB(GObject.GObject):
 
         # Update current connection
         self.conn = conn
+        self.__create_row_cache_triggers()
+        self.__create_history_counters_triggers()
+        self.__create_history_changeset_triggers()
+
+        # Temporary tables are not copied
+        self.clipboard_subtrees = []
 
     def cursor(self):
         return self.conn.cursor()
@@ -2014,25 +2789,17 @@ class CmbDB(GObject.GObject):
         # Fix bind owner (Owner needs to point to the right parent class)
         self.conn.execute(
             """
-            WITH RECURSIVE ancestor(type_id, generation, parent_id) AS (
-              SELECT type_id, 1, parent_id FROM type
-                WHERE parent_id IS NOT NULL AND
-                      parent_id != 'interface' AND
-                      parent_id != 'enum' AND
-                      parent_id != 'flags'
-              UNION ALL
-              SELECT ancestor.type_id, generation + 1, type.parent_id
-                FROM type JOIN ancestor ON type.type_id = ancestor.parent_id
-                WHERE type.parent_id IS NOT NULL
-            )
             UPDATE object_property AS op
             SET bind_owner_id=p.owner_id
-            FROM property AS p, ancestor AS a
+            FROM property AS p, type AS t, type_ancestor AS a
             WHERE op.ui_id=? AND
                 op.bind_owner_id IS NOT NULL AND
                 op.bind_property_id = p.property_id AND
-                op.bind_owner_id = a.type_id AND
-                p.owner_id = a.parent_id
+                op.bind_owner_id = t.type_id AND
+                t.parent_id NOT IN ('interface', 'enum', 'flags') AND
+                t.type_id = a.type_id AND
+                a.generation > 0 AND
+                p.owner_id = a.ancestor_id
             """,
             (ui_id,),
         )
@@ -2040,23 +2807,12 @@ class CmbDB(GObject.GObject):
         # Fix data references to objects
         self.conn.execute(
             """
-            WITH RECURSIVE ancestor(type_id, generation, parent_id) AS (
-              SELECT type_id, 1, parent_id FROM type
-                WHERE parent_id IS NOT NULL AND
-                      parent_id != 'enum' AND
-                      parent_id != 'flags'
-              UNION ALL
-              SELECT ancestor.type_id, generation + 1, type.parent_id
-                FROM type JOIN ancestor ON type.type_id = ancestor.parent_id
-                WHERE type.parent_id IS NOT NULL
-            )
             UPDATE object_data AS od SET value=o.object_id
-            FROM object AS o, type_data AS td, type AS t, ancestor AS a
+            FROM object AS o, type_data AS td, type_ancestor AS a
             WHERE
                 od.ui_id=? AND od.ui_id=o.ui_id AND od.value=o.name AND
                 od.owner_id=td.owner_id AND od.data_id=td.data_id AND
-                td.type_id=t.type_id AND
-                t.type_id=a.type_id AND a.generation=1 AND a.parent_id IN ('GObject', 'interface')
+                td.type_id=a.type_id AND a.generation=1 AND a.ancestor_id IN ('GObject', 'interface')
             """,
             (ui_id,),
         )
@@ -2064,23 +2820,12 @@ class CmbDB(GObject.GObject):
         # Fix data arg references to objects
         self.conn.execute(
             """
-            WITH RECURSIVE ancestor(type_id, generation, parent_id) AS (
-              SELECT type_id, 1, parent_id FROM type
-                WHERE parent_id IS NOT NULL AND
-                      parent_id != 'enum' AND
-                      parent_id != 'flags'
-              UNION ALL
-              SELECT ancestor.type_id, generation + 1, type.parent_id
-                FROM type JOIN ancestor ON type.type_id = ancestor.parent_id
-                WHERE type.parent_id IS NOT NULL
-            )
             UPDATE object_data_arg AS oda SET value=o.object_id
-            FROM object AS o, type_data_arg AS tda, type AS t, ancestor AS a
+            FROM object AS o, type_data_arg AS tda, type_ancestor AS a
             WHERE
                 oda.ui_id=? AND oda.ui_id=o.ui_id AND oda.value=o.name AND
                 oda.owner_id=tda.owner_id AND oda.data_id=tda.data_id AND oda.key=tda.key AND
-                tda.type_id=t.type_id AND
-                t.type_id=a.type_id AND a.generation=1 AND a.parent_id IN ('GObject', 'interface')
+                tda.type_id=a.type_id AND a.generation=1 AND a.ancestor_id IN ('GObject', 'interface')
             """,
             (ui_id,),
         )
@@ -3280,45 +4025,67 @@ class CmbDB(GObject.GObject):
 
         return etree.tostring(gresource, pretty_print=True, xml_declaration=True, encoding="UTF-8").decode("UTF-8")
 
+    # Tables holding per object rows, copied to the clipboard snapshot in this order
+    __clipboard_tables = [
+        "object",
+        "object_property",
+        "object_layout_property",
+        "object_signal",
+        "object_data",
+        "object_data_arg",
+    ]
+
     def clipboard_copy(self, selection):
         self.clipboard = []
         self.clipboard_ids = []
+        self.clipboard_subtrees = []
 
         c = self.conn.cursor()
 
+        # Rows are also kept in temporary tables so that pasting in the same UI can clone them with plain SQL
+        for table in self.__clipboard_tables:
+            c.execute(f"CREATE TEMP TABLE IF NOT EXISTS clipboard_{table} AS SELECT * FROM main.{table} WHERE 0;")
+            c.execute(f"DELETE FROM temp.clipboard_{table};")
+
         # Copy data for every object in selection
+        copied = set()
         for ui_id, object_id in selection:
             node = self.__export_object(ui_id, object_id)
             self.clipboard.append(node)
 
+            subtree = self.get_object_subtree(ui_id, object_id)
+            self.clipboard_subtrees.append((ui_id, subtree))
+
+            # Selection can include descendants of other selected objects, snapshot their rows only once
+            ids = json.dumps([id for id in subtree if (ui_id, id) not in copied])
+            copied.update([(ui_id, id) for id in subtree])
+
+            for table in self.__clipboard_tables:
+                # Layout properties belong to the child, the root ones refer to its current parent
+                id_column = "child_id" if table == "object_layout_property" else "object_id"
+                c.execute(
+                    f"""
+                    INSERT INTO temp.clipboard_{table}
+                    SELECT * FROM main.{table}
+                    WHERE ui_id=? AND {id_column} IN (SELECT value FROM json_each(?));
+                    """,
+                    (ui_id, ids),
+                )
+
+            # Object ids that will need to be remapped
             c.execute(
                 """
-                WITH RECURSIVE ancestor(object_id, parent_id, name) AS (
-                  SELECT object_id, parent_id, name
-                  FROM object
-                  WHERE ui_id=? AND object_id=?
-                  UNION
-                  SELECT object.object_id, object.parent_id, object.name
-                  FROM object JOIN ancestor ON object.parent_id=ancestor.object_id
-                  WHERE ui_id=?
-                )
-                SELECT name FROM ancestor WHERE name IS NOT NULL;
+                SELECT name FROM temp.clipboard_object
+                WHERE ui_id=? AND name IS NOT NULL AND object_id IN (SELECT value FROM json_each(?));
                 """,
-                (ui_id, object_id, ui_id),
+                (ui_id, ids),
             )
-
-            # Object ids that will need to be remapped
             self.clipboard_ids += tuple([x[0] for x in c.fetchall()])
 
         c.close()
 
-    def clipboard_paste(self, ui_id, parent_id):
-        foreign_keys = self.foreign_keys
-        self.foreign_keys = False
-
-        c = self.conn.cursor()
+    def __clipboard_name_map(self, c, ui_id):
         object_id_map = {}
-        retval = {}
 
         # Generate new object_id mapping
         for object_id in self.clipboard_ids:
@@ -3345,10 +4112,252 @@ class CmbDB(GObject.GObject):
 
             object_id_map[object_id] = f"{object_id_base}_{max_index+1}" if max_index else object_id
 
-        for node in self.clipboard:
-            object_id = self.__import_object(ui_id, node, parent_id, object_id_map=object_id_map)
+        return object_id_map
+
+    def __clipboard_clone(self, c, ui_id, parent_id, object_id_map):
+        retval = {}
+
+        # Build old -> new object id map, roots are appended at the end of parent_id children
+        object_id = c.execute("SELECT coalesce(MAX(object_id), 0) FROM object WHERE ui_id=?;", (ui_id,)).fetchone()[0]
+        position = c.execute(
+            "SELECT coalesce(MAX(position), -1) + 1 FROM object WHERE ui_id=? AND parent_id IS ?;",
+            (ui_id, parent_id),
+        ).fetchone()[0]
+
+        names = {row[0]: row[1] for row in c.execute("SELECT object_id, name FROM temp.clipboard_object;")}
+        remap = []
+
+        for source_ui_id, subtree in self.clipboard_subtrees:
+            new_ids = []
+
+            for i, old_id in enumerate(subtree):
+                object_id += 1
+                name = names.get(old_id, None)
+                remap.append((old_id, object_id, object_id_map.get(name, name), position if i == 0 else None))
+                new_ids.append(object_id)
+
+            retval[new_ids[0]] = tuple(new_ids)
+            position += 1
+
+        c.executescript(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS clipboard_remap (
+              old_id INTEGER PRIMARY KEY,
+              new_id INTEGER,
+              name TEXT,
+              position INTEGER
+            );
+            DELETE FROM temp.clipboard_remap;
+            """
+        )
+        c.executemany("INSERT INTO temp.clipboard_remap VALUES (?, ?, ?, ?);", remap)
+
+        def new_id(column):
+            return f"(SELECT new_id FROM temp.clipboard_remap WHERE old_id={column})"
+
+        # Roots get the new parent and position, everything else keeps its relative place
+        c.execute(
+            f"""
+            INSERT INTO object (ui_id, object_id, type_id, name, parent_id, internal, type, comment, position,
+                                custom_fragment, custom_child_fragment)
+            SELECT ?, r.new_id, o.type_id, r.name,
+                   CASE WHEN r.position IS NULL THEN {new_id("o.parent_id")} ELSE ? END,
+                   CASE WHEN r.position IS NULL THEN o.internal END,
+                   CASE WHEN r.position IS NULL THEN o.type END,
+                   o.comment,
+                   coalesce(r.position, o.position),
+                   o.custom_fragment,
+                   CASE WHEN r.position IS NULL THEN o.custom_child_fragment END
+            FROM temp.clipboard_object AS o JOIN temp.clipboard_remap AS r ON r.old_id=o.object_id
+            ORDER BY r.new_id;
+            """,
+            (ui_id, parent_id),
+        )
+
+        # References to objects outside the copied subtrees are kept as is
+        c.execute(
+            f"""
+            INSERT INTO object_property (ui_id, object_id, owner_id, property_id, value, translatable, comment,
+                                         translation_context, translation_comments, inline_object_id, bind_source_id,
+                                         bind_owner_id, bind_property_id, bind_flags, binding_expression_id,
+                                         binding_expression_object_id, serialize_default_value)
+            SELECT ?, r.new_id, op.owner_id, op.property_id,
+                   CASE WHEN
+                     p.is_object OR (
+                       op.owner_id IN ('GtkPropertyExpression', 'GtkConstantExpression') AND
+                       op.property_id='value' AND
+                       NOT EXISTS (
+                         SELECT 1 FROM temp.clipboard_object_property AS op2
+                         WHERE op2.object_id=op.object_id AND
+                               op2.owner_id IN ('GtkPropertyExpression', 'GtkConstantExpression') AND
+                               op2.property_id='type' AND
+                               op2.value NOT IN (SELECT type_id FROM type WHERE derivable)
+                       )
+                     )
+                   THEN coalesce({new_id("op.value")}, op.value)
+                   ELSE op.value END,
+                   op.translatable, op.comment, op.translation_context, op.translation_comments,
+                   {new_id("op.inline_object_id")},
+                   coalesce({new_id("op.bind_source_id")}, op.bind_source_id),
+                   op.bind_owner_id, op.bind_property_id, op.bind_flags,
+                   {new_id("op.binding_expression_id")},
+                   coalesce({new_id("op.binding_expression_object_id")}, op.binding_expression_object_id),
+                   op.serialize_default_value
+            FROM temp.clipboard_object_property AS op
+              JOIN temp.clipboard_remap AS r ON r.old_id=op.object_id
+              LEFT JOIN property AS p ON p.owner_id=op.owner_id AND p.property_id=op.property_id
+            ORDER BY r.new_id;
+            """,
+            (ui_id,),
+        )
+
+        c.execute(
+            """
+            INSERT INTO object_layout_property (ui_id, object_id, child_id, owner_id, property_id, value, translatable,
+                                                comment, translation_context, translation_comments)
+            SELECT ?, ro.new_id, rc.new_id, l.owner_id, l.property_id, l.value, l.translatable,
+                   l.comment, l.translation_context, l.translation_comments
+            FROM temp.clipboard_object_layout_property AS l
+              JOIN temp.clipboard_remap AS ro ON ro.old_id=l.object_id
+              JOIN temp.clipboard_remap AS rc ON rc.old_id=l.child_id
+            ORDER BY rc.new_id;
+            """,
+            (ui_id,),
+        )
+
+        c.execute(
+            f"""
+            INSERT INTO object_signal (ui_id, object_id, owner_id, signal_id, handler, detail, user_data, swap, after, comment)
+            SELECT ?, r.new_id, s.owner_id, s.signal_id, s.handler, s.detail,
+                   coalesce({new_id("s.user_data")}, s.user_data), s.swap, s.after, s.comment
+            FROM temp.clipboard_object_signal AS s JOIN temp.clipboard_remap AS r ON r.old_id=s.object_id
+            ORDER BY s.signal_pk;
+            """,
+            (ui_id,),
+        )
+
+        c.execute(
+            """
+            INSERT INTO object_data (ui_id, object_id, owner_id, data_id, id, value, parent_id, comment, translatable,
+                                     translation_context, translation_comments)
+            SELECT ?, r.new_id, d.owner_id, d.data_id, d.id, d.value, d.parent_id, d.comment, d.translatable,
+                   d.translation_context, d.translation_comments
+            FROM temp.clipboard_object_data AS d JOIN temp.clipboard_remap AS r ON r.old_id=d.object_id
+            ORDER BY r.new_id, d.id;
+            """,
+            (ui_id,),
+        )
+
+        c.execute(
+            """
+            INSERT INTO object_data_arg (ui_id, object_id, owner_id, data_id, id, key, value)
+            SELECT ?, r.new_id, a.owner_id, a.data_id, a.id, a.key, a.value
+            FROM temp.clipboard_object_data_arg AS a JOIN temp.clipboard_remap AS r ON r.old_id=a.object_id
+            ORDER BY r.new_id, a.id;
+            """,
+            (ui_id,),
+        )
+
+        # Remap CmbAccessibleList references, dropping objects that do not exist anymore
+        id_map = {str(row[0]): str(row[1]) for row in remap}
+        for row in c.execute(
+            """
+            SELECT op.object_id, op.owner_id, op.property_id, op.value
+            FROM object_property AS op, property AS p
+            WHERE op.owner_id=p.owner_id AND op.property_id=p.property_id AND
+                  op.ui_id=? AND p.type_id='CmbAccessibleList' AND op.value IS NOT NULL AND
+                  op.object_id IN (SELECT new_id FROM temp.clipboard_remap);
+            """,
+            (ui_id,),
+        ).fetchall():
+            object_id, owner_id, property_id, value = row
+
+            ids = []
+            for id in value.split(","):
+                id = id_map.get(id.strip(), id.strip())
+                if not id.isnumeric():
+                    continue
+
+                if self.conn.execute("SELECT 1 FROM object WHERE ui_id=? AND object_id=?;", (ui_id, id)).fetchone():
+                    ids.append(id)
 
             c.execute(
+                "UPDATE object_property SET value=? WHERE ui_id=? AND object_id=? AND owner_id=? AND property_id=?;",
+                (",".join(ids), ui_id, object_id, owner_id, property_id),
+            )
+
+        # Clear references to objects removed after copying
+        pasted = "object_id IN (SELECT new_id FROM temp.clipboard_remap)"
+        exists = "EXISTS (SELECT 1 FROM object AS o WHERE o.ui_id=? AND o.object_id={column})"
+        c.execute(
+            f"""
+            UPDATE object_property SET value=NULL
+            FROM property AS p
+            WHERE object_property.ui_id=? AND object_property.{pasted} AND
+                  object_property.owner_id=p.owner_id AND object_property.property_id=p.property_id AND
+                  p.is_object AND object_property.value IS NOT NULL AND
+                  NOT {exists.format(column="object_property.value")};
+            """,
+            (ui_id, ui_id),
+        )
+        c.execute(
+            f"""
+            UPDATE object_property SET bind_source_id=NULL
+            WHERE ui_id=? AND {pasted} AND bind_source_id IS NOT NULL AND NOT {exists.format(column="bind_source_id")};
+            """,
+            (ui_id, ui_id),
+        )
+        c.execute(
+            f"""
+            UPDATE object_signal SET user_data=NULL
+            WHERE ui_id=? AND {pasted} AND user_data IS NOT NULL AND NOT {exists.format(column="user_data")};
+            """,
+            (ui_id, ui_id),
+        )
+
+        return retval
+
+    def clipboard_paste(self, ui_id, parent_id):
+        foreign_keys = self.foreign_keys
+        self.foreign_keys = False
+
+        c = self.conn.cursor()
+        object_id_map = self.__clipboard_name_map(c, ui_id)
+        retval = {}
+
+        source_ids = [(source_ui_id, id) for source_ui_id, subtree in self.clipboard_subtrees for id in subtree]
+
+        if (
+            source_ids
+            and all([source_ui_id == ui_id for source_ui_id, id in source_ids])
+            and len(set(source_ids)) == len(source_ids)
+        ):
+            # Same UI and no overlapping subtrees, clone rows directly, only pasted rows are touched
+            retval = self.__clipboard_clone(c, ui_id, parent_id, object_id_map)
+        else:
+            # Object references have to be resolved by name in a different UI
+            for node in self.clipboard:
+                object_id = self.__import_object(ui_id, node, parent_id, object_id_map=object_id_map)
+
+                # Object and children ids
+                retval[object_id] = tuple(self.get_object_subtree(ui_id, object_id))
+
+            self.__fix_object_references(ui_id, fix_externals=False)
+
+        self.foreign_keys = foreign_keys
+
+        c.close()
+        return retval
+
+    def clear_history(self):
+        self.history_flush()
+        self.conn.executescript(self.__clear_history)
+
+    # Return object_id and all its descendants ids, object_id first
+    def get_object_subtree(self, ui_id, object_id):
+        return [
+            row[0]
+            for row in self.execute(
                 """
                 WITH RECURSIVE ancestor(object_id, parent_id) AS (
                   SELECT object_id, parent_id
@@ -3363,19 +4372,7 @@ class CmbDB(GObject.GObject):
                 """,
                 (ui_id, object_id, ui_id),
             )
-
-            # Object and children ids
-            retval[object_id] = tuple([x[0] for x in c.fetchall()])
-
-        self.__fix_object_references(ui_id, fix_externals=False)
-
-        self.foreign_keys = foreign_keys
-
-        c.close()
-        return retval
-
-    def clear_history(self):
-        self.conn.executescript(self.__clear_history)
+        ]
 
     def update_children_position(self, ui_id, parent_id=None):
         parent_clause = "parent_id IS NULL" if parent_id is None else "parent_id=?"
@@ -3387,7 +4384,7 @@ class CmbDB(GObject.GObject):
                 FROM object
                 WHERE ui_id=? AND {parent_clause}
             ) AS new
-            WHERE object.ui_id=new.ui_id AND object.object_id=new.object_id;
+            WHERE object.ui_id=new.ui_id AND object.object_id=new.object_id AND object.position != new.position - 1;
             """,
             (ui_id, ) if parent_id is None else (ui_id, parent_id)
         )
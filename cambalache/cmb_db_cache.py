@@ -0,0 +1,257 @@
+#
+# CmbDB catalog cache
+#
+# Copyright (C) 2026  Juan Pablo Ugarte
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation;
+# version 2.1 of the License.
+#
+# library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# Authors:
+#   Juan Pablo Ugarte <juanpablougarte@gmail.com>
+#
+# SPDX-License-Identifier: LGPL-2.1-only
+#
+
+import os
+import json
+import sqlite3
+import hashlib
+
+from lxml import etree
+from gi.repository import GLib
+from cambalache import config, getLogger
+from . import utils
+
+logger = getLogger(__name__)
+
+# Bump this if the snapshot layout changes
+CACHE_VERSION = 3
+
+CACHE_TABLE = "__cmb_catalog_cache__"
+
+CATALOG_DOCTYPE = '<!DOCTYPE cambalache-catalog SYSTEM "cambalache-catalog.dtd">'
+
+# Process wide in memory templates, target_tk -> (key, connection, data)
+_templates = {}
+
+
+def catalog_cache_dir():
+    return os.path.join(GLib.get_user_cache_dir(), "cambalache")
+
+
+def clear_catalog_templates():
+    for key, template, data in _templates.values():
+        template.close()
+
+    _templates.clear()
+
+
+# The key changes whenever a catalog file is modified, added or removed,
+# the DB schema changes or Cambalache is updated.
+# catalogs is a list of [path, mtime_ns, size, sha256] as returned by CmbCatalogIndex.get_fingerprint()
+def catalog_cache_key(target_tk, catalogs, schema):
+    return json.dumps(
+        {
+            "cache_version": CACHE_VERSION,
+            "version": config.VERSION,
+            "file_format_version": config.FILE_FORMAT_VERSION,
+            "sqlite_version": sqlite3.sqlite_version,
+            "target_tk": target_tk,
+            "schema": hashlib.sha256(schema.encode()).hexdigest(),
+            "catalogs": sorted(catalogs),
+        },
+        sort_keys=True,
+    )
+
+
+# Persistent catalog discovery index, path -> catalog header information.
+# Only files that changed since the last run are opened and parsed.
+class CmbCatalogIndex:
+    def __init__(self):
+        self.path = os.path.join(catalog_cache_dir(), "catalog-index.json")
+        self.__entries = {}
+        self.__seen = set()
+        self.__changed = False
+
+        try:
+            with open(self.path, "r") as fd:
+                data = json.load(fd)
+
+            if data.get("version", None) == CACHE_VERSION:
+                self.__entries = data.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Error loading catalog index {self.path}: {e}")
+
+    # Return catalog entry for path or None if path is not a Cambalache catalog
+    def get(self, path):
+        st = os.stat(path)
+        entry = self.__entries.get(path, None)
+
+        self.__seen.add(path)
+
+        if entry is None or entry["mtime"] != st.st_mtime_ns or entry["size"] != st.st_size:
+            entry = self.__scan(path, st)
+            self.__entries[path] = entry
+            self.__changed = True
+
+        return entry if entry["valid"] else None
+
+    def get_fingerprint(self, path):
+        entry = self.__entries[path]
+        return [path, entry["mtime"], entry["size"], entry["sha256"]]
+
+    def __scan(self, path, st):
+        logger.debug(f"Indexing catalog {path}")
+
+        entry = {"mtime": st.st_mtime_ns, "size": st.st_size, "sha256": None, "valid": False}
+
+        if utils.content_type_guess(path) != "application/xml":
+            return entry
+
+        try:
+            with open(path, "rb") as fd:
+                data = fd.read()
+
+            root = etree.fromstring(data)
+
+            if root.getroottree().docinfo.doctype != CATALOG_DOCTYPE:
+                return entry
+
+            entry["name"] = root.get("name", None)
+            entry["version"] = root.get("version", None)
+            entry["depends"] = root.get("depends", None)
+            entry["attrs"] = dict(root.attrib)
+            entry["sha256"] = hashlib.sha256(data).hexdigest()
+        except Exception as e:
+            logger.warning(f"Error indexing catalog {path}: {e}")
+            return entry
+
+        entry["valid"] = True
+        return entry
+
+    def save(self):
+        # Forget about files that do not exist anymore
+        removed = set(self.__entries.keys()) - self.__seen
+        for path in removed:
+            del self.__entries[path]
+
+        if not self.__changed and not removed:
+            return
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            with open(tmp_path, "w") as fd:
+                json.dump({"version": CACHE_VERSION, "entries": self.__entries}, fd)
+
+            os.replace(tmp_path, self.path)
+            self.__changed = False
+        except Exception as e:
+            logger.warning(f"Error saving catalog index {self.path}: {e}")
+
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+# On disk snapshot of a CmbDB with all the catalogs loaded.
+# The snapshot is a regular SQLite file with an extra table that stores the
+# key it was created for and any extra data CmbDB needs to keep in memory.
+# The first DB loaded for each target is also kept in memory as a template
+# so that the rest of projects in the same process just clone it.
+class CmbCatalogCache:
+    def __init__(self, target_tk, key):
+        self.key = key
+        self.target_tk = target_tk
+        self.path = os.path.join(catalog_cache_dir(), f"catalogs-{target_tk}.db")
+
+    def __set_template(self, conn, data):
+        template = sqlite3.connect(":memory:")
+        conn.backup(template)
+        _templates[self.target_tk] = (self.key, template, json.dumps(data))
+
+    # Copy template or snapshot into conn and return extra data or None on cache miss
+    def restore(self, conn):
+        key, template, data = _templates.get(self.target_tk, (None, None, None))
+
+        if key == self.key:
+            template.backup(conn)
+            logger.debug(f"Catalogs cloned from {self.target_tk} template")
+            return json.loads(data)
+
+        if not os.path.isfile(self.path):
+            return None
+
+        src = None
+
+        try:
+            src = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            row = src.execute(f"SELECT key, data FROM {CACHE_TABLE};").fetchone()
+
+            if row is None or row[0] != self.key:
+                logger.debug(f"Catalog cache {self.path} is outdated")
+                return None
+
+            src.backup(conn)
+        except Exception as e:
+            logger.warning(f"Error loading catalog cache {self.path}: {e}")
+            return None
+        finally:
+            if src is not None:
+                src.close()
+
+        conn.execute(f"DROP TABLE {CACHE_TABLE};")
+        conn.commit()
+
+        logger.debug(f"Catalogs loaded from cache {self.path}")
+
+        data = json.loads(row[1])
+        self.__set_template(conn, data)
+
+        return data
+
+    def save(self, conn, data):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        dst = None
+
+        conn.commit()
+        self.__set_template(conn, data)
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+            dst = sqlite3.connect(tmp_path)
+            conn.backup(dst)
+            dst.execute(f"CREATE TABLE {CACHE_TABLE} (key TEXT NOT NULL, data JSON);")
+            dst.execute(f"INSERT INTO {CACHE_TABLE} (key, data) VALUES (?, ?);", (self.key, json.dumps(data)))
+            dst.commit()
+            dst.close()
+            dst = None
+
+            # Atomically replace old snapshot
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Error saving catalog cache {self.path}: {e}")
+
+            if dst is not None:
+                dst.close()
+
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
@@ -0,0 +1,83 @@
+#
+# CmbConnection - sqlite3 connection reporting failed statements
+#
+# Copyright (C) 2026  Juan Pablo Ugarte
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation;
+# version 2.1 of the License.
+#
+# library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# Authors:
+#   Juan Pablo Ugarte <juanpablougarte@gmail.com>
+#
+# SPDX-License-Identifier: LGPL-2.1-only
+#
+
+import sqlite3
+
+
+# Python functions called by triggers run even when the statement fails afterwards,
+# for example on a foreign key violation, and SQLite rolls back its changes.
+# statement_failed is called right after any statement or commit fails so the owner can
+# forget whatever those functions recorded.
+class CmbConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statement_failed = None
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or CmbCursor)
+
+    # Use CmbCursor directly, subclasses can override cursor() without affecting these
+    def execute(self, *args):
+        return sqlite3.Connection.cursor(self, CmbCursor).execute(*args)
+
+    def executemany(self, *args):
+        return sqlite3.Connection.cursor(self, CmbCursor).executemany(*args)
+
+    def executescript(self, *args):
+        return sqlite3.Connection.cursor(self, CmbCursor).executescript(*args)
+
+    def commit(self):
+        try:
+            return super().commit()
+        except sqlite3.Error:
+            self._statement_failed()
+            raise
+
+    def _statement_failed(self):
+        if self.statement_failed is not None:
+            self.statement_failed()
+
+
+class CmbCursor(sqlite3.Cursor):
+    def execute(self, *args):
+        try:
+            return super().execute(*args)
+        except sqlite3.Error:
+            self.connection._statement_failed()
+            raise
+
+    def executemany(self, *args):
+        try:
+            return super().executemany(*args)
+        except sqlite3.Error:
+            self.connection._statement_failed()
+            raise
+
+    def executescript(self, *args):
+        try:
+            return super().executescript(*args)
+        except sqlite3.Error:
+            self.connection._statement_failed()
+            raise
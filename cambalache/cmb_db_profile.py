@@ -1,10 +1,11 @@
 import os
 import time
 import inspect
-import sqlite3
 
+from .cmb_db_connection import CmbConnection, CmbCursor
 
-class CmbProfileConnection(sqlite3.Connection):
+
+class CmbProfileConnection(CmbConnection):
     def __init__(self, path, **kwargs):
         super().__init__(path, **kwargs)
 
@@ -104,7 +105,7 @@ class CmbProfileConnection(sqlite3.Connection):
             )
 
 
-class CmbProfileCursor(sqlite3.Cursor):
+class CmbProfileCursor(CmbCursor):
     def execute(self, *args):
         start = time.monotonic_ns()
         retval = super().execute(*args)
@@ -53,16 +53,7 @@ class CmbLayoutProperty(CmbBaseLayoutProperty):
 
     @GObject.Property(type=str)
     def value(self):
-        c = self.project.db.execute(
-            """
-            SELECT value
-            FROM object_layout_property
-            WHERE ui_id=? AND object_id=? AND child_id=? AND owner_id=? AND property_id=?;
-            """,
-            (self.ui_id, self.object_id, self.child_id, self.owner_id, self.property_id),
-        )
-        row = c.fetchone()
-        return row[0] if row is not None else self.info.default_value
+        return self.db_get_field("value", self.info.default_value)
 
     @value.setter
     def _set_value(self, value):
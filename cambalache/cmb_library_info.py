@@ -26,6 +26,7 @@
 from gi.repository import GObject
 from .cmb_base_objects import CmbBaseLibraryInfo
 from .cmb_type_info import CmbTypeInfo
+from .cmb_startup_profile import startup_phase
 from cambalache import _, CmbObject
 
 
@@ -35,22 +36,75 @@ class CmbLibraryInfo(CmbBaseLibraryInfo):
 
         # Type Information
         self.type_info = {}
+        self.object_types = []
 
-        self.object_types = self.__init_object_types()
         self.min_version = self.__init_min_version()
 
-        # Init type_info for this library
+        # Third party catalogs are loaded the first time they get enabled
+        self.__loaded = False
+        self.__metadata_loaded = False
+
+        if not self.third_party or self.enabled:
+            self.load_type_info()
+
+    def load_type_info(self):
+        if self.__loaded:
+            return
+
+        self.__loaded = True
+
+        # Make sure dependencies are loaded first
+        dependencies = []
         for row in self.project.db.execute(
-            "SELECT * FROM type WHERE parent_id IS NOT NULL AND library_id=? ORDER BY type_id;",
-            (self.library_id, )
-        ):
-            type_id = row[0]
-            info = CmbTypeInfo.from_row(self.project, *row)
-            self.type_info[type_id] = info
+            "SELECT dependency_id FROM library_dependency WHERE library_id=?;", (self.library_id,)
+        ).fetchall():
+            dep = self.project.library_info.get(row[0], None)
+            if dep is not None:
+                dep.load_type_info()
+                dependencies.append(dep)
+
+        # Insert catalog types in the DB if needed
+        self.project.db.load_pending_catalog(self.library_id)
+
+        self.object_types = self.__init_object_types()
+
+        # Init type_info for this library
+        with startup_phase(f"CmbTypeInfo {self.library_id}"):
+            for row in self.project.db.execute(
+                "SELECT * FROM type WHERE parent_id IS NOT NULL AND library_id=? ORDER BY type_id;",
+                (self.library_id, )
+            ):
+                type_id = row[0]
+                info = CmbTypeInfo.from_row(self.project, *row)
+                self.type_info[type_id] = info
+
+        def get_parent(parent_id):
+            parent = self.type_info.get(parent_id, None) or self.project.type_info.get(parent_id)
+            if parent is not None:
+                return parent
+
+            # Parent could be in a dependency that is not enabled yet
+            for dep in dependencies:
+                parent = dep.type_info.get(parent_id, None)
+                if parent is not None:
+                    return parent
+
+            return None
 
         # Set parent back reference
         for type_id, info in self.type_info.items():
-            info.parent = self.type_info.get(info.parent_id, None) or self.project.type_info.get(info.parent_id)
+            info.parent = get_parent(info.parent_id)
+
+    # Load all types metadata at once instead of on demand type by type
+    def load_type_metadata(self):
+        if self.__metadata_loaded:
+            return
+
+        self.load_type_info()
+        self.__metadata_loaded = True
+
+        with startup_phase(f"CmbTypeInfo.bulk_load {self.library_id}"):
+            CmbTypeInfo.bulk_load(self.project, self.library_id, self.type_info)
 
     def __str__(self):
         return f"CmbLibraryInfo<{self.library_id}-{self.version}>"
@@ -88,6 +142,7 @@ class CmbLibraryInfo(CmbBaseLibraryInfo):
 
         # Load or Unload type infos from project
         if value:
+            self.load_type_info()
             self.project.type_info.update(self.type_info)
             for type_id, info in self.type_info.items():
                 self.project.emit("type-info-added", info)
@@ -30,6 +30,7 @@ from .cmb_base_objects import CmbBaseObject, CmbSignal
 from .cmb_property import CmbProperty
 from .cmb_layout_property import CmbLayoutProperty
 from .cmb_object_data import CmbObjectData
+from .cmb_sparse_properties import CmbSparseProperties
 from .cmb_type_info import CmbTypeInfo
 from .cmb_ui import CmbUI
 from .constants import GMENU_SECTION_TYPE,  GMENU_SUBMENU_TYPE, GMENU_ITEM_TYPE
@@ -56,9 +57,7 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
     }
 
     def __init__(self, **kwargs):
-        self.__properties = None
         self.__properties_dict = None
-        self.__layout = None
         self.__layout_dict = None
         self.__signals = None
         self.__signals_dict = None
@@ -78,9 +77,11 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
 
         self.__update_version_warning()
 
+        # CmbUI notifies live objects directly instead of using signals
+        # since connecting to the UI would keep every object wrapper alive
+        self.__is_template = self.ui.template_id == self.object_id
+
         self.connect("notify", self._on_notify)
-        self.ui.connect("notify", self._on_ui_notify)
-        self.ui.connect("library-changed", self._on_ui_library_changed)
 
     def __bool__(self):
         # Override Truth Value Testing to ensure that CmbObject objects evaluates to True even if it does not have children
@@ -92,7 +93,7 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
     @property
     def properties(self):
         self.__populate_properties()
-        return self.__properties
+        return list(self.__properties_dict.values())
 
     @property
     def properties_dict(self):
@@ -102,7 +103,7 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
     @property
     def layout(self):
         self.__populate_layout()
-        return self.__layout
+        return list(self.__layout_dict.values())
 
     @property
     def layout_dict(self):
@@ -171,27 +172,32 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
             if property_name in self.__properties_dict:
                 continue
 
+            self.__properties_dict.add(property_name, name, info)
+
+    def __populate_properties(self):
+        if self.__properties_dict is not None:
+            return
+
+        # Fetch all the properties values at once
+        serial, rows = CmbProperty._row_fetch(
+            self.project.db, ("owner_id", "property_id"), "ui_id=? AND object_id=?", (self.ui_id, self.object_id)
+        )
+
+        # CmbProperty wrappers are only created for properties with a value or on demand
+        def new_property(owner_id, info):
             prop = CmbProperty(
                 object=self,
                 project=self.project,
                 ui_id=self.ui_id,
                 object_id=self.object_id,
-                owner_id=name,
+                owner_id=owner_id,
                 property_id=info.property_id,
                 info=info,
             )
+            prop._row_prime_fetched(serial, rows.get((owner_id, info.property_id), None))
+            return prop
 
-            # List of property
-            self.__properties.append(prop)
-
-            # Dictionary of properties
-            self.__properties_dict[property_name] = prop
-
-    def __populate_properties(self):
-        if self.__properties is not None:
-            return
-        self.__properties = []
-        self.__properties_dict = {}
+        self.__properties_dict = CmbSparseProperties(new_property)
 
         self.__populate_type_properties(self.type_id)
         for parent_id in self.info.hierarchy:
@@ -207,31 +213,20 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
                 ]:
                     self.__populate_type_properties(accessible_id)
 
+        self.__materialize_set_properties(self.__properties_dict, rows)
+
+    # Create wrappers for every property that has a row in the DB
+    def __materialize_set_properties(self, properties, rows):
+        for owner_id, property_id in rows:
+            properties.materialize(property_id, owner_id)
+
     def __populate_layout_properties_from_type(self, name):
         property_info = self.project.get_type_properties(name)
         if property_info is None:
             return
 
-        # parent_id is stored in the DB so its better to cache it
-        parent_id = self.parent_id
-        for property_name in property_info:
-            info = property_info[property_name]
-
-            prop = CmbLayoutProperty(
-                object=self,
-                project=self.project,
-                ui_id=self.ui_id,
-                object_id=parent_id,
-                child_id=self.object_id,
-                owner_id=name,
-                property_id=info.property_id,
-                info=info,
-            )
-
-            self.__layout.append(prop)
-
-            # Dictionary of properties
-            self.__layout_dict[property_name] = prop
+        for property_name, info in property_info.items():
+            self.__layout_dict.add(property_name, name, info)
 
     def _property_changed(self, prop, field):
         self.emit("property-changed", prop, field)
@@ -276,10 +271,10 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
         self.__signals = []
         self.__signals_dict = {}
 
-        c = self.project.db.cursor()
-
-        # Populate signals
-        for row in c.execute("SELECT * FROM object_signal WHERE ui_id=? AND object_id=?;", (self.ui_id, self.object_id)):
+        # Populate signals, from_row() primes every signal row cache
+        for row in self.project.db.execute(
+            "SELECT * FROM object_signal WHERE ui_id=? AND object_id=?;", (self.ui_id, self.object_id)
+        ).fetchall():
             self.__add_signal_object(CmbSignal.from_row(self.project, *row))
 
     def __populate_data(self):
@@ -288,29 +283,51 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
         self.__data = []
         self.__data_dict = {}
 
-        c = self.project.db.cursor()
-
         # Populate data
-        for row in c.execute(
+        for row in self.project.db.execute(
             "SELECT * FROM object_data WHERE ui_id=? AND object_id=? AND parent_id IS NULL;",
             (self.ui_id, self.object_id),
-        ):
+        ).fetchall():
             self.__add_data_object(CmbObjectData.from_row(self.project, *row))
 
     def __populate_layout_properties(self):
         parent_id = self.parent_id
 
         # FIXME: delete is anything is set?
-        self.__layout = []
-        self.__layout_dict = {}
+        self.__layout_dict = CmbSparseProperties(None)
 
         if parent_id > 0:
+            serial, rows = CmbLayoutProperty._row_fetch(
+                self.project.db,
+                ("owner_id", "property_id"),
+                "ui_id=? AND object_id=? AND child_id=?",
+                (self.ui_id, parent_id, self.object_id),
+            )
+
+            def new_layout_property(owner_id, info):
+                prop = CmbLayoutProperty(
+                    object=self,
+                    project=self.project,
+                    ui_id=self.ui_id,
+                    object_id=parent_id,
+                    child_id=self.object_id,
+                    owner_id=owner_id,
+                    property_id=info.property_id,
+                    info=info,
+                )
+                prop._row_prime_fetched(serial, rows.get((owner_id, info.property_id), None))
+                return prop
+
+            self.__layout_dict = CmbSparseProperties(new_layout_property)
+
             parent = self.project.get_object_by_id(self.ui_id, parent_id)
             for owner_id in [parent.type_id] + parent.info.hierarchy:
                 self.__populate_layout_properties_from_type(f"{owner_id}LayoutChild")
 
+            self.__materialize_set_properties(self.__layout_dict, rows)
+
     def __populate_layout(self):
-        if self.__layout is None:
+        if self.__layout_dict is None:
             self.__populate_layout_properties()
 
     @GObject.Property(type=int)
@@ -665,14 +682,16 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
                 self.notify("display-name-type")
 
     def _on_ui_library_changed(self, ui, library_id):
-        self.__update_version_warning()
-
-        self.__populate_properties()
-        self.__populate_layout()
+        if self.info.library_id == library_id:
+            self.__update_version_warning()
 
         # Update properties directly, to avoid having to connect too many times to this signal
-        for props in [self.__properties, self.__layout]:
-            for prop in props:
+        # Wrappers not created yet will get the right warning when they are created
+        for props in [self.__properties_dict, self.__layout_dict]:
+            if props is None:
+                continue
+
+            for prop in props.wrappers():
                 if prop.library_id == library_id:
                     prop._update_version_warning()
 
@@ -714,56 +733,16 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
 
     @GObject.Property(type=int)
     def list_position(self):
-        ui_id = self.ui_id
-
-        if self.parent_id:
-            retval = self.db_get(
-                """
-                SELECT rownum-1
-                FROM (
-                    SELECT ROW_NUMBER() OVER (ORDER BY position ASC) rownum, object_id
-                    FROM object
-                    WHERE ui_id=? AND parent_id=?
-                )
-                WHERE object_id=?;
-                """,
-                (ui_id, self.parent_id, self.object_id)
-            )
-        else:
-            retval = self.db_get(
-                """
-                SELECT rownum-1
-                FROM (
-                    SELECT ROW_NUMBER() OVER (ORDER BY position ASC) rownum, object_id
-                    FROM object
-                    WHERE ui_id=? AND parent_id IS NULL
-                )
-                WHERE object_id=?;
-                """,
-                (ui_id, self.object_id)
-            )
-
-        return retval
+        children, positions = self.project.db.get_object_children(self.ui_id, self.parent_id or None)
+        return positions.get(self.object_id, None)
 
     # GListModel iface
     def do_get_item(self, position):
         ui_id = self.ui_id
+        children, positions = self.project.db.get_object_children(ui_id, self.object_id)
 
-        # This query should use index object_ui_id_parent_id_position_idx
-        retval = self.db_get(
-            """
-            SELECT object_id
-            FROM (
-                SELECT ROW_NUMBER() OVER (ORDER BY position ASC) rownum, object_id
-                FROM object
-                WHERE ui_id=? AND parent_id=?
-            )
-            WHERE rownum=?;
-            """,
-            (ui_id, self.object_id, position+1)
-        )
-        if retval is not None:
-            return self.project.get_object_by_id(ui_id, retval)
+        if position < len(children):
+            return self.project.get_object_by_id(ui_id, children[position])
 
         # This should not happen
         return CmbListError()
@@ -776,8 +755,8 @@ class CmbObject(CmbBaseObject, Gio.ListModel):
         if self.project is None:
             return 0
 
-        retval = self.db_get("SELECT COUNT(object_id) FROM object WHERE ui_id=? AND parent_id=?;", (self.ui_id, self.object_id))
-        return retval if retval is not None else 0
+        children, positions = self.project.db.get_object_children(self.ui_id, self.object_id)
+        return len(children)
 
     def do_get_n_items(self):
         return self.n_items
@@ -28,8 +28,11 @@ import json
 import time
 import sqlite3
 import hashlib
+import weakref
 
 from pathlib import Path
+from collections import OrderedDict
+from contextlib import contextmanager
 from gi.repository import GObject, Gio, GLib, Gtk
 from graphlib import TopologicalSorter, CycleError
 
@@ -52,6 +55,7 @@ from .cmb_library_info import CmbLibraryInfo
 from .cmb_type_info import CmbTypeInfo
 from .cmb_base_objects import CmbSignal
 from .cmb_blueprint import cmb_blueprint_decompile, cmb_blueprint_compile
+from .cmb_startup_profile import startup_phase
 from .utils import FileHash
 from . import constants, utils
 from cambalache import config, getLogger, _, ngettext
@@ -95,6 +99,7 @@ class CmbProject(GObject.Object, Gio.ListModel):
         "object-data-data-removed": (GObject.SignalFlags.RUN_FIRST, None, (CmbObjectData, CmbObjectData)),
         "object-data-arg-changed": (GObject.SignalFlags.RUN_FIRST, None, (CmbObjectData, str)),
         "selection-changed": (GObject.SignalFlags.RUN_FIRST, None, ()),
+        "batch-finished": (GObject.SignalFlags.RUN_FIRST, None, ()),
         "type-info-added": (GObject.SignalFlags.RUN_FIRST, None, (CmbTypeInfo,)),
         "type-info-removed": (GObject.SignalFlags.RUN_FIRST, None, (CmbTypeInfo,)),
         "type-info-changed": (GObject.SignalFlags.RUN_FIRST, None, (CmbTypeInfo,)),
@@ -103,6 +108,15 @@ class CmbProject(GObject.Object, Gio.ListModel):
 
     target_tk = GObject.Property(type=str, flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT)
 
+    # See CmbDB:history-backend
+    history_backend = GObject.Property(
+        type=str, default="triggers", flags=GObject.ParamFlags.READWRITE | GObject.ParamFlags.CONSTRUCT_ONLY
+    )
+
+    # Undo history budget enforced by history_pop(), 0 means no limit
+    history_max_steps = GObject.Property(type=int, default=constants.HISTORY_MAX_STEPS, minimum=0)
+    history_max_bytes = GObject.Property(type=int, default=constants.HISTORY_MAX_BYTES, minimum=0)
+
     undo_msg = GObject.Property(type=str)
     redo_msg = GObject.Property(type=str)
 
@@ -124,6 +138,35 @@ class CmbProject(GObject.Object, Gio.ListModel):
 
         # Objects hash tables
         self._object_id = {}
+
+        # CmbObject wrappers are only kept alive while they are referenced (selected,
+        # shown in a tree view, bound to an editor, etc) or recently used.
+        # Otherwise they are rebuilt from the DB on demand by get_object_by_key()
+        self.__objects = weakref.WeakValueDictionary()
+        self.__objects_lru = OrderedDict()
+        self.__objects_hits = 0
+        self.__objects_misses = 0
+
+        # Objects added in the current batch, see batch()
+        self.__batch = None
+
+        # Objects inserted or deleted in the history range being replayed
+        self.__undo_redo_objects = set()
+
+        # Objects never announced whose wrappers are dropped silently by the replay, see __batch_rollback()
+        self.__undo_redo_forget = set()
+
+        # Wrappers with notifications frozen while replaying a history range
+        self.__undo_redo_frozen = []
+
+        # ((history serial, history index), (undo message, redo message)), see get_undo_redo_msg()
+        self.__undo_redo_msg = None
+
+        # Number of history rows discarded by the history budget
+        self.__history_offset = 0
+
+        # Number of history ranges open, history is only trimmed when the outermost one is closed
+        self.__history_depth = 0
         self.__css_id = {}
         self.__gresource_id = {}
 
@@ -153,11 +196,16 @@ class CmbProject(GObject.Object, Gio.ListModel):
             raise Exception(_("Either target_tk or filename are required"))
 
         # DataModel is only used internally
-        self.db = CmbDB(target_tk=self.target_tk)
+        with startup_phase("CmbDB"):
+            self.db = CmbDB(target_tk=self.target_tk, history_backend=self.history_backend)
+
+        with startup_phase("CmbLibraryInfo"):
+            self.__init_library_info()
 
-        self.__init_library_info()
         self.db.type_info = self.type_info
-        self.__load()
+
+        with startup_phase("CmbProject.load"):
+            self.__load()
 
     def __bool__(self):
         # Ensure that CmbProject objects evaluates to True even if it does not have any ui or css
@@ -174,37 +222,41 @@ class CmbProject(GObject.Object, Gio.ListModel):
     def _set_history_enabled(self, value):
         self.db.set_data("history_enabled", value)
 
+    # History counters are kept in memory by CmbDB, reading them does not query the database
     @GObject.Property(type=int)
     def history_index_max(self):
-        c = self.db.execute("SELECT MAX(history_id) FROM history;")
-        row = c.fetchone()
-        c.close()
-
-        if row is None or row[0] is None:
-            return 0
-
-        return int(row[0])
+        history_index, history_index_max = self.db.get_history_counters()
+        return history_index_max
 
     @GObject.Property(type=int)
     def history_index(self):
-        history_index = int(self.db.get_data("history_index"))
-
-        if history_index < 0:
-            return self.history_index_max
-
-        return history_index
+        history_index, history_index_max = self.db.get_history_counters()
+        return history_index_max if history_index < 0 else history_index
 
     @history_index.setter
     def _set_history_index(self, value):
-        if value == self.history_index_max:
+        history_index, history_index_max = self.db.get_history_counters()
+
+        if value == history_index_max:
             value = -1
 
-        self.db.set_data("history_index", value)
+        if value != history_index:
+            self.db.set_data("history_index", value)
+
+    # History rows are renumbered when old steps are discarded, history_index + history_offset
+    # is an absolute position that can be compared with older values.
+    @GObject.Property(type=int)
+    def history_offset(self):
+        return self.__history_offset
+
+    # Size in bytes of the undo history data
+    @GObject.Property(type=int)
+    def history_size(self):
+        return self.db.get_history_size()
 
     @GObject.Property(type=int)
     def history_index_version(self):
-        row = self.db.execute("SELECT version FROM history WHERE history_id=?;", (self.history_index, )).fetchone()
-        return row[0] if row else 0
+        return self.db.get_history_version(self.history_index)
 
     @GObject.Property(type=str)
     def gresource_overlays(self):
@@ -284,6 +336,11 @@ class CmbProject(GObject.Object, Gio.ListModel):
             if library_info.enabled:
                 self.type_info.update(library_info.type_info)
 
+    def load_type_metadata(self):
+        for info in self.library_info.values():
+            if info.enabled:
+                info.load_type_metadata()
+
     def get_abs_path(self, filename):
         projectdir = os.path.dirname(self.filename) if self.filename else "."
         if os.path.isabs(filename):
@@ -1152,6 +1209,10 @@ class CmbProject(GObject.Object, Gio.ListModel):
 
     def __remove_ui(self, ui):
         self._object_id.pop(ui.ui_id, None)
+
+        for obj in self._get_ui_objects(ui.ui_id):
+            self.__object_cache_remove(f"{obj.ui_id}.{obj.object_id}")
+
         self.__selection_remove(ui)
         self.emit("ui-removed", ui)
 
@@ -1339,7 +1400,7 @@ class CmbProject(GObject.Object, Gio.ListModel):
         custom_child_fragment=None,
     ):
         obj = CmbObject(project=self, ui_id=ui_id, object_id=object_id, info=self.type_info.get(obj_type))
-        self._object_id[f"{ui_id}.{object_id}"] = obj
+        self.__object_cache_add(f"{ui_id}.{object_id}", obj)
 
         if emit:
             self.emit("object-added", obj)
@@ -1408,15 +1469,115 @@ class CmbProject(GObject.Object, Gio.ListModel):
                 inline_binding_expression=inline_binding_expression,
             )
             self.history_pop()
-            self.db.commit()
+
+            if self.__batch is None:
+                self.db.commit()
         except Exception as e:
             logger.warning(f"Error adding object {obj_name}: {e}")
             return None
         finally:
-            obj = self.__add_object(True, ui_id, object_id, obj_type, name, parent_id, position=position)
-            obj._update_new_parent()
+            if self.__batch is None:
+                obj = self.__add_object(True, ui_id, object_id, obj_type, name, parent_id, position=position)
+                obj._update_new_parent()
+            else:
+                obj = self.__add_object(False, ui_id, object_id, obj_type, name, parent_id, position=position)
+                self.__batch.append(obj)
+
             return obj
 
+    # Add several objects in one undo step.
+    # objects is a list of add_object() keyword arguments with an optional properties dictionary.
+    def add_objects(self, ui_id, objects, message=None):
+        retval = []
+
+        with self.batch(message or _("Add {n_objects} objects").format(n_objects=len(objects))):
+            for kwargs in objects:
+                kwargs = dict(kwargs)
+                properties = kwargs.pop("properties", {})
+                obj = self.add_object(ui_id, **kwargs)
+
+                if obj is not None:
+                    for property_id, value in properties.items():
+                        prop = obj.properties_dict.get(property_id, None)
+
+                        if prop is not None:
+                            prop.value = value
+                        else:
+                            logger.warning(f"{obj} does not have a {property_id} property")
+
+                retval.append(obj)
+
+        return retval
+
+    @property
+    def in_batch(self):
+        return self.__batch is not None
+
+    # Group changes in one transaction and undo step.
+    # GListModel and object-added signals for new objects are emitted once at the end
+    # followed by batch-finished, so views can update once instead of on every change.
+    @contextmanager
+    def batch(self, message):
+        # Nested batches are part of the outer one
+        if self.__batch is not None:
+            yield
+            return
+
+        # Commands inside the batch do not open their own history range
+        recorded = self.history_enabled
+        self.__history_push(message)
+        self.__batch = []
+
+        try:
+            yield
+        except Exception:
+            objects = self.__batch
+            self.__batch = None
+            self.__history_pop()
+            self.__batch_rollback(recorded, objects)
+            raise
+
+        self.__history_pop()
+        self.db.commit()
+        self.__batch_finish()
+
+    # Revert the changes made by a failed batch, new objects were never announced so their wrappers are just dropped
+    def __batch_rollback(self, recorded, objects):
+        # Without history there is no way to revert, announce what was done instead
+        if not recorded:
+            self.db.commit()
+            self.__batch = objects
+            self.__batch_finish()
+            return
+
+        self.__undo_redo(True, forget=set([(obj.ui_id, obj.object_id) for obj in objects]))
+        self.history_index -= 1
+
+        # Failed batches can not be redone
+        self.db.clear_history()
+        self.db.commit()
+        self.emit("changed")
+
+    def __batch_finish(self):
+        objects = [obj for obj in self.__batch if obj.list_position is not None]
+
+        # One items-changed per parent covering all the new children positions
+        parents = {}
+        for obj in objects:
+            parents.setdefault(obj.parent or obj.ui, []).append(obj.list_position)
+
+        for parent, positions in parents.items():
+            first = min(positions)
+            n_items = max(positions) - first + 1
+            parent.items_changed(first, n_items - len(positions), n_items)
+            parent.notify("n-items")
+
+        for obj in objects:
+            self.emit("object-added", obj)
+
+        self.__batch = None
+        self.emit("batch-finished")
+
     def __remove_object(self, obj, template_ui=None, template_instances=None, inline_properties=None):
         ui_id = obj.ui_id
         object_id = obj.object_id
@@ -1436,14 +1597,27 @@ class CmbProject(GObject.Object, Gio.ListModel):
 
         self.__selection_remove(obj)
 
-        self._object_id.pop(f"{ui_id}.{object_id}", None)
+        self.__object_cache_remove(f"{ui_id}.{object_id}")
 
         self.emit("object-removed", obj)
 
+    # Evict descendants wrappers of a removed object, object-removed is only emitted for the top object
+    def __remove_object_descendants(self, ui_id, object_ids):
+        for object_id in object_ids:
+            key = f"{ui_id}.{object_id}"
+            obj = self.__objects.get(key, None)
+
+            if obj is not None:
+                self.__selection_remove(obj)
+
+            self.__object_cache_remove(key)
+
     def remove_object(self, obj, allow_internal_removal=False):
         if not allow_internal_removal and obj.internal:
             raise Exception(_("Internal objects can not be removed"))
 
+        subtree = []
+
         try:
             was_selected = obj in self.__selection
             parent = obj.parent
@@ -1469,6 +1643,9 @@ class CmbProject(GObject.Object, Gio.ListModel):
                         tmpl_obj._save_last_known_parent_and_position()
                         template_instances.append(tmpl_obj)
 
+            # Whole subtree, children are removed by the DB cascade
+            subtree = self.db.get_object_subtree(ui_id, object_id)
+
             name = obj.name if obj.name is not None else obj.type_id
             self.history_push(_("Remove object {name}").format(name=name))
 
@@ -1501,6 +1678,7 @@ class CmbProject(GObject.Object, Gio.ListModel):
             logger.warning(f"Error removing object {obj}: {e}")
         finally:
             self.__remove_object(obj, template_ui, template_instances, inline_properties)
+            self.__remove_object_descendants(ui_id, subtree[1:])
             obj._remove_from_old_parent()
 
             # Select parent if removed object was selected
@@ -1552,6 +1730,30 @@ class CmbProject(GObject.Object, Gio.ListModel):
         self.__selection = selection
         self.emit("selection-changed")
 
+    def __object_cache_add(self, key, obj):
+        self.__objects[key] = obj
+        self.__objects_lru[key] = obj
+        self.__objects_lru.move_to_end(key)
+
+        if len(self.__objects_lru) > constants.OBJECT_CACHE_SIZE:
+            self.__objects_lru.popitem(last=False)
+
+    def __object_cache_remove(self, key):
+        self.__objects.pop(key, None)
+        self.__objects_lru.pop(key, None)
+
+    # Live object wrappers of a UI
+    def _get_ui_objects(self, ui_id):
+        return [obj for obj in list(self.__objects.values()) if obj.ui_id == ui_id]
+
+    def get_object_cache_stats(self):
+        return {
+            "hits": self.__objects_hits,
+            "misses": self.__objects_misses,
+            "live": len(self.__objects),
+            "recent": len(self.__objects_lru),
+        }
+
     def get_object_by_key(self, key):
         if type(key) is int:
             return self._object_id.get(key, None)
@@ -1559,11 +1761,15 @@ class CmbProject(GObject.Object, Gio.ListModel):
         if type(key) is not str:
             logger.warning(f"Wrong key type {type(key)} {key}", exc_info=True)
 
-        obj = self._object_id.get(key, None)
+        obj = self.__objects.get(key, None)
 
         if obj:
+            self.__objects_hits += 1
+            self.__object_cache_add(key, obj)
             return obj
 
+        self.__objects_misses += 1
+
         tokens = key.split(".")
 
         # Check all tokens are numeric
@@ -1616,13 +1822,17 @@ class CmbProject(GObject.Object, Gio.ListModel):
         return self.__add_gresource(False, *row) if row else None
 
     def __undo_redo_property_notify(self, obj, layout, prop, owner_id, property_id):
+        if obj is None:
+            return
+
         properties = obj.layout_dict if layout else obj.properties_dict
         p = properties.get(property_id, None)
 
         if p and p.owner_id == owner_id and p.property_id == property_id:
-            p.notify(prop)
+            self.__undo_redo_notify(p, prop)
 
-    def __undo_redo_do(self, undo, update_objects=None):
+    # Update wrappers and collect GListModel changes for one history row, the DB is already updated
+    def __undo_redo_do(self, c, undo, row, update_objects):
         def get_object_position(table, row):
             if table == "object":
                 ui_id, parent_id, position = row[0], row[4], row[8]
@@ -1635,22 +1845,13 @@ class CmbProject(GObject.Object, Gio.ListModel):
 
             return None, None
 
-        c = self.db.cursor()
-
-        # Get last command
-        command, range_id, table, columns, table_pk, old_values, new_values = c.execute(
-            "SELECT command, range_id, table_name, columns, table_pk, old_values, new_values FROM history WHERE history_id=?",
-            (self.history_index,),
-        ).fetchone()
-
-        columns = json.loads(columns) if columns else None
-        table_pk = json.loads(table_pk) if table_pk else None
-        old_values = json.loads(old_values) if old_values else None
-        new_values = json.loads(new_values) if new_values else None
+        history_id, command, range_id, table, columns, table_pk, old_values, new_values = row
 
-        # Undo or Redo command
         if command == "INSERT":
-            if table in ["object", "gresource"]:
+            # Objects being forgotten were never added to their parent list model
+            if table == "object" and tuple(table_pk) in self.__undo_redo_forget:
+                pass
+            elif table in ["object", "gresource"]:
                 parent, position = get_object_position(table, new_values)
 
                 if undo:
@@ -1658,11 +1859,6 @@ class CmbProject(GObject.Object, Gio.ListModel):
                 else:
                     update_objects.append((parent, position, 0, 1))
 
-            if undo:
-                self.db.history_delete(table, table_pk)
-            else:
-                self.db.history_insert(table, new_values)
-
             self.__undo_redo_update_insert_delete(c, undo, command, table, columns, table_pk, old_values, new_values)
         elif command == "DELETE":
             if table in ["object", "gresource"]:
@@ -1673,17 +1869,15 @@ class CmbProject(GObject.Object, Gio.ListModel):
                 else:
                     update_objects.append((parent, position, 1, 0))
 
-            if undo:
-                self.db.history_insert(table, old_values)
-            else:
-                self.db.history_delete(table, table_pk)
-
             self.__undo_redo_update_insert_delete(c, undo, command, table, columns, table_pk, old_values, new_values)
         elif command == "UPDATE":
             # parent_id and position have to change together because their are part of a unique index
-            if update_objects is not None and table == "object" and "position" in columns and "parent_id" in columns:
-                old_parent, old_position = get_object_position(table, old_values)
-                new_parent, new_position = get_object_position(table, new_values)
+            if table == "object" and "position" in columns and "parent_id" in columns:
+                # UPDATE rows only have the values of the changed columns
+                parent_index, position_index = columns.index("parent_id"), columns.index("position")
+                old_parent = self.get_object_by_id(table_pk[0], old_values[parent_index])
+                new_parent = self.get_object_by_id(table_pk[0], new_values[parent_index])
+                old_position, new_position = old_values[position_index], new_values[position_index]
 
                 if undo:
                     if old_position >= 0:
@@ -1699,18 +1893,19 @@ class CmbProject(GObject.Object, Gio.ListModel):
                 # TODO
                 pass
 
-            if undo:
-                self.db.history_update(table, columns, table_pk, old_values)
-            else:
-                self.db.history_update(table, columns, table_pk, new_values)
-
             self.__undo_redo_update_update(c, undo, command, table, columns, table_pk, old_values, new_values)
         elif command == "PUSH" or command == "POP":
             pass
         else:
             logger.warning(f"Error unknown history command {command}")
 
-        c.close()
+    # Notifications are frozen until the whole history range is replayed, so each one is emitted once
+    def __undo_redo_notify(self, obj, prop):
+        if obj not in self.__undo_redo_frozen:
+            obj.freeze_notify()
+            self.__undo_redo_frozen.append(obj)
+
+        obj.notify(prop)
 
     def __undo_redo_update_update(self, c, undo, command, table, columns, pk, old_values, new_values):
         if table is None or command != "UPDATE":
@@ -1723,7 +1918,7 @@ class CmbProject(GObject.Object, Gio.ListModel):
             if table == "object":
                 obj = self.get_object_by_id(pk[0], pk[1])
                 if obj:
-                    obj.notify(column)
+                    self.__undo_redo_notify(obj, column)
             elif table == "object_property":
                 obj = self.get_object_by_id(pk[0], pk[1])
                 self.__undo_redo_property_notify(obj, False, column, pk[2], pk[3])
@@ -1731,28 +1926,29 @@ class CmbProject(GObject.Object, Gio.ListModel):
                 child = self.get_object_by_id(pk[0], pk[2])
                 self.__undo_redo_property_notify(child, True, column, pk[3], pk[4])
             elif table == "object_signal":
-                obj = self.get_object_by_id(old_values[1], old_values[2])
+                row = c.execute("SELECT ui_id, object_id FROM object_signal WHERE signal_pk=?;", pk).fetchone()
+                obj = self.get_object_by_id(row[0], row[1]) if row else None
                 if obj:
                     signal = obj.signals_dict[pk[0]]
                     if signal:
-                        signal.notify(column)
+                        self.__undo_redo_notify(signal, column)
             elif table == "object_data":
                 obj = self.get_object_by_id(pk[0], pk[1])
                 if obj:
                     data = obj.data_dict.get(f"{pk[2]}.{pk[4]}", None)
                     if data:
-                        data.notify(column)
+                        self.__undo_redo_notify(data, column)
             elif table == "object_data_arg":
                 obj = self.get_object_by_id(pk[0], pk[1])
                 if obj:
                     data = obj.data_dict.get(f"{pk[2]}.{pk[4]}", None)
                     if data:
                         data._arg_changed(pk[5])
-                        data.notify(column)
+                        self.__undo_redo_notify(data, column)
             elif table == "ui":
                 obj = self.get_object_by_id(pk[0])
                 if obj:
-                    obj.notify(column)
+                    self.__undo_redo_notify(obj, column)
             elif table == "ui_library":
                 ui = self.get_object_by_id(pk[0])
                 if ui:
@@ -1760,11 +1956,11 @@ class CmbProject(GObject.Object, Gio.ListModel):
             elif table == "css":
                 obj = self.get_css_by_id(pk[0])
                 if obj:
-                    obj.notify(column)
+                    self.__undo_redo_notify(obj, column)
             elif table == "gresource":
                 obj = self.get_gresource_by_id(pk[0])
                 if obj:
-                    obj.notify(column)
+                    self.__undo_redo_notify(obj, column)
 
     def __undo_redo_update_insert_delete(self, c, undo, command, table, columns, pk, old_values, new_values):
         if table is None:
@@ -1773,6 +1969,18 @@ class CmbProject(GObject.Object, Gio.ListModel):
         removing = (command == "INSERT" and undo) or (command == "DELETE") and not undo
         row = old_values if command == "DELETE" else new_values
 
+        # Rows of objects inserted or deleted in this range do not need to update any wrapper
+        if table.startswith("object_"):
+            if table == "object_signal":
+                object_key = (row[1], row[2])
+            elif table == "object_layout_property":
+                object_key = (row[0], row[2])
+            else:
+                object_key = (row[0], row[1])
+
+            if object_key in self.__undo_redo_objects:
+                return
+
         if table == "object_property":
             obj = self.get_object_by_id(pk[0], pk[1])
             self.__undo_redo_property_notify(obj, False, "value", pk[2], pk[3])
@@ -1782,8 +1990,11 @@ class CmbProject(GObject.Object, Gio.ListModel):
         elif table in ["object", "ui", "css", "gresource"]:
             if removing:
                 if table == "object":
-                    obj = self.get_object_by_id(pk[0], pk[1])
-                    self.__remove_object(obj)
+                    if (row[0], row[4]) in self.__undo_redo_objects or (row[0], row[1]) in self.__undo_redo_forget:
+                        self.__remove_object_descendants(row[0], [row[1]])
+                    else:
+                        obj = self.__objects.get(f"{row[0]}.{row[1]}", None) or self.__add_object(False, *row)
+                        self.__remove_object(obj)
                 elif table == "ui":
                     obj = self.get_object_by_id(pk[0])
                     self.__remove_ui(obj)
@@ -1796,7 +2007,8 @@ class CmbProject(GObject.Object, Gio.ListModel):
             else:
                 if table == "ui":
                     self.__add_ui(True, *row)
-                elif table == "object":
+                elif table == "object" and (row[0], row[4]) not in self.__undo_redo_objects:
+                    # Only the top object of a restored subtree needs a wrapper and object-added
                     obj = self.__add_object(True, *row)
 
                     if obj.ui.template_id == obj.object_id:
@@ -1856,7 +2068,7 @@ class CmbProject(GObject.Object, Gio.ListModel):
         elif table == "css_ui":
             obj = self.get_css_by_id(pk[0])
             if obj:
-                obj.notify("provider-for")
+                self.__undo_redo_notify(obj, "provider-for")
         elif table == "ui_library":
             ui = self.get_object_by_id(pk[0])
             if ui:
@@ -1877,67 +2089,106 @@ class CmbProject(GObject.Object, Gio.ListModel):
         self.db.clear_history()
         self.emit("changed")
 
-    def __undo_redo(self, undo):
+    def __undo_redo(self, undo, forget=None):
         selection = self.get_selection()
+        history_index = self.history_index
 
-        command, range_id, table = self.db.execute(
-            "SELECT command, range_id, table_name FROM history WHERE history_id=?", (self.history_index,)
-        ).fetchone()
+        row = self.db.execute("SELECT command, range_id FROM history WHERE history_id=?", (history_index,)).fetchone()
 
+        if row is None:
+            logger.warning(f"Error on undo/redo stack: history row {history_index} does not exist")
+            return
+
+        command, range_id = row
+
+        # Load the whole range at once
+        if command == "POP":
+            if undo:
+                rows = self.db.history_get_range(range_id, history_index)
+            else:
+                rows = []
+                logger.warning("Error on undo/redo stack: we should not try to redo a POP command")
+        elif command == "PUSH":
+            if not undo:
+                rows = self.db.history_get_range(history_index, range_id)
+            else:
+                rows = []
+                logger.warning("Error on undo/redo stack: we should not try to undo a PUSH command")
+        else:
+            rows = self.db.history_get_range(history_index, history_index)
+
+        if undo:
+            rows.reverse()
+
+        # Collect objects inserted or deleted in this range so subtrees can be handled as a whole
+        self.__undo_redo_objects = set(
+            tuple(row[5]) for row in rows if row[3] == "object" and row[1] in ["INSERT", "DELETE"]
+        )
+
+        self.__undo_redo_forget = forget or set()
+
+        # Views update once at the end of a range, like a batch
+        is_range = len(rows) > 1 and self.__batch is None
+        if is_range:
+            self.__batch = []
+
+        try:
+            self.__undo_redo_rows(undo, command, range_id, rows, selection)
+        finally:
+            # Always leave batch mode, even if the replay failed
+            if is_range:
+                self.__batch_finish()
+
+    def __undo_redo_rows(self, undo, command, range_id, rows, selection):
         update_parents = []
+        c = self.db.cursor()
 
         try:
             self.__db_freeze()
 
-            if command == "POP":
-                if undo:
-                    self.history_index -= 1
-                    while range_id < self.history_index:
-                        self.__undo_redo_do(True, update_parents)
-                        self.history_index -= 1
-                else:
-                    logger.warning("Error on undo/redo stack: we should not try to redo a POP command")
-            elif command == "PUSH":
-                if not undo:
-                    while range_id > self.history_index:
-                        self.history_index += 1
-                        self.__undo_redo_do(undo, update_parents)
-                else:
-                    logger.warning("Error on undo/redo stack: we should not try to undo a PUSH command")
-            else:
-                # Undo / Redo in DB
-                self.__undo_redo_do(undo, update_parents)
+            # Undo / Redo in DB
+            self.db.history_replay(undo, rows)
+
+            # Update wrappers
+            for row in rows:
+                self.__undo_redo_do(c, undo, row, update_parents)
 
             self.__db_thaw()
         except sqlite3.Error as e:
             self.__db_thaw()
             self.clear_history()
             raise e
-
-        # Compress update commands
-        compressed_list = []
-        prev_parent, prev_position, prev_removed, prev_added = (None, None, 0, 0)
-
-        for i, tuples in enumerate(update_parents):
-            parent, position, removed, added = tuples
-
-            # Compress removed and added if possible
-            if prev_parent == parent and prev_position == position and prev_removed + removed == 1 and prev_added + added == 1:
-                # Compress
-                compressed_list.pop()
-                compressed_list.append((parent, position, 1, 1))
-                prev_parent, prev_position, prev_removed, prev_added = (None, None, 0, 0)
+        finally:
+            c.close()
+            self.__undo_redo_objects = set()
+            self.__undo_redo_forget = set()
+
+            for obj in self.__undo_redo_frozen:
+                obj.thaw_notify()
+            self.__undo_redo_frozen = []
+
+        if rows and command in ["PUSH", "POP"]:
+            self.history_index = range_id
+
+        # Group GListModel changes by parent
+        # Ignore negative positions, they are used to avoid unique constrain errors on reparenting
+        parents = {}
+        for parent, position, removed, added in update_parents:
+            if position >= 0 and parent is not None:
+                parents.setdefault(parent, []).append((position, removed, added))
+
+        # Update GListModel, parents with more than one change get one items-changed
+        # replacing every item from the first changed position
+        for parent, changes in parents.items():
+            if len(changes) == 1:
+                position, removed, added = changes[0]
             else:
-                prev_parent, prev_position, prev_removed, prev_added = (parent, position, removed, added)
-                compressed_list.append((parent, position, removed, added))
+                n_items = parent.n_items
+                old_n_items = n_items - sum([change[2] for change in changes]) + sum([change[1] for change in changes])
+                position = min([change[0] for change in changes] + [n_items, old_n_items])
+                removed, added = old_n_items - position, n_items - position
 
-        if not undo:
-            compressed_list.reverse()
-
-        # Update GListModel
-        for parent, position, removed, added in compressed_list:
-            # Ignore negative positions, they are used to avoid unique constrain errors on reparenting
-            if position < 0:
+            if removed == 0 and added == 0:
                 continue
 
             parent.items_changed(position, removed, added)
@@ -1961,7 +2212,13 @@ class CmbProject(GObject.Object, Gio.ListModel):
 
         return names
 
+    # Messages are cached until a history row or the history index changes
     def get_undo_redo_msg(self):
+        key = (self.db.get_history_serial(), self.history_index)
+
+        if self.__undo_redo_msg is not None and self.__undo_redo_msg[0] == key:
+            return self.__undo_redo_msg[1]
+
         c = self.db.cursor()
 
         def get_type_data_name(owner_id, data_id):
@@ -2090,7 +2347,7 @@ class CmbProject(GObject.Object, Gio.ListModel):
         def get_msg(index):
             cmd = c.execute(
                 """
-                SELECT command, range_id, table_name, columns, message, old_values, new_values
+                SELECT command, range_id, table_name, columns, message, table_pk, old_values, new_values
                 FROM history
                 WHERE history_id=?
                 """,
@@ -2099,7 +2356,7 @@ class CmbProject(GObject.Object, Gio.ListModel):
 
             if cmd is None:
                 return None
-            command, range_id, table, columns, message, old_values, new_values = cmd
+            command, range_id, table, columns, message, table_pk, old_values, new_values = cmd
 
             columns = json.loads(columns) if columns else []
 
@@ -2111,6 +2368,9 @@ class CmbProject(GObject.Object, Gio.ListModel):
             else:
                 values = json.loads(new_values) if new_values else None
 
+            if command == "UPDATE" and values is not None:
+                values = self.db.history_update_row(table, columns, json.loads(table_pk), values)
+
             msg = (
                 {
                     "ui": {
@@ -2186,6 +2446,8 @@ class CmbProject(GObject.Object, Gio.ListModel):
 
         c.close()
 
+        self.__undo_redo_msg = (key, (undo_msg, redo_msg))
+
         return (undo_msg, redo_msg)
 
     def undo(self):
@@ -2345,9 +2607,20 @@ class CmbProject(GObject.Object, Gio.ListModel):
         self.db.move_to_fs(filename)
 
     def history_push(self, message):
+        # Batches are recorded in one range
+        if self.__batch is None:
+            self.__history_push(message)
+
+    def history_pop(self):
+        if self.__batch is None:
+            self.__history_pop()
+
+    def __history_push(self, message):
         if not self.history_enabled:
             return
 
+        self.__history_depth += 1
+
         # Make sure we clear history on new push
         self.db.clear_history()
 
@@ -2356,11 +2629,17 @@ class CmbProject(GObject.Object, Gio.ListModel):
             (self.history_index_max + 1, message),
         )
 
-    def history_pop(self):
+    def __history_pop(self):
         if not self.history_enabled:
             return
 
         self.db.execute("INSERT INTO history (history_id, command) VALUES (?, 'POP')", (self.history_index_max + 1,))
+        self.__history_depth = max(self.__history_depth - 1, 0)
+
+        if self.__history_depth == 0 and (self.history_max_steps or self.history_max_bytes):
+            self.__history_offset += self.db.history_trim(self.history_max_steps, self.history_max_bytes)
+
+        self.notify("history-size")
         self.emit("changed")
 
     def copy(self):
@@ -60,17 +60,10 @@ class CmbProperty(CmbBaseProperty):
         self.object._property_changed(self, pspec.name)
 
     def __db_get(self, column):
-        row = self.project.db.execute(
-            f"SELECT {column} FROM object_property WHERE ui_id=? AND object_id=? AND owner_id=? AND property_id=?;",
-            (self.ui_id, self.object_id, self.owner_id, self.property_id),
-        ).fetchone()
-        return row[0] if row is not None else None
+        return self.db_get_field(column)
 
     def has_value(self):
-        return self.db_get(
-            "SELECT count(ui_id) FROM object_property WHERE ui_id=? AND object_id=? AND owner_id=? AND property_id=?;",
-            (self.ui_id, self.object_id, self.owner_id, self.property_id),
-        ) > 0
+        return self.db_has_row()
 
     def __db_set(self, **kwargs):
         # Do not use REPLACE INTO, to make sure both INSERT and UPDATE triggers are used
@@ -0,0 +1,80 @@
+#
+# CmbSparseProperties - Lazy property wrappers mapping
+#
+# Copyright (C) 2026  Juan Pablo Ugarte
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation;
+# version 2.1 of the License.
+#
+# library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# Authors:
+#   Juan Pablo Ugarte <juanpablougarte@gmail.com>
+#
+# SPDX-License-Identifier: LGPL-2.1-only
+#
+
+
+from collections.abc import Mapping
+
+
+# Read only mapping of property name -> property wrapper.
+#
+# Only the property name, owner and CmbPropertyInfo, which is shared by every
+# object of the same type, are stored until the wrapper is actually used.
+# Wrappers are created by factory(owner_id, info) the first time they are accessed.
+class CmbSparseProperties(Mapping):
+    def __init__(self, factory):
+        self.__factory = factory
+
+        # name -> (owner_id, info)
+        self.__infos = {}
+
+        # name -> wrapper
+        self.__wrappers = {}
+
+    def __getitem__(self, name):
+        wrapper = self.__wrappers.get(name, None)
+
+        if wrapper is None:
+            owner_id, info = self.__infos[name]
+            wrapper = self.__factory(owner_id, info)
+            self.__wrappers[name] = wrapper
+
+        return wrapper
+
+    def __contains__(self, name):
+        return name in self.__infos
+
+    def __iter__(self):
+        return iter(self.__infos)
+
+    def __len__(self):
+        return len(self.__infos)
+
+    def add(self, name, owner_id, info):
+        self.__infos[name] = (owner_id, info)
+
+    # Create the wrapper for name unless it belongs to a different owner
+    def materialize(self, name, owner_id):
+        info = self.__infos.get(name, None)
+
+        if info is not None and info[0] == owner_id:
+            self[name]
+
+    # Wrappers created so far, used internally to update them without creating the rest
+    def wrappers(self):
+        return list(self.__wrappers.values())
+
+    # Property infos in insertion order, no wrapper is created
+    def infos(self):
+        return [info for owner_id, info in self.__infos.values()]
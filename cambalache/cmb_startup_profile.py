@@ -0,0 +1,217 @@
+#
+# CmbStartupProfile - Startup phase profiler
+#
+# Copyright (C) 2026  Juan Pablo Ugarte
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation;
+# version 2.1 of the License.
+#
+# library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+#
+# Authors:
+#   Juan Pablo Ugarte <juanpablougarte@gmail.com>
+#
+# SPDX-License-Identifier: LGPL-2.1-only
+#
+
+# Enabled with CAMBALACHE_DEBUG=startup
+#
+# Records monotonic timings and peak RSS for each phase and nested sub phase.
+# A JSON report and a Chrome trace event file are written once startup finishes,
+# or at exit if it never does, in the directory pointed by
+# CAMBALACHE_STARTUP_PROFILE_DIR or the current directory.
+
+import os
+import sys
+import json
+import time
+import atexit
+import resource
+
+from contextlib import contextmanager, nullcontext
+from cambalache import config, getLogger
+
+logger = getLogger(__name__)
+
+REPORT_FILENAME = "cambalache-startup.json"
+TRACE_FILENAME = "cambalache-startup-trace.json"
+
+
+def _peak_rss_kb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # macOS reports bytes instead of kilobytes
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class CmbStartupProfile:
+    def __init__(self):
+        self.start = time.monotonic_ns()
+        self.phases = []
+        self.written = False
+
+        self.__stack = []
+        self.__async = {}
+
+    def __new_phase(self, name, is_async=False):
+        return {
+            "name": name,
+            "async": is_async,
+            "start": time.monotonic_ns(),
+            "end": None,
+            "peak_rss_start": _peak_rss_kb(),
+            "peak_rss": None,
+            "children": [],
+        }
+
+    def __end_phase(self, phase):
+        phase["end"] = time.monotonic_ns()
+        phase["peak_rss"] = _peak_rss_kb()
+
+    def begin(self, name):
+        phase = self.__new_phase(name)
+
+        if self.__stack:
+            self.__stack[-1]["children"].append(phase)
+        else:
+            self.phases.append(phase)
+
+        self.__stack.append(phase)
+
+    def end(self):
+        self.__end_phase(self.__stack.pop())
+
+    @contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    # Phases that span several main loop iterations, like waiting for merengue
+    def async_begin(self, name):
+        phase = self.__new_phase(name, is_async=True)
+        self.phases.append(phase)
+        self.__async[name] = phase
+
+    def async_end(self, name):
+        phase = self.__async.pop(name, None)
+        if phase is not None:
+            self.__end_phase(phase)
+
+    def __phase_report(self, phase):
+        end = phase["end"] if phase["end"] is not None else time.monotonic_ns()
+        peak_rss = phase["peak_rss"] if phase["peak_rss"] is not None else _peak_rss_kb()
+
+        return {
+            "name": phase["name"],
+            "async": phase["async"],
+            "start_ms": (phase["start"] - self.start) / 1000000,
+            "duration_ms": (end - phase["start"]) / 1000000,
+            "finished": phase["end"] is not None,
+            "peak_rss_kb": peak_rss,
+            "peak_rss_growth_kb": peak_rss - phase["peak_rss_start"],
+            "children": [self.__phase_report(child) for child in phase["children"]],
+        }
+
+    def report(self):
+        return {
+            "version": config.VERSION,
+            "pid": os.getpid(),
+            "total_ms": (time.monotonic_ns() - self.start) / 1000000,
+            "peak_rss_kb": _peak_rss_kb(),
+            "phases": [self.__phase_report(phase) for phase in self.phases],
+        }
+
+    def trace(self):
+        pid = os.getpid()
+        events = []
+
+        def add_events(phases):
+            for phase in phases:
+                end = phase["end"] if phase["end"] is not None else time.monotonic_ns()
+
+                events.append(
+                    {
+                        "name": phase["name"],
+                        "cat": "startup",
+                        "ph": "X",
+                        "pid": pid,
+                        # Async phases overlap with the rest so use a different track for them
+                        "tid": 2 if phase["async"] else 1,
+                        "ts": (phase["start"] - self.start) / 1000,
+                        "dur": (end - phase["start"]) / 1000,
+                        "args": {
+                            "peak_rss_kb": phase["peak_rss"],
+                            "peak_rss_growth_kb": (phase["peak_rss"] or 0) - phase["peak_rss_start"],
+                        },
+                    }
+                )
+                add_events(phase["children"])
+
+        add_events(self.phases)
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    # Only the first report is written, later calls like merengue restarts or exit are ignored
+    def write(self):
+        if self.written:
+            return
+
+        dirname = os.environ.get("CAMBALACHE_STARTUP_PROFILE_DIR", os.getcwd())
+
+        try:
+            os.makedirs(dirname, exist_ok=True)
+
+            with open(os.path.join(dirname, REPORT_FILENAME), "w") as fd:
+                json.dump(self.report(), fd, indent=2)
+
+            with open(os.path.join(dirname, TRACE_FILENAME), "w") as fd:
+                json.dump(self.trace(), fd)
+        except Exception as e:
+            logger.warning(f"Error writing startup profile: {e}")
+            return
+
+        self.written = True
+        logger.info(f"Startup profile written to {dirname}")
+
+
+_profile = None
+
+if os.environ.get("CAMBALACHE_DEBUG", None) == "startup":
+    _profile = CmbStartupProfile()
+
+    # Fallback in case startup never finishes
+    atexit.register(_profile.write)
+
+
+def startup_phase(name):
+    if _profile is None:
+        return nullcontext()
+
+    return _profile.phase(name)
+
+
+def startup_phase_begin(name):
+    if _profile is not None:
+        _profile.async_begin(name)
+
+
+def startup_phase_end(name):
+    if _profile is not None:
+        _profile.async_end(name)
+
+
+def startup_profile_write():
+    if _profile is not None:
+        _profile.write()
@@ -121,6 +121,9 @@ class CmbTypeChooserWidget(Gtk.Box):
 
         infos = []
 
+        # We are going to check every type, load them all at once
+        project.load_type_metadata()
+
         for key in project.type_info:
             # Ignore types with no name, just in case
             if key:
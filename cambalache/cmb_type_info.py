@@ -23,6 +23,7 @@
 # SPDX-License-Identifier: LGPL-2.1-only
 #
 
+from functools import cached_property
 from gi.repository import GObject, Gtk
 
 from .cmb_base_objects import (
@@ -42,6 +43,14 @@ from cambalache import getLogger
 logger = getLogger(__name__)
 
 
+# Set internal child back reference in property
+def _set_internal_child_references(properties, internal_children):
+    for child in internal_children.values():
+        if child.creation_property_id and child.creation_property_id in properties:
+            properties[child.creation_property_id].internal_child = child
+        _set_internal_child_references(properties, child.children)
+
+
 class CmbTypeDataArgInfo(CmbBaseTypeDataArgInfo):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -81,58 +90,123 @@ class CmbTypeInfo(CmbBaseTypeInfo):
         if self.project is None:
             return
 
-        self.hierarchy = self.__init_hierarchy()
-        self.interfaces = self.__init_interfaces()
-        self.properties = self.__init_properties_signals(CmbPropertyInfo, "property")
-        self.signals = self.__init_properties_signals(CmbSignalInfo, "signal")
-        self.data = self.__init_data()
-        self.internal_children = self.__init_internal_children()
-        self.child_constraint, self.child_type_shortcuts = self.__init_child_constraint()
-
-        if self.parent_id == "enum":
-            self.enum = self.__init_enum_flags("enum")
-        elif self.parent_id == "flags":
-            self.flags = self.__init_enum_flags("flags")
-
-        self.child_types = self.__init_child_type()
-
-        self.is_object = self.is_a("GObject")
-
-        self.instantiable = self.is_object and not self.abstract
-
+        # The rest of the type information is loaded from the DB on first access
         self.is_menu_builtin = self.type_id in [GMENU_TYPE, GMENU_SECTION_TYPE, GMENU_SUBMENU_TYPE, GMENU_ITEM_TYPE]
         self.is_builtin = self.is_menu_builtin or self.type_id in [EXTERNAL_TYPE, CUSTOM_TYPE]
 
     def __str__(self):
         return f"CmbTypeInfo<{self.type_id}>"
 
+    @cached_property
+    def hierarchy(self):
+        return self.__init_hierarchy()
+
+    @cached_property
+    def interfaces(self):
+        return self.__init_interfaces()
+
+    @cached_property
+    def properties(self):
+        retval = self.__init_properties_signals(CmbPropertyInfo, "property")
+        _set_internal_child_references(retval, self.internal_children)
+        return retval
+
+    @cached_property
+    def signals(self):
+        return self.__init_properties_signals(CmbSignalInfo, "signal")
+
+    @cached_property
+    def data(self):
+        return self.__init_data()
+
+    @cached_property
+    def internal_children(self):
+        return self.__init_internal_children()
+
+    @cached_property
+    def child_constraint(self):
+        return self.__child_constraint_shortcuts[0]
+
+    @cached_property
+    def child_type_shortcuts(self):
+        return self.__child_constraint_shortcuts[1]
+
+    @cached_property
+    def __child_constraint_shortcuts(self):
+        return self.__init_child_constraint()
+
+    # Enum and flags list stores are only used as view models in the UI
+    @cached_property
+    def enum(self):
+        return self.__init_enum_flags_store("enum")
+
+    @cached_property
+    def flags(self):
+        return self.__init_enum_flags_store("flags")
+
+    # List of (name, nick, value) sorted by nick
+    @cached_property
+    def __enum_flags_values(self):
+        return self.__init_enum_flags()
+
+    # Lookup tables, name/nick -> row, str(value) -> row and flag bit -> rows
+    @cached_property
+    def __enum_flags_index(self):
+        names = {}
+        values = {}
+        bits = {}
+
+        for i, (name, nick, value) in enumerate(self.__enum_flags_values):
+            # First row wins, just like a sequential scan would
+            names.setdefault(name, i)
+            names.setdefault(nick, i)
+            values.setdefault(str(value), i)
+
+            # Negative masks like -1 (all flags) can not be decomposed in bits
+            if value < 0:
+                bits.setdefault(None, []).append(i)
+                continue
+
+            mask = value
+            while mask:
+                bit = mask & -mask
+                bits.setdefault(bit, []).append(i)
+                mask ^= bit
+
+        return names, values, bits
+
+    # List of (mask, nick) sorted by nick
+    @cached_property
+    def __flags_masks(self):
+        return [(value, nick) for name, nick, value in self.__enum_flags_values]
+
+    @cached_property
+    def child_types(self):
+        return self.__init_child_type()
+
+    @cached_property
+    def is_object(self):
+        return self.is_a("GObject")
+
+    @cached_property
+    def instantiable(self):
+        return self.is_object and not self.abstract
+
     def __init_hierarchy(self):
+        if self.parent_id is None or self.parent_id in ["interface", "enum", "flags"]:
+            return []
+
         retval = []
 
+        # Interfaces first (generation 0) then parents, fundamental object type is only listed as a direct parent
         c = self.project.db.cursor()
         for row in c.execute(
             """
-            WITH RECURSIVE ancestor(type_id, generation, parent_id) AS (
-                SELECT type_id, 1, parent_id
-                FROM type
-                WHERE parent_id IS NOT NULL AND
-                      parent_id != 'interface' AND
-                      parent_id != 'enum' AND
-                      parent_id != 'flags' AND
-                      type_id=?
-                UNION ALL
-                SELECT ancestor.type_id, generation + 1, type.parent_id
-                FROM type JOIN ancestor ON type.type_id = ancestor.parent_id
-                WHERE type.parent_id IS NOT NULL AND type.parent_id != 'object' AND ancestor.type_id=?
-            )
-            SELECT parent_id, generation FROM ancestor
-            UNION
-            SELECT type_iface.iface_id, 0
-            FROM ancestor JOIN type_iface
-            WHERE ancestor.type_id = type_iface.type_id
-            ORDER BY generation;
+            SELECT ancestor_id FROM type_ancestor
+            WHERE type_id=? AND (generation <= 1 OR ancestor_id != 'object')
+            ORDER BY generation, ancestor_id;
             """,
-            (self.type_id, self.type_id),
+            (self.type_id,),
         ):
             retval.append(row[0])
 
@@ -223,11 +297,6 @@ class CmbTypeInfo(CmbBaseTypeInfo):
 
         retval.children = children
 
-        # Internal child back reference in property
-        if creation_property_id:
-            if creation_property_id in self.properties:
-                self.properties[creation_property_id].internal_child = retval
-
         return retval
 
     def __init_internal_children(self):
@@ -277,16 +346,176 @@ class CmbTypeInfo(CmbBaseTypeInfo):
         c.close()
         return retval
 
-    def __init_enum_flags(self, name):
-        retval = Gtk.ListStore(GObject.TYPE_STRING, GObject.TYPE_STRING, GObject.TYPE_INT)
+    def __init_enum_flags(self):
+        if self.parent_id not in ["enum", "flags"]:
+            return []
 
         c = self.project.db.cursor()
-        for row in c.execute(f"SELECT name, nick, value FROM type_{name} WHERE type_id=? ORDER BY nick;", (self.type_id,)):
-            retval.append(row)
-
+        retval = [
+            (name, nick, value if value else 0)
+            for name, nick, value in c.execute(
+                f"SELECT name, nick, value FROM type_{self.parent_id} WHERE type_id=? ORDER BY nick;", (self.type_id,)
+            )
+        ]
         c.close()
+
         return retval
 
+    def __init_enum_flags_store(self, name):
+        retval = Gtk.ListStore(GObject.TYPE_STRING, GObject.TYPE_STRING, GObject.TYPE_INT)
+
+        if self.parent_id == name:
+            for row in self.__enum_flags_values:
+                retval.append(row)
+
+        return retval
+
+    # Load metadata of all the types in a library reading each table only once.
+    # Attributes already loaded are kept, the rest are set exactly as the lazy accessors would.
+    @staticmethod
+    def bulk_load(project, library_id, type_infos):
+        db = project.db
+
+        def get_rows(query):
+            types = "SELECT type_id FROM type WHERE parent_id IS NOT NULL AND library_id=?"
+            return db.execute(query.format(types=types), (library_id,)).fetchall()
+
+        def group_rows(query):
+            retval = {}
+            for row in get_rows(query):
+                retval.setdefault(row[0], []).append(row)
+            return retval
+
+        # Hierarchy
+        interfaces = {}
+        for type_id, iface_id in get_rows(
+            "SELECT type_id, iface_id FROM type_iface WHERE type_id IN ({types}) ORDER BY type_id, iface_id;"
+        ):
+            interfaces.setdefault(type_id, []).append(iface_id)
+
+        ancestors = {}
+        for type_id, ancestor_id in get_rows(
+            """
+            SELECT type_id, ancestor_id FROM type_ancestor
+            WHERE type_id IN ({types}) AND (generation <= 1 OR ancestor_id != 'object')
+            ORDER BY type_id, generation, ancestor_id;
+            """
+        ):
+            ancestors.setdefault(type_id, []).append(ancestor_id)
+
+        def get_hierarchy(type_id, parent_id):
+            if parent_id is None or parent_id in ["interface", "enum", "flags"]:
+                return []
+
+            return ancestors.get(type_id, [])
+
+        # Properties and signals
+        properties = group_rows("SELECT * FROM property WHERE owner_id IN ({types}) ORDER BY owner_id, property_id;")
+        signals = group_rows("SELECT * FROM signal WHERE owner_id IN ({types}) ORDER BY owner_id, signal_id;")
+
+        # Type data
+        data_args = {}
+        for row in get_rows("SELECT * FROM type_data_arg WHERE owner_id IN ({types}) ORDER BY owner_id, data_id, key;"):
+            data_args.setdefault((row[0], row[1]), {})[row[2]] = CmbTypeDataArgInfo.from_row(project, *row)
+
+        data = {}
+        data_infos = {}
+        for owner_id, data_id, parent_id, key, type_id, translatable in get_rows(
+            "SELECT * FROM type_data WHERE owner_id IN ({types}) ORDER BY owner_id, data_id;"
+        ):
+            info = CmbTypeDataInfo.from_row(
+                project, owner_id, data_id, parent_id if parent_id is not None else 0, key, type_id, translatable
+            )
+            info.args = data_args.get((owner_id, data_id), {})
+            info.children = {}
+            data_infos[(owner_id, data_id)] = (parent_id, info)
+
+            if parent_id is None:
+                data.setdefault(owner_id, {})[key] = info
+
+        for (owner_id, data_id), (parent_id, info) in data_infos.items():
+            if parent_id is not None:
+                data_infos[(owner_id, parent_id)][1].children[info.key] = info
+
+        # Internal children
+        internal_children = {}
+        internal_infos = {}
+        for row in get_rows(
+            "SELECT * FROM type_internal_child WHERE type_id IN ({types}) ORDER BY type_id, internal_child_id;"
+        ):
+            type_id, internal_child_id, internal_parent_id = row[0:3]
+            info = CmbTypeInternalChildInfo.from_row(project, *row)
+            info.children = {}
+            internal_infos[(type_id, internal_child_id)] = info
+
+            if internal_parent_id is None:
+                internal_children.setdefault(type_id, {})[internal_child_id] = info
+
+        # Parents are not always sorted before their children
+        for (type_id, internal_child_id), info in internal_infos.items():
+            if info.internal_parent_id is not None:
+                internal_infos[(type_id, info.internal_parent_id)].children[internal_child_id] = info
+
+        # Child constraints and types
+        child_constraints = group_rows(
+            """
+            SELECT type_id, child_type_id, allowed, shortcut
+            FROM type_child_constraint WHERE type_id IN ({types}) ORDER BY type_id, child_type_id;
+            """
+        )
+        child_types = group_rows("SELECT * FROM type_child_type WHERE type_id IN ({types}) ORDER BY type_id, child_type;")
+
+        # Enumerations and flags
+        enum_flags = {}
+        for name in ["enum", "flags"]:
+            for type_id, rows in group_rows(
+                f"SELECT type_id, name, nick, value FROM type_{name} WHERE type_id IN ({{types}}) ORDER BY type_id, nick;"
+            ).items():
+                enum_flags[type_id] = [(row[1], row[2], row[3] if row[3] else 0) for row in rows]
+
+        def set_default(info, name, value):
+            if name not in info.__dict__:
+                setattr(info, name, value)
+
+        for type_id, info in type_infos.items():
+            set_default(info, "hierarchy", get_hierarchy(type_id, info.parent_id))
+            set_default(info, "interfaces", interfaces.get(type_id, []))
+            set_default(info, "internal_children", internal_children.get(type_id, {}))
+
+            if "properties" not in info.__dict__:
+                props = {row[1]: CmbPropertyInfo.from_row(project, *row) for row in properties.get(type_id, [])}
+                _set_internal_child_references(props, info.internal_children)
+                info.properties = props
+
+            if "signals" not in info.__dict__:
+                info.signals = {row[1]: CmbSignalInfo.from_row(project, *row) for row in signals.get(type_id, [])}
+
+            set_default(info, "data", data.get(type_id, {}))
+
+            if "_CmbTypeInfo__child_constraint_shortcuts" not in info.__dict__:
+                constraint = {}
+                shortcuts = []
+                for row in child_constraints.get(type_id, []):
+                    constraint[row[1]] = row[2]
+                    if row[3]:
+                        shortcuts.append(row[1])
+
+                info.__child_constraint_shortcuts = (constraint, shortcuts)
+
+            if "child_types" not in info.__dict__:
+                info.child_types = {}
+                for owner_id, child_type, max_children, linked_property_id in child_types.get(type_id, []):
+                    info.child_types[child_type] = CmbTypeChildInfo(
+                        project=project,
+                        type_id=owner_id,
+                        child_type=child_type,
+                        max_children=max_children if max_children else 0,
+                        linked_property_id=linked_property_id,
+                    )
+
+            if info.parent_id in ["enum", "flags"]:
+                set_default(info, "_CmbTypeInfo__enum_flags_values", enum_flags.get(type_id, []))
+
     def is_a(self, type_id):
         return self.type_id == type_id or type_id in self.hierarchy
 
@@ -335,43 +564,52 @@ class CmbTypeInfo(CmbBaseTypeInfo):
         if self.parent_id != "enum":
             return None
 
-        for row in self.enum:
-            enum_name, enum_nick, enum_value = row
+        names, values, bits = self.__enum_flags_index
+
+        # value can be a name, a nick or the numeric value
+        rows = [i for i in (names.get(value, None), values.get(value, None)) if i is not None]
+        if not rows:
+            return None
 
-            # Always use nick as value
-            if value == enum_name or value == enum_nick or value == str(enum_value):
-                return enum_nick if use_nick else enum_value
+        enum_name, enum_nick, enum_value = self.__enum_flags_values[min(rows)]
 
-        return None
+        # Always use nick as value
+        return enum_nick if use_nick else enum_value
 
     def flags_get_value_as_string(self, value):
         if self.parent_id != "flags":
             return None
 
         value_type = type(value)
-        tokens = None
+        rows = set()
+
+        names, values, bits = self.__enum_flags_index
 
         if value_type == str:
             if value.isnumeric():
                 value = int(value)
                 value_type = int
             else:
-                tokens = [t.strip() for t in value.split("|")]
+                for token in value.split("|"):
+                    i = names.get(token.strip(), None)
+                    if i is not None:
+                        rows.add(i)
         elif value_type != int:
             logger.warning(f"Unhandled value type {value_type} {value}")
             return None
 
-        flags = []
-
-        for row in self.flags:
-            flag_name, flag_nick, flag_value = row
-
-            if value_type == str:
-                # Always use nick as value
-                if flag_name in tokens or flag_nick in tokens:
-                    flags.append(flag_nick)
+        if value_type == int:
+            if value < 0:
+                rows = {i for i, (mask, nick) in enumerate(self.__flags_masks) if mask & value}
             else:
-                if flag_value & value:
-                    flags.append(flag_nick)
+                # Only look at the bits that are set
+                mask = value
+                while mask:
+                    bit = mask & -mask
+                    rows.update(bits.get(bit, []))
+                    mask ^= bit
+
+                rows.update([i for i in bits.get(None, []) if self.__flags_masks[i][0] & value])
 
-        return "|".join(flags)
+        # Always use nick as value
+        return "|".join([self.__flags_masks[i][1] for i in sorted(rows)])
@@ -77,6 +77,10 @@ class CmbUI(CmbBaseUI, Gio.ListModel):
         if pspec.name == "filename":
             self.update_file_monitor(self.filename)
 
+        if pspec.name == "template-id":
+            for obj in self.project._get_ui_objects(self.ui_id):
+                obj._on_ui_notify(self, pspec)
+
     def list_libraries(self):
         retval = {}
 
@@ -108,6 +112,10 @@ class CmbUI(CmbBaseUI, Gio.ListModel):
         return row[0] if row is not None else None
 
     def _library_changed(self, lib):
+        # Live objects update their own and their properties version warnings
+        for obj in self.project._get_ui_objects(self.ui_id):
+            obj._on_ui_library_changed(self, lib)
+
         self.emit("library-changed", lib)
         self.project._ui_library_changed(self, lib)
 
@@ -214,22 +222,10 @@ class CmbUI(CmbBaseUI, Gio.ListModel):
     # GListModel iface
     def do_get_item(self, position):
         ui_id = self.ui_id
+        children, positions = self.project.db.get_object_children(ui_id, None)
 
-        # This query should use auto index from UNIQUE constraint
-        retval = self.db_get(
-            """
-            SELECT object_id
-            FROM (
-                SELECT ROW_NUMBER() OVER (ORDER BY position ASC) rownum, object_id
-                FROM object
-                WHERE ui_id=? AND parent_id IS NULL
-            )
-            WHERE rownum=?;
-            """,
-            (ui_id, position+1)
-        )
-        if retval is not None:
-            return self.project.get_object_by_id(ui_id, retval)
+        if position < len(children):
+            return self.project.get_object_by_id(ui_id, children[position])
 
         # This should not happen
         return CmbListError()
@@ -239,8 +235,8 @@ class CmbUI(CmbBaseUI, Gio.ListModel):
 
     @GObject.Property(type=int)
     def n_items(self):
-        retval = self.db_get("SELECT COUNT(object_id) FROM object WHERE ui_id=? AND parent_id IS NULL;", (self.ui_id,))
-        return retval if retval is not None else 0
+        children, positions = self.project.db.get_object_children(self.ui_id, None)
+        return len(children)
 
     def do_get_n_items(self):
         return self.n_items
@@ -38,6 +38,7 @@ from gi.repository import GObject, GLib, Gtk, Casilda
 
 from cambalache import getLogger, _, ngettext
 from cambalache.cmb_blueprint import cmb_blueprint_decompile
+from cambalache.cmb_startup_profile import startup_phase, startup_phase_begin, startup_phase_end, startup_profile_write
 from mrg_command import MrgCommand
 
 
@@ -81,6 +82,9 @@ class CmbMerengueProcess(GObject.Object, MrgCommand):
         if self.__file is None or self.__pid > 0:
             return
 
+        # Ends when merengue sends the started command
+        startup_phase_begin("merengue")
+
         # Create socketpair for commands comunication
         client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
 
@@ -187,6 +191,9 @@ class CmbView(Gtk.Box):
         self.__theme = None
         self.__css_update_timeout = {}
 
+        # UIs to update in merengue when the current project batch finishes
+        self.__batch_ui_ids = set()
+
         self.menu = self.__create_context_menu()
 
         super().__init__(**kwargs)
@@ -218,6 +225,11 @@ class CmbView(Gtk.Box):
         if not self.__merengue_started:
             return
 
+        # UI commands are replaced by one update_ui at the end of the batch
+        if self.__project.in_batch and args is not None and "ui_id" in args:
+            self.__batch_ui_ids.add(args["ui_id"])
+            return
+
         self.__merengue.write_command(command, args)
 
     def __get_ui_xml(self, ui_id, merengue=False):
@@ -273,6 +285,10 @@ class CmbView(Gtk.Box):
         return dirname
 
     def __merengue_update_ui(self, ui_id):
+        if self.__project.in_batch:
+            self.__batch_ui_ids.add(ui_id)
+            return
+
         ui = self.__get_ui_xml(ui_id, merengue=True) if ui_id else None
         toplevels = self.__project.db.get_toplevels(ui_id)
         selection = self.__project.get_selection()
@@ -304,6 +320,18 @@ class CmbView(Gtk.Box):
             self.__restart_merenge_timeout_source = GLib.timeout_add_seconds(4, self.__restart_merenge_timeout, None)
 
     def __on_changed(self, project):
+        if project.in_batch:
+            return
+
+        self.__update_view()
+
+    def __on_batch_finished(self, project):
+        ui_ids = self.__batch_ui_ids
+        self.__batch_ui_ids = set()
+
+        for ui_id in ui_ids:
+            self.__merengue_update_ui(ui_id)
+
         self.__update_view()
 
     def __on_ui_changed(self, project, ui, field):
@@ -487,6 +515,7 @@ class CmbView(Gtk.Box):
         if self.__project:
             self.__project.disconnect_by_func(self.__on_notify)
             self.__project.disconnect_by_func(self.__on_changed)
+            self.__project.disconnect_by_func(self.__on_batch_finished)
             self.__project.disconnect_by_func(self.__on_ui_changed)
             self.__project.disconnect_by_func(self.__on_object_added)
             self.__project.disconnect_by_func(self.__on_object_removed)
@@ -513,6 +542,7 @@ class CmbView(Gtk.Box):
         if project:
             project.connect("notify", self.__on_notify)
             project.connect("changed", self.__on_changed)
+            project.connect("batch-finished", self.__on_batch_finished)
             project.connect("ui-changed", self.__on_ui_changed)
             project.connect("object-added", self.__on_object_added)
             project.connect("object-removed", self.__on_object_removed)
@@ -671,17 +701,24 @@ class CmbView(Gtk.Box):
         if command == "selection_changed":
             self.__command_selection_changed(**args)
         elif command == "started":
+            startup_phase_end("merengue")
+
             self.__merengue_started = True
-            self.__merengue_command("gtk_settings_get", args={"property": "gtk-theme-name"})
 
-            self.__set_icontheme_search_paths()
+            with startup_phase("merengue.first_update_ui"):
+                self.__merengue_command("gtk_settings_get", args={"property": "gtk-theme-name"})
 
-            self.__load_namespaces()
+                self.__set_icontheme_search_paths()
 
-            self.__load_css_providers()
+                self.__load_namespaces()
 
-            self.__ui = None
-            self.__on_project_selection_changed(self.__project)
+                self.__load_css_providers()
+
+                self.__ui = None
+                self.__on_project_selection_changed(self.__project)
+
+            # Workspace is up, we got everything we need from startup
+            startup_profile_write()
         elif command == "placeholder_selected":
             self.emit(
                 "placeholder-selected",
@@ -33,3 +33,10 @@ GMENU_TYPE = "(menu)"
 GMENU_SECTION_TYPE = "(section)"
 GMENU_SUBMENU_TYPE = "(submenu)"
 GMENU_ITEM_TYPE = "(item)"
+
+# Number of recently used CmbObject wrappers CmbProject keeps alive even if nothing else references them
+OBJECT_CACHE_SIZE = 1024
+
+# Default undo history budget, oldest steps are discarded when any limit is reached. 0 means no limit
+HISTORY_MAX_STEPS = 0
+HISTORY_MAX_BYTES = 0
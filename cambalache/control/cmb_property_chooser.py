@@ -57,8 +57,8 @@ class CmbPropertyChooser(Gtk.ComboBoxText):
         target_is_object = target_info.is_object
         target_is_iface = target_type_info.parent_id == "interface" if target_type_info else False
 
-        for prop in sorted(self.object.properties, key=lambda p: p.property_id):
-            info = prop.info
+        # Only property infos are needed, avoid creating a wrapper for every property
+        for info in sorted(self.object.properties_dict.infos(), key=lambda i: i.property_id):
 
             if info.is_a11y:
                 continue
@@ -100,8 +100,8 @@ class CmbPropertyChooser(Gtk.ComboBoxText):
                         if not compatible:
                             compatible = GObject.Value.type_transformable(gtype_id, gtarget_id)
                 except Exception as e:  # noqa F841
-                    self.append(prop.property_id, prop.property_id + "*")
+                    self.append(info.property_id, info.property_id + "*")
                     continue
 
             if compatible:
-                self.append(prop.property_id, prop.property_id)
+                self.append(info.property_id, info.property_id)
@@ -103,6 +103,59 @@ CREATE TABLE IF NOT EXISTS type_iface (
 ) WITHOUT ROWID;
 
 
+/* Type Ancestors
+ *
+ * Materialized closure of the type hierarchy.
+ * Generation 0 rows are the interfaces implemented by the type, generation 1
+ * is the parent type and so on up to the fundamental type.
+ * Library types are populated by CmbDB after loading catalogs, template types
+ * are kept up to date with the triggers below.
+ */
+CREATE TABLE IF NOT EXISTS type_ancestor (
+  type_id TEXT NOT NULL,
+  ancestor_id TEXT NOT NULL,
+  generation INTEGER NOT NULL,
+  PRIMARY KEY(type_id, ancestor_id, generation)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS type_ancestor_ancestor_id_idx ON type_ancestor (ancestor_id);
+
+CREATE TRIGGER IF NOT EXISTS on_type_insert_add_ancestors AFTER INSERT ON type
+WHEN
+  NEW.library_id IS NULL AND NEW.parent_id IS NOT NULL
+BEGIN
+  INSERT INTO type_ancestor (type_id, ancestor_id, generation)
+    SELECT NEW.type_id, NEW.parent_id, 1
+    UNION ALL
+    SELECT NEW.type_id, ancestor_id, generation + 1
+      FROM type_ancestor WHERE type_id=NEW.parent_id AND generation > 0
+  ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS on_type_update_rename_ancestors AFTER UPDATE OF type_id ON type
+WHEN
+  NEW.library_id IS NULL
+BEGIN
+  UPDATE type_ancestor SET type_id=NEW.type_id WHERE type_id=OLD.type_id;
+  UPDATE type_ancestor SET ancestor_id=NEW.type_id WHERE ancestor_id=OLD.type_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS on_type_delete_remove_ancestors AFTER DELETE ON type
+WHEN
+  OLD.library_id IS NULL
+BEGIN
+  DELETE FROM type_ancestor WHERE type_id=OLD.type_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS on_type_iface_insert_add_ancestor AFTER INSERT ON type_iface
+WHEN
+  (SELECT library_id FROM type WHERE type_id=NEW.type_id) IS NULL
+BEGIN
+  INSERT INTO type_ancestor (type_id, ancestor_id, generation) VALUES (NEW.type_id, NEW.iface_id, 0)
+  ON CONFLICT DO NOTHING;
+END;
+
+
 /* Enumerations
  *
  */
@@ -82,3 +82,114 @@ def test_gtk3_cmb_object_data():
 
 def test_gtk4_cmb_object_data():
     cmb_object_data_test("gtk-4.0")
+
+
+def test_cmb_object_row_cache():
+    project = CmbProject(target_tk="gtk-4.0")
+    ui = project.add_ui("row_cache.ui")
+    win = project.add_object(ui.ui_id, "GtkWindow")
+
+    win.name = "window"
+    win.comment = "comment"
+    assert win.name == "window"
+    assert win.comment == "comment"
+
+    # Changes made directly in the DB invalidate the cached row
+    project.db.execute(
+        "UPDATE object SET comment='updated' WHERE ui_id=? AND object_id=?;", (win.ui_id, win.object_id)
+    )
+    assert win.comment == "updated"
+
+    # And so does undo/redo
+    win.name = "renamed"
+    assert win.name == "renamed"
+    project.undo()
+    assert win.name == "window"
+    project.redo()
+    assert win.name == "renamed"
+
+
+def test_cmb_object_populate():
+    project = CmbProject(target_tk="gtk-4.0")
+    ui = project.add_ui("populate.ui")
+    win = project.add_object(ui.ui_id, "GtkWindow")
+    label = project.add_object(ui.ui_id, "GtkLabel", parent_id=win.object_id)
+
+    # Set values directly in the DB so no wrapper is created yet
+    project.db.execute(
+        "INSERT INTO object_property (ui_id, object_id, owner_id, property_id, value) VALUES (?, ?, ?, ?, ?);",
+        (ui.ui_id, label.object_id, "GtkLabel", "label", "Hi"),
+    )
+    project.db.execute(
+        "INSERT INTO object_signal (ui_id, object_id, owner_id, signal_id, handler) VALUES (?, ?, ?, ?, ?);",
+        (ui.ui_id, label.object_id, "GtkWidget", "show", "on_show"),
+    )
+
+    # Wrappers are populated with one query per table
+    assert label.properties_dict["label"].value == "Hi"
+    assert label.properties_dict["label"].has_value()
+    assert not label.properties_dict["selectable"].has_value()
+    assert [signal.handler for signal in label.signals] == ["on_show"]
+
+    # Primed rows are still invalidated by changes
+    label.properties_dict["selectable"].value = "True"
+    assert label.properties_dict["selectable"].has_value()
+    assert label.properties_dict["selectable"].value == "True"
+
+
+def test_cmb_object_sparse_properties():
+    project = CmbProject(target_tk="gtk-4.0")
+    ui = project.add_ui("sparse.ui")
+    label = project.add_object(ui.ui_id, "GtkLabel")
+
+    properties = label.properties_dict
+
+    # Unset properties do not have a wrapper until they are used
+    assert "label" in properties
+    assert "label" not in [p.property_id for p in properties.wrappers()]
+    assert len(properties.wrappers()) < len(properties)
+
+    prop = properties["label"]
+    assert prop in properties.wrappers()
+    assert properties["label"] == prop
+    assert prop.value == prop.info.default_value
+
+    # But the public API still returns every property
+    assert [p.property_id for p in label.properties] == list(properties.keys())
+
+
+def test_cmb_object_children_list():
+    project = CmbProject(target_tk="gtk-4.0")
+    ui = project.add_ui("children.ui")
+    box = project.add_object(ui.ui_id, "GtkBox")
+    children = [project.add_object(ui.ui_id, "GtkLabel", parent_id=box.object_id) for i in range(3)]
+
+    assert ui.n_items == 1
+    assert box.n_items == 3
+    assert [box.get_item(i) for i in range(3)] == children
+    assert [child.list_position for child in children] == [0, 1, 2]
+
+    box.reorder_child(children[2], 0)
+    assert [box.get_item(i) for i in range(3)] == [children[2], children[0], children[1]]
+    assert children[2].list_position == 0
+
+    project.undo()
+    assert [box.get_item(i) for i in range(3)] == children
+
+    project.remove_object(children[1])
+    assert box.n_items == 2
+    assert children[2].list_position == 1
+
+
+def test_cmb_object_wrapper_registry():
+    project = CmbProject(target_tk="gtk-4.0")
+    ui = project.add_ui("registry.ui")
+    win = project.add_object(ui.ui_id, "GtkWindow")
+
+    stats = project.get_object_cache_stats()
+    assert project.get_object_by_id(ui.ui_id, win.object_id) == win
+    assert project.get_object_cache_stats()["hits"] == stats["hits"] + 1
+    assert project.get_object_cache_stats()["live"] >= 1
+
+    project.remove_object(win)
+    assert project.get_object_by_id(ui.ui_id, win.object_id) is None
@@ -37,3 +37,21 @@ def test_enum_and_flags_as_nick_and_name():
 
 def test_enum_and_flags_as_integer_values():
     enum_and_flags_test("integer")
+
+
+def test_enum_and_flags_value_as_string():
+    project = CmbProject(target_tk="gtk-4.0")
+
+    align = project.type_info["GtkAlign"]
+    assert align.enum_get_value_as_string("GTK_ALIGN_CENTER") == "center"
+    assert align.enum_get_value_as_string("center", use_nick=False) == 3
+    assert align.enum_get_value_as_string("GTK_ALIGN_BASELINE_FILL") == "baseline-fill"
+    assert align.enum_get_value_as_string("4") == "baseline"
+    assert align.enum_get_value_as_string("0") == "fill"
+    assert align.enum_get_value_as_string("unknown") is None
+
+    hints = project.type_info["GtkInputHints"]
+    assert hints.flags_get_value_as_string("private | GTK_INPUT_HINT_EMOJI") == "emoji|private"
+    assert hints.flags_get_value_as_string(512 | 8 | 2048) == "emoji|lowercase|private"
+    assert hints.flags_get_value_as_string("2568") == "emoji|lowercase|private"
+    assert hints.flags_get_value_as_string(0) == ""
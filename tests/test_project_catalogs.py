@@ -4,7 +4,25 @@
 Test Project Catalogs API
 """
 
-from cambalache import CmbProject
+import os
+import pytest
+
+from gi.repository import GObject
+from cambalache import CmbProject, cmb_db_cache
+from cambalache.cmb_db import CmbDB
+from cambalache.cmb_db_cache import CmbCatalogIndex, clear_catalog_templates
+
+
+# Keep catalog snapshots and index out of the user cache directory
+@pytest.fixture(autouse=True)
+def catalog_cache_dir(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(cmb_db_cache, "catalog_cache_dir", lambda: cache_dir)
+    clear_catalog_templates()
+
+    yield cache_dir
+
+    clear_catalog_templates()
 
 
 def cmb_catalog_data_test(target_tk):
@@ -36,3 +54,269 @@ def test_gtk3_project_catalogs_data():
 
 def test_gtk4_project_catalogs_data():
     cmb_catalog_data_test("gtk-4.0")
+
+
+def get_db_tables_data(db):
+    retval = {}
+
+    for row in db.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name;").fetchall():
+        table = row[0]
+        retval[table] = sorted(db.execute(f"SELECT * FROM {table};").fetchall(), key=repr)
+
+    return retval
+
+
+def cmb_catalog_cache_test(target_tk, cache_dir):
+    # Cache directory and templates are empty, the first project populates it
+    cache_path = os.path.join(cache_dir, f"catalogs-{target_tk}.db")
+    assert not os.path.exists(cache_path)
+
+    project = CmbProject(target_tk=target_tk)
+    assert os.path.exists(cache_path)
+
+    # This one should be cloned from the in memory template
+    template_project = CmbProject(target_tk=target_tk)
+
+    # This one should be restored from the snapshot
+    clear_catalog_templates()
+    cached_project = CmbProject(target_tk=target_tk)
+
+    project_data = get_db_tables_data(project.db)
+    assert project_data == get_db_tables_data(template_project.db)
+    assert project_data == get_db_tables_data(cached_project.db)
+    assert project.db.accessibility_metadata == template_project.db.accessibility_metadata
+    assert project.db.accessibility_metadata == cached_project.db.accessibility_metadata
+
+
+def test_gtk3_catalog_cache(catalog_cache_dir):
+    cmb_catalog_cache_test("gtk+-3.0", catalog_cache_dir)
+
+
+def test_gtk4_catalog_cache(catalog_cache_dir):
+    cmb_catalog_cache_test("gtk-4.0", catalog_cache_dir)
+
+
+def test_catalog_index(tmp_path, catalog_cache_dir):
+    CmbDB(target_tk="gtk-4.0")
+
+    index = CmbCatalogIndex()
+    assert index.path.startswith(catalog_cache_dir)
+    assert os.path.exists(index.path)
+
+    # Non catalog files are indexed too, so they do not get sniffed again
+    not_catalog = tmp_path / "not-a-catalog.xml"
+    not_catalog.write_text("<interface/>")
+    assert index.get(str(not_catalog)) is None
+
+    catalog = tmp_path / "cmbtest-1.0.xml"
+    catalog.write_text(LINE_CATALOG)
+    entry = index.get(str(catalog))
+    assert entry["name"] == "cmbtest"
+    assert entry["version"] == "1.0"
+    assert entry["depends"] == "gtk-4.0"
+
+    # Entries are refreshed when the file changes
+    catalog.write_text(LINE_CATALOG.replace('version="1.0"', 'version="10.0"'))
+    assert index.get(str(catalog))["version"] == "10.0"
+
+
+def cmb_catalog_parallel_test(target_tk, cache_dir):
+    cache_path = os.path.join(cache_dir, f"catalogs-{target_tk}.db")
+
+    def load_db(catalog_jobs):
+        # Make sure catalogs are not restored from the snapshot
+        if os.path.exists(cache_path):
+            os.unlink(cache_path)
+        clear_catalog_templates()
+
+        return CmbDB(target_tk=target_tk, catalog_jobs=catalog_jobs)
+
+    serial_db = load_db(1)
+    parallel_db = load_db(4)
+
+    assert get_db_tables_data(serial_db) == get_db_tables_data(parallel_db)
+    assert serial_db.accessibility_metadata == parallel_db.accessibility_metadata
+
+
+def test_gtk3_catalog_parallel(catalog_cache_dir):
+    cmb_catalog_parallel_test("gtk+-3.0", catalog_cache_dir)
+
+
+def test_gtk4_catalog_parallel(catalog_cache_dir):
+    cmb_catalog_parallel_test("gtk-4.0", catalog_cache_dir)
+
+
+def test_gtk4_lazy_third_party_catalog():
+    project = CmbProject(target_tk="gtk-4.0")
+
+    # Third party catalogs are registered but its types are not loaded
+    info = project.library_info["libadwaita"]
+    assert info.enabled is False
+    assert project.db.is_catalog_loaded("libadwaita") is False
+    assert project.db.execute("SELECT count(*) FROM type WHERE library_id='libadwaita';").fetchone()[0] == 0
+    assert info.type_info == {}
+
+    # Enabling the library loads the catalog
+    info.enabled = True
+
+    assert project.db.is_catalog_loaded("libadwaita")
+    assert project.db.execute("SELECT count(*) FROM type WHERE library_id='libadwaita';").fetchone()[0] > 0
+    assert "AdwHeaderBar" in project.type_info
+    assert project.type_info["AdwHeaderBar"].parent is not None
+
+
+LINE_CATALOG = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<!DOCTYPE cambalache-catalog SYSTEM "cambalache-catalog.dtd">
+<cambalache-catalog name="cmbtest" namespace="CmbTest" prefix="CmbTest" version="1.0" targets="1.0" depends="gtk-4.0"
+                    format-version="2">
+  <type columns="type_id,parent_id,library_id,version,deprecated_version,abstract,derivable,layout,category,workspace_type">
+    ["CmbTestWidget", "GtkWidget", "cmbtest", null, null, null, 1, "container", null, null]
+  </type>
+  <type_iface columns="type_id,iface_id">
+    ["CmbTestWidget", "GtkAccessible"]
+    ["CmbTestWidget", "GtkBuildable"]
+  </type_iface>
+  <property columns="owner_id,property_id,type_id,translatable">
+    ["CmbTestWidget", "label", "gchararray", 1]
+  </property>
+</cambalache-catalog>"""
+
+
+def test_gtk4_line_catalog_format(tmp_path):
+    catalog = tmp_path / "cmbtest-1.0.xml"
+    catalog.write_text(LINE_CATALOG)
+
+    db = CmbDB(target_tk="gtk-4.0")
+    db.load_catalog("cmbtest-1.0", path=str(catalog))
+
+    assert db.execute("SELECT parent_id, derivable, layout FROM type WHERE type_id='CmbTestWidget';").fetchone() == (
+        "GtkWidget",
+        1,
+        "container",
+    )
+    assert db.execute("SELECT count(*) FROM type_iface WHERE type_id='CmbTestWidget';").fetchone()[0] == 2
+
+    # Columns not in the header use their default values
+    assert db.execute(
+        "SELECT type_id, translatable, disabled FROM property WHERE owner_id='CmbTestWidget' AND property_id='label';"
+    ).fetchone() == ("gchararray", 1, 0)
+
+
+def test_gtk4_lazy_type_info():
+    project = CmbProject(target_tk="gtk-4.0")
+    info = project.type_info["GtkComboBox"]
+
+    # Type metadata is only loaded on first access
+    assert "properties" not in info.__dict__
+    assert "hierarchy" not in info.__dict__
+
+    assert "GtkWidget" in info.hierarchy
+    assert info.is_object
+    assert info.properties is info.properties
+
+    # Internal child back reference is set once properties are loaded
+    assert info.properties["has-entry"].internal_child is info.internal_children["entry"]
+
+
+def get_gobject_data(obj):
+    retval = {}
+
+    for pspec in obj.list_properties():
+        if not GObject.type_is_a(pspec.value_type, GObject.Object):
+            retval[pspec.name] = obj.get_property(pspec.name)
+
+    # Read only catalog rows are plain attributes
+    for name in obj._row_columns:
+        retval[name] = getattr(obj, name)
+
+    return retval
+
+
+def get_type_info_data(info):
+    def get_data(data):
+        return {
+            key: (get_gobject_data(d), {k: get_gobject_data(a) for k, a in d.args.items()}, get_data(d.children))
+            for key, d in data.items()
+        }
+
+    def get_internal_children(children):
+        return {key: (get_gobject_data(c), get_internal_children(c.children)) for key, c in children.items()}
+
+    retval = {
+        "hierarchy": info.hierarchy,
+        "interfaces": info.interfaces,
+        "properties": [
+            (key, get_gobject_data(p), p.internal_child.internal_child_id if p.internal_child else None)
+            for key, p in info.properties.items()
+        ],
+        "signals": [(key, get_gobject_data(s)) for key, s in info.signals.items()],
+        "data": get_data(info.data),
+        "internal_children": get_internal_children(info.internal_children),
+        "child_constraint": list(info.child_constraint.items()),
+        "child_type_shortcuts": info.child_type_shortcuts,
+        "child_types": [(key, get_gobject_data(c)) for key, c in info.child_types.items()],
+        "is_object": info.is_object,
+        "instantiable": info.instantiable,
+    }
+
+    if info.parent_id in ["enum", "flags"]:
+        retval[info.parent_id] = [tuple(row) for row in getattr(info, info.parent_id)]
+
+    return retval
+
+
+def cmb_type_info_bulk_test(target_tk):
+    project = CmbProject(target_tk=target_tk)
+    bulk_project = CmbProject(target_tk=target_tk)
+
+    bulk_project.load_type_metadata()
+
+    assert project.type_info.keys() == bulk_project.type_info.keys()
+
+    for type_id, info in bulk_project.type_info.items():
+        assert get_type_info_data(info) == get_type_info_data(project.type_info[type_id]), type_id
+
+
+def test_gtk3_type_info_bulk_load():
+    cmb_type_info_bulk_test("gtk+-3.0")
+
+
+def test_gtk4_type_info_bulk_load():
+    cmb_type_info_bulk_test("gtk-4.0")
+
+
+def get_type_ancestors(project, type_id):
+    return project.db.execute(
+        "SELECT ancestor_id, generation FROM type_ancestor WHERE type_id=? ORDER BY generation, ancestor_id;", (type_id,)
+    ).fetchall()
+
+
+def test_type_ancestor():
+    project = CmbProject(target_tk="gtk-4.0")
+
+    ancestors = get_type_ancestors(project, "GtkWindow")
+    assert ("GtkRoot", 0) in ancestors
+    assert ancestors[-3:] == [("GtkWidget", 1), ("GObject", 2), ("object", 3)]
+
+    # Template types are kept up to date
+    ui = project.add_ui("template.ui")
+    win = project.add_object(ui.ui_id, "GtkWindow", "window")
+    win.name = "MyWindow"
+    ui.template_id = win.object_id
+
+    ancestors = get_type_ancestors(project, "MyWindow")
+    assert ("GtkRoot", 0) in ancestors
+    assert ("GtkWindow", 1) in ancestors
+    assert ("object", 4) in ancestors
+    assert project.type_info["MyWindow"].hierarchy == project.type_info["GtkWindow"].interfaces + [
+        "GtkWindow",
+        "GtkWidget",
+        "GObject",
+    ]
+
+    win.name = "MyRenamedWindow"
+    assert get_type_ancestors(project, "MyWindow") == []
+    assert get_type_ancestors(project, "MyRenamedWindow") == ancestors
+
+    ui.template_id = 0
+    assert get_type_ancestors(project, "MyRenamedWindow") == []
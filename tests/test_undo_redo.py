@@ -4,14 +4,17 @@
 Test Undo/Redo API
 """
 import os
+import pytest
 
 from cambalache import CmbProject
 
+history_backends = pytest.mark.parametrize("history_backend", ["triggers", "changeset"])
 
-def undo_test(target_tk, filename, name):
+
+def undo_test(target_tk, filename, name, history_backend):
     path = os.path.join(os.path.dirname(__file__), target_tk, filename)
 
-    project = CmbProject(target_tk=target_tk)
+    project = CmbProject(target_tk=target_tk, history_backend=history_backend)
 
     ui, msgs, detail_msg = project.import_file(path)
 
@@ -29,9 +32,333 @@ def undo_test(target_tk, filename, name):
         assert obj is not None and obj.name == name
 
 
-def test_gtk3_undo():
-    undo_test("gtk+-3.0", "dialog.ui", "dialog")
+@history_backends
+def test_gtk3_undo(history_backend):
+    undo_test("gtk+-3.0", "dialog.ui", "dialog", history_backend)
+
+
+@history_backends
+def test_gtk4_undo(history_backend):
+    undo_test("gtk-4.0", "liststore.ui", "liststore_test", history_backend)
+
+
+@history_backends
+def test_gtk4_add_objects_undo(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend)
+    ui = project.add_ui("batch.ui")
+    box = project.add_object(ui.ui_id, "GtkBox")
+
+    finished = []
+    project.connect("batch-finished", lambda p: finished.append(p.in_batch))
+
+    objects = project.add_objects(
+        ui.ui_id,
+        [{"obj_type": "GtkLabel", "parent_id": box.object_id, "properties": {"label": f"Label {i}"}} for i in range(8)],
+    )
+
+    assert finished == [False]
+    assert box.n_items == 8
+    assert [obj.properties_dict["label"].value for obj in objects] == [f"Label {i}" for i in range(8)]
+
+    # All objects are removed in one undo step
+    project.undo()
+    assert box.n_items == 0
+
+    project.redo()
+    assert box.n_items == 8
+
+    # The whole batch is recorded in one history range
+    assert project.db.execute("SELECT count(*) FROM history WHERE command='PUSH';").fetchone()[0] == 3
+
+
+@history_backends
+def test_gtk4_batch_error(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend)
+    ui = project.add_ui("batch.ui")
+    box = project.add_object(ui.ui_id, "GtkBox")
+    history_index = project.history_index
+
+    added = []
+    project.connect("object-added", lambda p, o: added.append(o))
+
+    with pytest.raises(RuntimeError):
+        with project.batch("Failed batch"):
+            project.add_object(ui.ui_id, "GtkLabel", parent_id=box.object_id)
+            box.properties_dict["spacing"].value = "6"
+            raise RuntimeError("batch error")
+
+    # Partial work is reverted and never announced
+    assert not project.in_batch
+    assert added == []
+    assert box.n_items == 0
+    assert box.properties_dict["spacing"].value == box.properties_dict["spacing"].info.default_value
+    assert project.history_index == history_index
+    assert project.history_index_max == history_index
+
+
+@history_backends
+def test_gtk4_range_undo_signals(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend)
+    ui = project.add_ui("range.ui")
+    box = project.add_object(ui.ui_id, "GtkBox")
+    project.add_objects(ui.ui_id, [{"obj_type": "GtkLabel", "parent_id": box.object_id, "name": f"label{i}"} for i in range(8)])
+
+    items_changed = []
+    finished = []
+    box.connect("items-changed", lambda model, position, removed, added: items_changed.append((position, removed, added)))
+    project.connect("batch-finished", lambda p: finished.append(p))
+
+    # One list model update and one view update for the whole range
+    project.undo()
+    assert items_changed == [(0, 8, 0)]
+    assert len(finished) == 1
+    assert not project.in_batch
+
+    items_changed.clear()
+    project.redo()
+    assert items_changed == [(0, 0, 8)]
+    assert len(finished) == 2
+
+    # Notifications are frozen while the range is replayed, so each property is notified once
+    label = box.get_item(0)
+    project.history_push("Rename")
+    label.name = "first"
+    label.comment = "comment"
+    label.name = "second"
+    project.history_pop()
+
+    notified = []
+    label.connect("notify::name", lambda obj, pspec: notified.append(obj.name))
+    project.undo()
+    assert notified == ["label0"]
+
+
+@history_backends
+def test_gtk4_remove_subtree_undo(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend)
+    ui = project.add_ui("subtree.ui")
+    win = project.add_object(ui.ui_id, "GtkWindow")
+    box = project.add_object(ui.ui_id, "GtkBox", parent_id=win.object_id)
+    labels = [project.add_object(ui.ui_id, "GtkLabel", parent_id=box.object_id) for i in range(4)]
+    label_ids = [label.object_id for label in labels]
+
+    removed = []
+    project.connect("object-removed", lambda p, obj: removed.append(obj.object_id))
+
+    project.remove_object(box)
+    assert removed == [box.object_id]
+    assert win.n_items == 0
+    assert all(project.get_object_by_id(ui.ui_id, object_id) is None for object_id in label_ids)
+
+    added = []
+    project.connect("object-added", lambda p, obj: added.append(obj.object_id))
+
+    # Only the top object is added back, children are rebuilt from the DB on demand
+    project.undo()
+    assert added == [box.object_id]
+    box = project.get_object_by_id(ui.ui_id, box.object_id)
+    assert box.n_items == 4
+    assert [box.get_item(i).object_id for i in range(4)] == label_ids
+
+    project.redo()
+    assert removed == [box.object_id, box.object_id]
+    assert win.n_items == 0
+
+
+@history_backends
+def test_gtk4_paste_undo(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend)
+    ui = project.add_ui("paste.ui")
+    win = project.add_object(ui.ui_id, "GtkWindow")
+    box = project.add_object(ui.ui_id, "GtkBox", parent_id=win.object_id, name="box")
+    label = project.add_object(ui.ui_id, "GtkLabel", parent_id=box.object_id, name="label")
+    entry = project.add_object(ui.ui_id, "GtkEntry", parent_id=box.object_id)
+    label.properties_dict["mnemonic-widget"].value = str(entry.object_id)
+
+    project.set_selection([box])
+    project.copy()
+    project.set_selection([win])
+    project.paste()
+
+    # References inside the pasted subtree point to the new objects
+    assert win.n_items == 2
+    new_box = win.get_item(1)
+    new_label, new_entry = new_box.get_item(0), new_box.get_item(1)
+    assert (new_box.name, new_label.name) == ("box_2", "label_2")
+    assert new_label.properties_dict["mnemonic-widget"].value == str(new_entry.object_id)
+    assert label.properties_dict["mnemonic-widget"].value == str(entry.object_id)
+
+    project.undo()
+    assert win.n_items == 1
+    assert project.get_object_by_name(ui.ui_id, "box_2") is None
+
+
+@history_backends
+def test_gtk4_property_undo(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend)
+    ui = project.add_ui("property.ui")
+    label = project.add_object(ui.ui_id, "GtkLabel")
+    prop = label.properties_dict["label"]
+
+    # Consecutive edits are compressed in one history step
+    for value in ["H", "He", "Hello"]:
+        prop.value = value
+
+    history_index = project.history_index
+    project.undo()
+    assert prop.value == prop.info.default_value
+    assert project.history_index == history_index - 1
+
+    project.redo()
+    assert prop.value == "Hello"
+
+
+@history_backends
+def test_gtk4_history_budget(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend, history_max_steps=2)
+    ui = project.add_ui("budget.ui")
+    box = project.add_object(ui.ui_id, "GtkBox")
+
+    for i in range(4):
+        project.add_object(ui.ui_id, "GtkLabel", parent_id=box.object_id)
+
+    assert project.history_offset > 0
+    assert project.history_size > 0
+
+    # Only the last two steps can be undone
+    while project.history_index > 0:
+        project.undo()
+
+    assert box.n_items == 2
+    assert project.get_object_by_id(ui.ui_id, box.object_id) is not None
+
+    # Nested ranges are only trimmed when the outermost one is closed
+    history_offset = project.history_offset
+    project.history_push("Add labels")
+    for i in range(4):
+        project.add_object(ui.ui_id, "GtkLabel", parent_id=box.object_id)
+        assert project.history_offset == history_offset
+    project.history_pop()
+    assert project.history_offset > history_offset
+
+    project.undo()
+    assert box.n_items == 2
+
+
+@history_backends
+def test_gtk4_history_unbounded(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend)
+    ui = project.add_ui("unbounded.ui")
+
+    # History is not trimmed unless a budget is configured
+    assert project.history_max_steps == 0 and project.history_max_bytes == 0
+    for i in range(8):
+        project.add_object(ui.ui_id, "GtkLabel")
+
+    assert project.history_offset == 0
+
+
+@history_backends
+def test_gtk4_update_delta_undo(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend)
+    ui = project.add_ui("delta.ui")
+    label = project.add_object(ui.ui_id, "GtkLabel", name="label")
+    label.comment = "A long comment that should not be copied"
+
+    label.name = "title"
+
+    # UPDATE commands only store the changed column
+    history_index = project.history_index
+    row = project.db.execute("SELECT columns, new_values, old_values FROM history WHERE history_id=?;", (history_index,))
+    assert row.fetchone() == ('["name"]', '["title"]', '["label"]')
+
+    project.undo()
+    assert label.name == "label"
+    assert label.comment == "A long comment that should not be copied"
+
+    project.redo()
+    assert label.name == "title"
+
+
+@history_backends
+def test_gtk4_history_counters(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend)
+    ui = project.add_ui("counters.ui")
+    label = project.add_object(ui.ui_id, "GtkLabel")
+
+    def db_counters():
+        index = int(project.db.get_data("history_index"))
+        index_max = project.db.execute("SELECT coalesce(MAX(history_id), 0) FROM history;").fetchone()[0]
+        return index_max if index < 0 else index, index_max
+
+    label.properties_dict["label"].value = "Hello"
+    assert (project.history_index, project.history_index_max) == db_counters()
+
+    # Messages are cached until history changes
+    undo_msg, redo_msg = project.get_undo_redo_msg()
+    assert project.get_undo_redo_msg() == (undo_msg, redo_msg)
+
+    project.undo()
+    assert (project.history_index, project.history_index_max) == db_counters()
+    assert project.get_undo_redo_msg()[1] == undo_msg
+
+    # A new command clears the redo history
+    label.name = "title"
+    assert (project.history_index, project.history_index_max) == db_counters()
+    assert project.get_undo_redo_msg()[1] is None
+
+
+def test_gtk4_changeset_failed_statement():
+    project = CmbProject(target_tk="gtk-4.0", history_backend="changeset")
+    ui = project.add_ui("failed.ui")
+    label = project.add_object(ui.ui_id, "GtkLabel", name="label")
+    history_index = project.history_index
+
+    # Foreign key violation, SQLite rolls back the update but the history trigger already ran
+    label.db_set("UPDATE object SET parent_id=? WHERE ui_id=? AND object_id=?;", (label.ui_id, label.object_id), 999)
+    assert label.parent_id == 0
+    assert project.history_index == history_index
+
+    label.name = "title"
+    project.undo()
+    assert label.name == "label"
+    assert label.parent_id == 0
+    assert project.history_index == history_index
+
+    project.redo()
+    assert label.name == "title"
+    assert label.parent_id == 0
+
+
+@history_backends
+def test_gtk4_failed_statement_undo(history_backend):
+    project = CmbProject(target_tk="gtk-4.0", history_backend=history_backend)
+    ui = project.add_ui("failed.ui")
+    label = project.add_object(ui.ui_id, "GtkLabel", name="label")
+    label.name = "title"
+    history_index = project.history_index
+
+    # Foreign key violation, history triggers already updated the counters before the update failed
+    label.db_set("UPDATE object SET parent_id=? WHERE ui_id=? AND object_id=?;", (label.ui_id, label.object_id), 999)
+    assert label.parent_id == 0
+    assert project.history_index == history_index
+    assert project.history_index_max == project.db.execute("SELECT MAX(history_id) FROM history;").fetchone()[0]
+
+    project.undo()
+    assert label.name == "label"
+    assert project.history_index == history_index - 1
+
+    project.redo()
+    assert label.name == "title"
+    assert project.history_index == history_index
+
 
+def test_gtk4_changeset_flush_transaction():
+    project = CmbProject(target_tk="gtk-4.0", history_backend="changeset")
+    ui = project.add_ui("flush.ui")
+    project.db.commit()
 
-def test_gtk4_undo():
-    undo_test("gtk-4.0", "liststore.ui", "liststore_test")
+    # Flushing history in the middle of a transaction must not commit it
+    project.db.execute("UPDATE ui SET comment='Flush' WHERE ui_id=?;", (ui.ui_id,))
+    project.db.history_flush()
+    assert project.db.conn.in_transaction
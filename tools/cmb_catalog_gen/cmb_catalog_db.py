@@ -77,7 +77,101 @@ class CmbCatalogDB:
         for catalog in external_catalogs:
             self.load_catalog_types(catalog)
 
-    def dump(self, filename):
+    def __get_catalog_attrs(self, c, format_version):
+        libid = self.lib.lib
+        attrs = {"name": libid, "namespace": self.lib.name, "prefix": self.lib.prefix, "version": self.lib.version}
+
+        targets = []
+        for row in c.execute("SELECT version FROM library_version WHERE library_id=?;", (libid,)):
+            targets.append(row[0])
+
+        if len(targets):
+            attrs["targets"] = ",".join(targets)
+
+        if self.dependencies and len(self.dependencies):
+            attrs["depends"] = ",".join(self.dependencies)
+
+        # Legacy format does not have a version attribute
+        if format_version > 1:
+            attrs["format-version"] = str(format_version)
+
+        return attrs
+
+    def __get_table_queries(self):
+        for table in [
+            "type",
+            "type_iface",
+            "type_enum",
+            "type_flags",
+            "type_data",
+            "type_data_arg",
+            "type_child_type",
+            "type_child_constraint",
+            "type_internal_child",
+            "property",
+            "signal",
+        ]:
+            if table == "type":
+                yield table, "SELECT * FROM type WHERE parent_id IS NOT NULL;"
+            else:
+                yield table, f"SELECT * FROM {table};"
+
+    def __get_accessibility_metadata(self, filename):
+        libid = self.lib.lib
+
+        # Accessibility metadata for gtk 4 catalog
+        if libid == "gtk" and self.lib.version == "4.0":
+            return self.__a11y_get_aria_metadata(os.path.dirname(filename))
+        elif libid == "gtk+" and self.lib.version == "3.0":
+            return self.lib.accessibility_metadata
+
+        return None
+
+    def dump(self, filename, legacy_format=False):
+        if legacy_format:
+            self.__dump_legacy(filename)
+            return
+
+        def get_row(row):
+            # Same as legacy format, falsy values other than strings are stored as NULL
+            return json.dumps([c if type(c) is str or c else None for c in row], ensure_ascii=False)
+
+        c = self.conn.cursor()
+
+        # Write one row per line as we go instead of building the whole document in memory
+        with open(filename, "wb") as fd, etree.xmlfile(fd, encoding="UTF-8") as xf:
+            xf.write_declaration(standalone=False)
+            xf.write_doctype('<!DOCTYPE cambalache-catalog SYSTEM "cambalache-catalog.dtd">')
+
+            with xf.element("cambalache-catalog", self.__get_catalog_attrs(c, 2)):
+                for table, query in self.__get_table_queries():
+                    c.execute(query)
+                    row = c.fetchone()
+
+                    if row is None:
+                        continue
+
+                    columns = ",".join([col[0] for col in c.description])
+
+                    xf.write("\n  ")
+                    with xf.element(table, columns=columns):
+                        while row is not None:
+                            xf.write("\n\t", get_row(row))
+                            row = c.fetchone()
+
+                        xf.write("\n  ")
+
+                metadata = self.__get_accessibility_metadata(filename)
+                if metadata is not None:
+                    xf.write("\n  ")
+                    with xf.element("accessibility-metadata"):
+                        xf.write(json.dumps(metadata, indent=2, sort_keys=True))
+
+                xf.write("\n")
+
+        c.close()
+
+    def __dump_legacy(self, filename):
         # Copy/Paste from CmbDB
         def get_row(row):
             r = None
@@ -118,36 +212,10 @@ class CmbCatalogDB:
 
         c = self.conn.cursor()
 
-        libid = self.lib.lib
-        catalog = E("cambalache-catalog", name=libid, namespace=self.lib.name, prefix=self.lib.prefix, version=self.lib.version)
-
-        targets = []
-        for row in c.execute("SELECT version FROM library_version WHERE library_id=?;", (libid,)):
-            targets.append(row[0])
-
-        if len(targets):
-            catalog.set("targets", ",".join(targets))
-
-        if self.dependencies and len(self.dependencies):
-            catalog.set("depends", ",".join(self.dependencies))
+        catalog = E("cambalache-catalog", **self.__get_catalog_attrs(c, 1))
 
-        for table in [
-            "type",
-            "type_iface",
-            "type_enum",
-            "type_flags",
-            "type_data",
-            "type_data_arg",
-            "type_child_type",
-            "type_child_constraint",
-            "type_internal_child",
-            "property",
-            "signal",
-        ]:
-            if table == "type":
-                data = _dump_table(c, "SELECT * FROM type WHERE parent_id IS NOT NULL;")
-            else:
-                data = _dump_table(c, f"SELECT * FROM {table};")
+        for table, query in self.__get_table_queries():
+            data = _dump_table(c, query)
 
             if data is None:
                 continue
@@ -156,14 +224,10 @@ class CmbCatalogDB:
             element.text = data
             catalog.append(element)
 
-        # Append Accessibility metadata for gtk 4 catalog
-        if libid == "gtk" and self.lib.version == "4.0":
-            element = etree.Element("accessibility-metadata")
-            element.text = json.dumps(self.__a11y_get_aria_metadata(os.path.dirname(filename)), indent=2, sort_keys=True)
-            catalog.append(element)
-        elif libid == "gtk+" and self.lib.version == "3.0":
+        metadata = self.__get_accessibility_metadata(filename)
+        if metadata is not None:
             element = etree.Element("accessibility-metadata")
-            element.text = json.dumps(self.lib.accessibility_metadata, indent=2, sort_keys=True)
+            element.text = json.dumps(metadata, indent=2, sort_keys=True)
             catalog.append(element)
 
         # Dump xml to file
@@ -303,12 +367,20 @@ class CmbCatalogDB:
         }
 
     def load_catalog_types(self, filename):
-        def get_table_data_from_node(node):
-            return ast.literal_eval(f"[{node.text}]") if node.text else []
-
         tree = etree.parse(filename)
         root = tree.getroot()
 
+        format_version = int(root.get("format-version", 1))
+
+        def get_table_data_from_node(node):
+            if not node.text:
+                return []
+
+            if format_version < 2:
+                return ast.literal_eval(f"[{node.text}]")
+
+            return [json.loads(line) for line in node.text.splitlines() if line.strip()]
+
         name = root.get("name", None)
         namespace = root.get("namespace", None)
         prefix = root.get("prefix", None)
@@ -323,7 +395,12 @@ class CmbCatalogDB:
                     continue
 
                 cols = ", ".join(["?" for col in data[0]])
-                self.conn.executemany(f"INSERT INTO external_property VALUES ({cols})", data)
+                columns = node.get("columns", None)
+
+                if columns is None:
+                    self.conn.executemany(f"INSERT INTO external_property VALUES ({cols})", data)
+                else:
+                    self.conn.executemany(f"INSERT INTO external_property ({columns}) VALUES ({cols})", data)
 
             elif node.tag == "type":
                 data = get_table_data_from_node(node)
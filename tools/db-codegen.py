@@ -67,13 +67,22 @@ class CambalacheDb:
 
         return columns
 
-    def dump_table_as_class(self, fd, table, klass, parent="CmbBase", mutable=False, construct_only=[]):
+    def dump_table_as_class(self, fd, table, klass, parent="CmbBase", mutable=False, read_only=False, construct_only=[]):
         c = self.conn.cursor()
         columns = self._get_table_data(table)
 
         fd.write(f"\n\nclass {klass}({parent}):\n")
         fd.write(f'    __gtype_name__ = "{klass}"\n\n')
 
+        # Read only catalog rows are stored as plain attributes, column name -> default value
+        if read_only:
+            defaults = {"int": "0", "str": "None", "bool": "False", "float": "0.0"}
+
+            fd.write("    _row_columns = {\n")
+            for col in columns:
+                fd.write(f'        "{col["name"]}": {defaults[col["type"]]},\n')
+            fd.write("    }\n")
+
         # PKs
         all_pk_columns = ""
         pks = []
@@ -81,7 +90,7 @@ class CambalacheDb:
             name = col['name']
             prop_type = col['type']
 
-            if mutable and not col["pk"] and name not in construct_only:
+            if read_only or (mutable and not col["pk"] and name not in construct_only):
                 continue
 
             fd.write(f"    {name} = GObject.Property(type={prop_type}")
@@ -109,16 +118,36 @@ class CambalacheDb:
         _pk_columns = f"({', '.join(pks)})"
         _pk_values = f"({', '.join(['?' for i in range(len(pks))])})"
 
+        # Columns fetched at once by the row cache
+        row_columns = [col["name"] for col in columns if not col["pk"] and col["name"] not in construct_only]
+
+        if mutable:
+            fd.write(f'\n    _row_table = "{table}"\n')
+            fd.write(f'    _row_query = "SELECT {", ".join(row_columns)} FROM {table} WHERE {_pk_columns} IS {_pk_values};"\n')
+            fd.write(f"    _row_fields = {repr(tuple(row_columns))}\n")
+
         # Init
         fd.write("\n    def __init__(self, **kwargs):\n")
+        if read_only:
+            fd.write("        self._init_row(kwargs)\n")
         fd.write("        super().__init__(**kwargs)\n")
 
         # Class from_row()
         fd.write("\n    @classmethod\n")
         fd.write(f"    def from_row(cls, project{all_columns}):\n")
-        fd.write(f"        return cls(project=project{all_columns_assign})\n")
+        if mutable:
+            # Rows are always complete so use them to prime the row cache
+            fd.write(f'        version = project.db.get_row_version("{table}", ({all_pk_columns.replace("self.", "")}))\n')
+            fd.write(f"        retval = cls(project=project{all_columns_assign})\n")
+            fd.write(f"        retval._row_prime(version, ({', '.join(row_columns)}{',' if len(row_columns) == 1 else ''}))\n")
+            fd.write("        return retval\n")
+        else:
+            fd.write(f"        return cls(project=project{all_columns_assign})\n")
 
         if mutable:
+            fd.write("\n    def _row_pk(self):\n")
+            fd.write(f"        return ({all_pk_columns})\n")
+
             for col in columns:
                 name = col['name']
                 if col["pk"] or name in construct_only:
@@ -129,10 +158,7 @@ class CambalacheDb:
                     fd.write(", default = False")
                 fd.write(")\n")
                 fd.write(f"    def {name}(self):\n")
-                fd.write(
-                    f"        return self.db_get(\"SELECT {name} FROM {table} WHERE {_pk_columns} IS {_pk_values};\",\n"
-                )
-                fd.write(f"                           ({all_pk_columns}))\n")
+                fd.write(f"        return self.db_get_column({row_columns.index(name)})\n")
 
                 fd.write(f"\n    @{name}.setter\n")
                 fd.write(f"    def _set_{name}(self, value):\n")
@@ -179,13 +205,13 @@ from .cmb_base_file_monitor import CmbBaseFileMonitor
 
             # Base Objects
             self.dump_table_as_class(fd, "library", "CmbBaseLibraryInfo", mutable=True)
-            self.dump_table_as_class(fd, "property", "CmbBasePropertyInfo")
-            self.dump_table_as_class(fd, "signal", "CmbSignalInfo")
-            self.dump_table_as_class(fd, "type", "CmbBaseTypeInfo")
-            self.dump_table_as_class(fd, "type_data", "CmbBaseTypeDataInfo")
-            self.dump_table_as_class(fd, "type_data_arg", "CmbBaseTypeDataArgInfo")
-            self.dump_table_as_class(fd, "type_child_type", "CmbTypeChildInfo")
-            self.dump_table_as_class(fd, "type_internal_child", "CmbBaseTypeInternalChildInfo")
+            self.dump_table_as_class(fd, "property", "CmbBasePropertyInfo", read_only=True)
+            self.dump_table_as_class(fd, "signal", "CmbSignalInfo", read_only=True)
+            self.dump_table_as_class(fd, "type", "CmbBaseTypeInfo", read_only=True)
+            self.dump_table_as_class(fd, "type_data", "CmbBaseTypeDataInfo", read_only=True)
+            self.dump_table_as_class(fd, "type_data_arg", "CmbBaseTypeDataArgInfo", read_only=True)
+            self.dump_table_as_class(fd, "type_child_type", "CmbTypeChildInfo", read_only=True)
+            self.dump_table_as_class(fd, "type_internal_child", "CmbBaseTypeInternalChildInfo", read_only=True)
 
             # Project Objects
             self.dump_table_as_class(fd, "ui", "CmbBaseUI", mutable=True, parent="CmbBaseFileMonitor")